@@ -0,0 +1,307 @@
+"""Offline load-test harness for the bridge.
+
+Starts the stub Obsidian REST server and the bridge in-process (each on a
+local port), drives /mcp and /obsidian/query at a configurable concurrency,
+and reports throughput and p50/p95/p99 latency per scenario. Results can be
+saved as a named baseline and later compared against it.
+
+    python -m bridge.bench.harness --notes 1000 --concurrency 16
+    python -m bridge.bench.harness --save-baseline main
+    python -m bridge.bench.harness --compare main --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from bridge.bench.stub_server import SHAPES, StubConfig, create_stub_app
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+BENCH_KEY = "bench-key"
+SCENARIOS = ("read", "read_batch", "search", "query", "list", "tools_list")
+
+Scenario = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round((len(latencies) + errors) / elapsed, 1)
+        if elapsed
+        else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+def _mcp_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": f"arcology.{name}", "arguments": arguments},
+    }
+
+
+def build_scenarios(paths: List[str]) -> Dict[str, Scenario]:
+    queries = ["boros", "dragon control", "weekly review", "mana", "planeswalker draw"]
+
+    async def read(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.post(
+            "/mcp", json=_mcp_call("read", {"path": rng.choice(paths)})
+        )
+
+    async def read_batch(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        batch = rng.sample(paths, k=min(10, len(paths)))
+        return await client.post("/mcp", json=_mcp_call("read.batch", {"paths": batch}))
+
+    async def search(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.post(
+            "/mcp", json=_mcp_call("search", {"query": rng.choice(queries)})
+        )
+
+    async def query(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get("/obsidian/query", params={"q": rng.choice(queries)})
+
+    async def list_files(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        folder = rng.choice(paths).split("/", 1)[0]
+        return await client.post("/mcp", json=_mcp_call("list.files", {"dir": folder}))
+
+    async def tools_list(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        return await client.post(
+            "/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+        )
+
+    return {
+        "read": read,
+        "read_batch": read_batch,
+        "search": search,
+        "query": query,
+        "list": list_files,
+        "tools_list": tools_list,
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    *,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Issue ``requests`` calls with ``concurrency`` workers; summarize latency"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining, errors
+        rng = random.Random(seed * 1000 + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                resp = await scenario(client, rng)
+                ok = resp.status_code < 400 and "error" not in resp.json()
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(max(1, concurrency))))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def _serve(app: Any, port: int) -> "tuple[uvicorn.Server, asyncio.Task[None]]":
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    stub_config = StubConfig(
+        notes=args.notes,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        shape=args.shape,
+        seed=args.seed,
+    )
+    stub_port, bridge_port = _free_port(), _free_port()
+
+    # The bridge reads its settings at import time, so configure it first
+    os.environ.update(
+        {
+            "OBSIDIAN_REST_URL": f"http://127.0.0.1:{stub_port}",
+            "OBSIDIAN_API_KEY": "stub",
+            "OBSIDIAN_HTTP2": "0",
+            "MCP_ENDPOINT_URL": "",
+            "MCP_FIRST": "0",
+            "ARCOLOGY_MCP_KEY": BENCH_KEY,
+            # Measure the bridge, not its per-key quotas
+            "KEY_RATE_PER_S": "0",
+            "KEY_MAX_CONCURRENCY": "0",
+            "SEARCH_INDEX_ENABLED": "1" if args.index else "0",
+        }
+    )
+    from bridge.server import app as bridge_app
+    from bridge.services.search_index import get_search_index
+
+    stub_app = create_stub_app(stub_config)
+    paths = sorted(stub_app.state.vault.notes)
+    stub, stub_task = await _serve(stub_app, stub_port)
+    bridge, bridge_task = await _serve(bridge_app, bridge_port)
+    results: Dict[str, Any] = {}
+    try:
+        if args.index:
+            deadline = time.monotonic() + args.index_timeout
+            while not get_search_index().ready and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+        scenarios = build_scenarios(paths)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{bridge_port}",
+            headers={"Authorization": f"Bearer {BENCH_KEY}"},
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=args.concurrency * 2),
+        ) as client:
+            for name in args.scenarios:
+                results[name] = await drive(
+                    client,
+                    scenarios[name],
+                    requests=args.requests,
+                    concurrency=args.concurrency,
+                    seed=args.seed,
+                )
+                print(f"{name:<12} {json.dumps(results[name])}", file=sys.stderr)
+    finally:
+        bridge.should_exit = True
+        stub.should_exit = True
+        await asyncio.gather(bridge_task, stub_task, return_exceptions=True)
+
+    return {
+        "config": {
+            "notes": args.notes,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "shape": args.shape,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "index": args.index,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Regressions where p95 or throughput is worse than baseline by > threshold"""
+    regressions: List[str] = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {cur['p95_ms']}ms")
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (
+            1 - threshold
+        ):
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']} -> {cur['throughput_rps']} rps"
+            )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Offline bridge benchmark")
+    p.add_argument("--notes", type=int, default=500)
+    p.add_argument("--latency-ms", type=float, default=20.0)
+    p.add_argument("--jitter-ms", type=float, default=5.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--shape", choices=SHAPES, default="vault")
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--requests", type=int, default=500, help="per scenario")
+    p.add_argument(
+        "--scenarios",
+        type=lambda s: [x for x in s.split(",") if x],
+        default=list(SCENARIOS),
+        help=f"comma-separated subset of {','.join(SCENARIOS)}",
+    )
+    p.add_argument("--index", action=argparse.BooleanOptionalAction, default=True)
+    p.add_argument("--index-timeout", type=float, default=120.0)
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--save-baseline", metavar="NAME")
+    p.add_argument("--compare", metavar="NAME")
+    p.add_argument("--threshold", type=float, default=0.2)
+    args = p.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        p.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        target = BASELINE_DIR / f"{args.save_baseline}.json"
+        target.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Saved baseline {target}", file=sys.stderr)
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
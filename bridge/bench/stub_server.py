@@ -0,0 +1,153 @@
+"""Stub Obsidian Local REST API server for offline benchmarks.
+
+Serves a synthetic vault with configurable size, injected latency and error
+rate, and the different endpoint shapes ObsidianClient probes:
+
+- "vault": GET /vault/{path}, GET /vault/list, PUT /vault/file
+- "file":  GET /file/{path}, GET /files, POST /file
+- "all":   both of the above plus /list and /write
+
+POST /search/simple/ is always available.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+_WORDS = (
+    "boros dimir azorius golgari izzet orzhov rakdos selesnya simic gruul "
+    "angel dragon goblin elf wizard knight zombie vampire merfolk sphinx "
+    "aggro control midrange combo tempo ramp burn draw counter removal "
+    "mana land creature instant sorcery enchantment artifact planeswalker "
+    "note project meeting idea draft journal task review weekly summary"
+).split()
+
+SHAPES = ("vault", "file", "all")
+
+
+@dataclass
+class StubConfig:
+    notes: int = 500
+    words_per_note: int = 300
+    folders: int = 10
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    error_rate: float = 0.0
+    shape: str = "vault"
+    seed: int = 7
+
+
+@dataclass
+class StubVault:
+    notes: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def generate(cls, config: StubConfig) -> "StubVault":
+        rng = random.Random(config.seed)
+        vault = cls()
+        for i in range(config.notes):
+            folder = f"Folder{i % max(1, config.folders)}"
+            words = rng.choices(_WORDS, k=config.words_per_note)
+            lines = [" ".join(words[j : j + 12]) for j in range(0, len(words), 12)]
+            vault.notes[f"{folder}/Note {i}.md"] = f"# Note {i}\n\n" + "\n".join(lines)
+        return vault
+
+    def list_dir(self, dir_path: Optional[str]) -> List[str]:
+        prefix = f"{dir_path.strip('/')}/" if dir_path else ""
+        names = set()
+        for path in self.notes:
+            if path.startswith(prefix):
+                head, sep, _ = path[len(prefix) :].partition("/")
+                names.add(f"{head}/" if sep else head)
+        return sorted(names)
+
+    def search(self, query: str, context_length: int) -> List[Dict[str, Any]]:
+        needle = query.lower()
+        results = []
+        for path, content in self.notes.items():
+            lowered = content.lower()
+            pos = lowered.find(needle)
+            if pos < 0:
+                continue
+            start = max(0, pos - context_length)
+            results.append(
+                {
+                    "filename": path,
+                    "score": lowered.count(needle),
+                    "matches": [
+                        {
+                            # Offsets are into the note, as the plugin reports
+                            "match": {"start": pos, "end": pos + len(needle)},
+                            "context": content[
+                                start : pos + len(needle) + context_length
+                            ],
+                        }
+                    ],
+                }
+            )
+        return results
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+    vault = StubVault.generate(config)
+    rng = random.Random(config.seed + 1)
+    app = FastAPI(title="Stub Obsidian REST API")
+    app.state.vault = vault
+    app.state.config = config
+    families = {"vault", "file"} if config.shape == "all" else {config.shape}
+
+    async def upstream_delay() -> Optional[Response]:
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            return PlainTextResponse("injected error", status_code=500)
+        return None
+
+    async def read_note(path: str) -> Response:
+        err = await upstream_delay()
+        if err is not None:
+            return err
+        content = vault.notes.get(path)
+        if content is None:
+            return PlainTextResponse("not found", status_code=404)
+        return PlainTextResponse(content, media_type="text/markdown")
+
+    async def list_files(request: Request) -> Response:
+        err = await upstream_delay()
+        if err is not None:
+            return err
+        return JSONResponse({"files": vault.list_dir(request.query_params.get("dir"))})
+
+    async def write_note(request: Request) -> Response:
+        err = await upstream_delay()
+        if err is not None:
+            return err
+        body = await request.json()
+        vault.notes[str(body["path"])] = str(body.get("content") or "")
+        return Response(status_code=204)
+
+    @app.post("/search/simple/")
+    async def search(query: str, contextLength: int = 100) -> Response:
+        err = await upstream_delay()
+        if err is not None:
+            return err
+        return JSONResponse(vault.search(query, contextLength))
+
+    if "vault" in families:
+        app.add_api_route("/vault/list", list_files, methods=["GET"])
+        app.add_api_route("/vault/file", write_note, methods=["PUT"])
+        app.add_api_route("/vault/{path:path}", read_note, methods=["GET"])
+    if "file" in families:
+        app.add_api_route("/files", list_files, methods=["GET"])
+        app.add_api_route("/file", write_note, methods=["POST"])
+        app.add_api_route("/file/{path:path}", read_note, methods=["GET"])
+    if config.shape == "all":
+        app.add_api_route("/list", list_files, methods=["GET"])
+        app.add_api_route("/write", write_note, methods=["POST", "PUT"])
+
+    return app
@@ -0,0 +1,174 @@
+import hmac
+import json
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from bridge.core.config import KEY_BURST, KEY_MAX_CONCURRENCY, KEY_RATE_PER_S
+from bridge.core.logger import get_logger
+from bridge.core.metrics import ADMISSION_REJECTIONS, Sample
+
+logger = get_logger(__name__)
+
+# JSON-RPC error code for over-quota /mcp calls (implementation-defined range)
+RATE_LIMITED_CODE = -32029
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``burst``"""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def take(self, n: float = 1.0) -> float:
+        """Take ``n`` tokens; returns 0 on success, else seconds until possible"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        return (n - self.tokens) / self.rate
+
+
+class QuotaExceeded(HTTPException):
+    """429 for a key over its rate or concurrency quota"""
+
+    def __init__(self, key_name: str, reason: str, retry_after: float) -> None:
+        self.key_name = key_name
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(
+            status_code=429,
+            detail=f"Key '{key_name}' is over its {reason} quota",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+class KeyQuota:
+    """Rate (token bucket) and concurrency quota for one API key"""
+
+    def __init__(
+        self,
+        name: str,
+        key: str,
+        *,
+        rate: float = KEY_RATE_PER_S,
+        burst: float = KEY_BURST,
+        concurrency: int = KEY_MAX_CONCURRENCY,
+    ) -> None:
+        self.name = name
+        self.key = key
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.max_concurrency = concurrency
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def admit(self) -> None:
+        """Claim a request slot or raise QuotaExceeded without waiting"""
+        if self.max_concurrency > 0 and self.in_flight >= self.max_concurrency:
+            self._reject("concurrency", 1.0)
+        if self.bucket is not None:
+            wait = self.bucket.take()
+            if wait:
+                self._reject("rate", wait)
+        self.in_flight += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def charge(self, n: float) -> None:
+        """Take ``n`` more rate tokens for an admitted request that fans out
+        into several calls (at most a full burst, so it can still pass)"""
+        if self.bucket is None or n <= 0:
+            return
+        wait = self.bucket.take(min(n, self.bucket.burst))
+        if wait:
+            self._reject("rate", wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_s": self.bucket.rate if self.bucket else 0,
+            "burst": self.bucket.burst if self.bucket else 0,
+            "tokens": round(self.bucket.tokens, 2) if self.bucket else None,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+    def _reject(self, reason: str, retry_after: float) -> None:
+        self.rejected += 1
+        ADMISSION_REJECTIONS.inc(self.name, reason)
+        raise QuotaExceeded(self.name, reason, retry_after)
+
+
+def load_key_quotas(primary_key: str, spec: str) -> List[KeyQuota]:
+    """Quotas for ARCOLOGY_MCP_KEY ("default") plus the ARCOLOGY_MCP_KEYS JSON"""
+    quotas: List[KeyQuota] = []
+    if primary_key:
+        quotas.append(KeyQuota("default", primary_key))
+    if not spec.strip():
+        return quotas
+    try:
+        entries = json.loads(spec)
+    except ValueError as e:
+        logger.error(f"Ignoring ARCOLOGY_MCP_KEYS: invalid JSON ({e})")
+        return quotas
+    for name, entry in entries.items() if isinstance(entries, dict) else ():
+        if isinstance(entry, str):
+            entry = {"key": entry}
+        if not isinstance(entry, dict) or not entry.get("key"):
+            logger.error(f"Ignoring API key entry {name!r}: no key")
+            continue
+        quotas.append(
+            KeyQuota(
+                str(name),
+                str(entry["key"]),
+                rate=float(entry.get("rate", KEY_RATE_PER_S)),
+                burst=float(entry.get("burst", KEY_BURST)),
+                concurrency=int(entry.get("concurrency", KEY_MAX_CONCURRENCY)),
+            )
+        )
+    return quotas
+
+
+async def quota_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
+    """429 with Retry-After; /mcp gets a JSON-RPC error body"""
+    assert isinstance(exc, QuotaExceeded)
+    if request.url.path == "/mcp":
+        content: Dict[str, Any] = {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {
+                "code": RATE_LIMITED_CODE,
+                "message": exc.detail,
+                "data": {"retryAfter": round(exc.retry_after, 3), "reason": exc.reason},
+            },
+        }
+    else:
+        content = {"detail": exc.detail}
+    return JSONResponse(content, status_code=429, headers=exc.headers)
+
+
+def quota_samples(quotas: List[KeyQuota]) -> List[Sample]:
+    return [
+        ("bridge_key_in_flight", {"key": q.name}, float(q.in_flight)) for q in quotas
+    ]
+
+
+def find_quota(quotas: List[KeyQuota], token: str) -> Optional[KeyQuota]:
+    match = None
+    for q in quotas:
+        # Compare against every key so timing does not reveal which one matched
+        if hmac.compare_digest(q.key.encode(), token.encode()):
+            match = q
+    return match
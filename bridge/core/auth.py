@@ -1,15 +1,77 @@
-from fastapi import HTTPException, Security
+from typing import AsyncIterator, List
+
+from fastapi import HTTPException, Request, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from bridge.core.config import ARCOLOGY_MCP_KEY
+from bridge.core.admission import (
+    KeyQuota,
+    find_quota,
+    load_key_quotas,
+    quota_samples,
+)
+from bridge.core.config import ARCOLOGY_MCP_KEY, ARCOLOGY_MCP_KEYS
+from bridge.core.metrics import REGISTRY
+from bridge.core.timing import request_phase
 
 security = HTTPBearer()
 
+_key_quotas: List[KeyQuota] = load_key_quotas(ARCOLOGY_MCP_KEY, ARCOLOGY_MCP_KEYS)
 
-def verify_bearer_token(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-) -> None:
-    if not ARCOLOGY_MCP_KEY:
+
+def get_key_quotas() -> List[KeyQuota]:
+    return _key_quotas
+
+
+def _authenticate(credentials: HTTPAuthorizationCredentials) -> KeyQuota:
+    if not _key_quotas:
         raise HTTPException(status_code=500, detail="Server missing ARCOLOGY_MCP_KEY")
-    if credentials.credentials != ARCOLOGY_MCP_KEY:
+    quota = find_quota(_key_quotas, credentials.credentials)
+    if quota is None:
         raise HTTPException(status_code=403, detail="Invalid bearer token")
+    return quota
+
+
+async def verify_bearer_token(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Security(security),
+) -> AsyncIterator[None]:
+    """Check the bearer token and admit the request under that key's quotas.
+
+    Over-quota requests fail fast with QuotaExceeded (429 + Retry-After). The
+    concurrency slot is held until the response (or SSE stream) is finished.
+    One rate token is taken here; routes charge more with ``charge_calls``.
+    """
+    with request_phase("auth"):
+        quota = _authenticate(credentials)
+        quota.admit()
+    request.state.api_key = quota.name
+    request.state.quota = quota
+    try:
+        yield
+    finally:
+        quota.release()
+
+
+async def verify_bearer_token_unmetered(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Security(security),
+) -> None:
+    """Check the bearer token without charging the key's quotas, for
+    monitoring routes (/metrics, /debug) that must not eat a client's rate"""
+    request.state.api_key = _authenticate(credentials).name
+
+
+def charge_calls(request: Request, calls: int) -> None:
+    """Charge the caller's rate quota for every call in a request beyond the
+    one verify_bearer_token admitted; raises QuotaExceeded if over"""
+    quota = getattr(request.state, "quota", None)
+    if quota is not None and calls > 1:
+        quota.charge(calls - 1)
+
+
+REGISTRY.register_collector(
+    "bridge_key_in_flight",
+    "gauge",
+    "Requests in flight per API key",
+    lambda: quota_samples(_key_quotas),
+)
@@ -0,0 +1,364 @@
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+
+    HAS_BROTLI = True
+except ImportError:  # pragma: no cover - brotli is optional
+    HAS_BROTLI = False
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - zstandard is optional
+    HAS_ZSTD = False
+
+# Fast settings: the tunnel is the bottleneck, but CPU per request still counts
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class Decoder(Protocol):
+    def decompress(self, data: bytes, max_length: int) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self) -> None:
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self) -> None:
+        self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self) -> None:
+        self._c = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _ZlibDecoder:
+    def __init__(self, wbits: int) -> None:
+        self._d = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        out = self._d.decompress(data, max_length)
+        if self._d.unconsumed_tail:
+            raise OverflowError
+        return out
+
+
+class _BrotliDecoder:
+    def __init__(self) -> None:
+        self._d = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        out = self._d.process(data, output_buffer_limit=max_length)
+        if len(out) >= max_length:
+            # The decoder stopped at the limit with output still to come
+            raise OverflowError
+        return out
+
+
+class _BoundedSink:
+    """File-like target for zstd's stream_writer that refuses to grow past
+    ``limit`` bytes per decompress() call"""
+
+    def __init__(self) -> None:
+        self.limit = 0
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.limit:
+            raise OverflowError
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def reset(self, limit: int) -> None:
+        self.limit, self.chunks, self.size = limit, [], 0
+
+
+class _ZstdDecoder:
+    # Output is produced (and checked against the limit) in pieces this big
+    WRITE_SIZE = 64 * 1024
+
+    def __init__(self) -> None:
+        self._sink = _BoundedSink()
+        self._w = zstandard.ZstdDecompressor().stream_writer(
+            self._sink, write_size=self.WRITE_SIZE
+        )
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        self._sink.reset(max_length)
+        self._w.write(data)
+        return b"".join(self._sink.chunks)
+
+
+# Server preference order, used to break ties between equal q-values
+ENCODERS: Dict[str, Callable[[], Encoder]] = {}
+if HAS_ZSTD:
+    ENCODERS["zstd"] = _ZstdEncoder
+if HAS_BROTLI:
+    ENCODERS["br"] = _BrotliEncoder
+ENCODERS["gzip"] = _GzipEncoder
+
+DECODERS: Dict[str, Callable[[], Decoder]] = {
+    "gzip": lambda: _ZlibDecoder(16 + zlib.MAX_WBITS),
+    "x-gzip": lambda: _ZlibDecoder(16 + zlib.MAX_WBITS),
+    "deflate": lambda: _ZlibDecoder(zlib.MAX_WBITS),
+}
+if HAS_BROTLI:
+    DECODERS["br"] = _BrotliDecoder
+if HAS_ZSTD:
+    DECODERS["zstd"] = _ZstdDecoder
+
+
+def negotiate(accept_encoding: str, available: Iterable[str] = ()) -> Optional[str]:
+    """Pick the best available coding for an Accept-Encoding header, if any"""
+    codings = list(available or ENCODERS)
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best: Optional[Tuple[float, int]] = None
+    choice = None
+    for rank, coding in enumerate(codings):
+        q = weights.get(coding, wildcard)
+        if q > 0 and (best is None or (q, -rank) > best):
+            best, choice = (q, -rank), coding
+    return choice
+
+
+class CompressionMiddleware:
+    """Negotiated response compression and request inflation (pure ASGI).
+
+    Responses on ``paths`` are compressed with the client's preferred coding
+    once the body reaches ``minimum_size``. Single-message bodies are
+    compressed in one go; streamed bodies (SSE) are compressed chunk by chunk
+    with a flush after each, so events are not held back. Requests on
+    ``inflate_paths`` may send a Content-Encoding'd body, which is inflated
+    before the app sees it (capped at ``max_request_bytes``).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        paths: Iterable[str],
+        inflate_paths: Iterable[str] = (),
+        minimum_size: int = 1024,
+        max_request_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self.inflate_paths = frozenset(inflate_paths)
+        self.minimum_size = minimum_size
+        self.max_request_bytes = max_request_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+
+        content_encoding = headers.get("content-encoding", "").strip().lower()
+        if content_encoding and content_encoding != "identity":
+            if scope["path"] not in self.inflate_paths:
+                await _reject(415, "Compressed request bodies are not accepted here")(
+                    scope, receive, send
+                )
+                return
+            inflated = await self._inflate(scope, receive, send, content_encoding)
+            if inflated is None:
+                return
+            scope, receive = inflated
+
+        coding = negotiate(headers.get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSend(send, ENCODERS[coding], coding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+    async def _inflate(
+        self, scope: Scope, receive: Receive, send: Send, coding: str
+    ) -> Optional[Tuple[Scope, Receive]]:
+        make_decoder = DECODERS.get(coding)
+        if make_decoder is None:
+            await _reject(415, f"Unsupported Content-Encoding: {coding}")(
+                scope, receive, send
+            )
+            return None
+        decoder = make_decoder()
+        chunks: List[bytes] = []
+        size = 0
+        try:
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] != "http.request":
+                    break
+                more_body = message.get("more_body", False)
+                remaining = self.max_request_bytes - size
+                data = decoder.decompress(message.get("body", b""), remaining + 1)
+                size += len(data)
+                if size > self.max_request_bytes:
+                    raise OverflowError
+                chunks.append(data)
+        except OverflowError:
+            await _reject(413, "Request body too large once decompressed")(
+                scope, receive, send
+            )
+            return None
+        except Exception:
+            await _reject(400, f"Malformed {coding} request body")(scope, receive, send)
+            return None
+
+        body = b"".join(chunks)
+        raw_headers = [
+            (k, v)
+            for k, v in scope["headers"]
+            if k not in (b"content-encoding", b"content-length")
+        ]
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        sent = False
+
+        async def inflated_receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return {**scope, "headers": raw_headers}, inflated_receive
+
+
+def _reject(status: int, message: str) -> Response:
+    if status == 400:
+        # /mcp speaks JSON-RPC; an unreadable body is a parse error
+        return JSONResponse(
+            {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32700, "message": message},
+            },
+            status_code=status,
+        )
+    return PlainTextResponse(message, status_code=status)
+
+
+class _CompressingSend:
+    def __init__(
+        self,
+        send: Send,
+        make_encoder: Callable[[], Encoder],
+        coding: str,
+        minimum_size: int,
+    ) -> None:
+        self.send = send
+        self.make_encoder = make_encoder
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.encoder: Optional[Encoder] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if (
+                "content-encoding" in headers
+                or start["status"] in (204, 304)
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                await self.send(start)
+                await self.send(message)
+                return
+            self.encoder = self.make_encoder()
+            headers["Content-Encoding"] = self.coding
+            if more_body:
+                if "content-length" in headers:
+                    del headers["content-length"]
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start)
+
+        if self.encoder is None:
+            await self.send(message)
+            return
+        data = self.encoder.compress(body)
+        data += self.encoder.flush() if more_body else self.encoder.finish()
+        await self.send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
@@ -8,13 +8,173 @@ def _env_bool(name: str, default: bool = False) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
 # Upstream MCP + Obsidian REST
 MCP_ENDPOINT_URL: str = os.getenv("MCP_ENDPOINT_URL", "").rstrip("/")
 OBSIDIAN_REST_URL: str = os.getenv("OBSIDIAN_REST_URL", "").rstrip("/")
 OBSIDIAN_API_KEY: str = os.getenv("OBSIDIAN_API_KEY", "")
 OBSIDIAN_VERIFY_SSL: bool = _env_bool("OBSIDIAN_VERIFY_SSL", default=False)
+
+# Per-upstream HTTP connection pools. HTTP2 needs the "h2" package (httpx[http2]).
+MCP_HTTP_MAX_CONNECTIONS: int = _env_int("MCP_HTTP_MAX_CONNECTIONS", 20)
+MCP_HTTP_MAX_KEEPALIVE: int = _env_int("MCP_HTTP_MAX_KEEPALIVE", 10)
+MCP_HTTP_KEEPALIVE_EXPIRY: float = _env_float("MCP_HTTP_KEEPALIVE_EXPIRY", 30.0)
+MCP_HTTP_CONNECT_TIMEOUT: float = _env_float("MCP_HTTP_CONNECT_TIMEOUT", 3.0)
+MCP_HTTP_READ_TIMEOUT: float = _env_float("MCP_HTTP_READ_TIMEOUT", 25.0)
+MCP_HTTP_POOL_TIMEOUT: float = _env_float("MCP_HTTP_POOL_TIMEOUT", 5.0)
+MCP_HTTP2: bool = _env_bool("MCP_HTTP2", default=False)
+OBSIDIAN_HTTP_MAX_CONNECTIONS: int = _env_int("OBSIDIAN_HTTP_MAX_CONNECTIONS", 10)
+OBSIDIAN_HTTP_MAX_KEEPALIVE: int = _env_int("OBSIDIAN_HTTP_MAX_KEEPALIVE", 10)
+OBSIDIAN_HTTP_KEEPALIVE_EXPIRY: float = _env_float(
+    "OBSIDIAN_HTTP_KEEPALIVE_EXPIRY", 60.0
+)
+OBSIDIAN_HTTP_CONNECT_TIMEOUT: float = _env_float("OBSIDIAN_HTTP_CONNECT_TIMEOUT", 5.0)
+OBSIDIAN_HTTP_READ_TIMEOUT: float = _env_float("OBSIDIAN_HTTP_READ_TIMEOUT", 25.0)
+OBSIDIAN_HTTP_POOL_TIMEOUT: float = _env_float("OBSIDIAN_HTTP_POOL_TIMEOUT", 5.0)
+OBSIDIAN_HTTP2: bool = _env_bool("OBSIDIAN_HTTP2", default=False)
+# Obsidian REST scheduler: at most MAX_CONCURRENCY requests in flight (the
+# plugin is single-threaded), up to QUEUE_MAX waiting with reads ahead of
+# writes and searches. Waiters whose deadline (QUEUE_WAIT_S by default) would
+# pass before their turn are shed instead of queued.
+OBSIDIAN_MAX_CONCURRENCY: int = _env_int("OBSIDIAN_MAX_CONCURRENCY", 4)
+OBSIDIAN_QUEUE_MAX: int = _env_int("OBSIDIAN_QUEUE_MAX", 64)
+OBSIDIAN_QUEUE_WAIT_S: float = _env_float("OBSIDIAN_QUEUE_WAIT_S", 10.0)
+
 MCP_FIRST: bool = _env_bool("MCP_FIRST", default=True)
+# With MCP_FIRST, start REST search too if MCP has not answered within the
+# hedge delay (0 = use MCP's learned p95 latency)
+SEARCH_HEDGE: bool = _env_bool("SEARCH_HEDGE", default=True)
+SEARCH_HEDGE_DELAY_S: float = _env_float("SEARCH_HEDGE_DELAY_S", 0.0)
+
+# Upstream MCP tool catalog (tools/list) cache lifetime, in seconds
+MCP_TOOL_CATALOG_TTL: float = _env_float("MCP_TOOL_CATALOG_TTL", 300.0)
+
+# Note content cache for arcology.read (0 bytes disables it). Entries are
+# served without revalidation for FRESH_S seconds; entries without upstream
+# validators (ETag/Last-Modified) expire after TTL seconds.
+CONTENT_CACHE_MAX_BYTES: int = _env_int("CONTENT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+CONTENT_CACHE_FRESH_S: float = _env_float("CONTENT_CACHE_FRESH_S", 1.0)
+CONTENT_CACHE_TTL: float = _env_float("CONTENT_CACHE_TTL", 30.0)
+
+# Search result cache for REST/MCP search, keyed by normalized query. On a
+# bridge write, INVALIDATION="path" drops entries whose hits include the
+# written note; "all" drops every entry (a write can also add new matches).
+SEARCH_CACHE_MAX_BYTES: int = _env_int("SEARCH_CACHE_MAX_BYTES", 8 * 1024 * 1024)
+SEARCH_CACHE_TTL: float = _env_float("SEARCH_CACHE_TTL", 60.0)
+SEARCH_CACHE_INVALIDATION: str = os.getenv("SEARCH_CACHE_INVALIDATION", "path")
+
+# Search hit budget, applied while hits are normalized (0 = unlimited).
+# Snippets are cut to SNIPPET_CHARS around the match.
+SEARCH_MAX_HITS: int = _env_int("SEARCH_MAX_HITS", 500)
+SEARCH_MAX_BYTES: int = _env_int("SEARCH_MAX_BYTES", 256 * 1024)
+SEARCH_SNIPPET_CHARS: int = _env_int("SEARCH_SNIPPET_CHARS", 240)
+
+# Local BM25 search index, built from list_files + read and rebuilt every
+# REFRESH_S seconds. REST/MCP search is used until a build finds some notes.
+# Only the first EXCERPT_CHARS of each note are kept for snippets; matches
+# further in are cut from the content cache when the note is cached there.
+SEARCH_INDEX_ENABLED: bool = _env_bool("SEARCH_INDEX_ENABLED", default=True)
+SEARCH_INDEX_REFRESH_S: float = _env_float("SEARCH_INDEX_REFRESH_S", 900.0)
+SEARCH_INDEX_CONCURRENCY: int = _env_int("SEARCH_INDEX_CONCURRENCY", 4)
+SEARCH_INDEX_EXCERPT_CHARS: int = _env_int("SEARCH_INDEX_EXCERPT_CHARS", 1024)
+
+# Per-backend circuit breakers (MCP upstream, Obsidian REST). A breaker opens
+# when, over the last WINDOW calls (at least MIN_CALLS), the failure rate or
+# the rate of calls slower than SLOW_CALL_S reaches its threshold; it stays
+# open for OPEN_S seconds before letting a probe call through.
+BREAKER_FAILURE_RATE: float = _env_float("BREAKER_FAILURE_RATE", 0.5)
+BREAKER_SLOW_CALL_S: float = _env_float("BREAKER_SLOW_CALL_S", 10.0)
+BREAKER_SLOW_CALL_RATE: float = _env_float("BREAKER_SLOW_CALL_RATE", 0.8)
+BREAKER_MIN_CALLS: int = _env_int("BREAKER_MIN_CALLS", 5)
+BREAKER_WINDOW: int = _env_int("BREAKER_WINDOW", 20)
+BREAKER_OPEN_S: float = _env_float("BREAKER_OPEN_S", 15.0)
+
+# Idempotent upstream calls (reads, listings, searches, tools/list) are retried
+# on connection errors and 502/503/504, up to MAX_ATTEMPTS tries in all, with
+# full-jitter exponential backoff from BASE_S up to MAX_S. Per backend, retries
+# are capped at BUDGET_RATIO of calls over the last 10s (plus MIN_PER_S).
+RETRY_MAX_ATTEMPTS: int = _env_int("RETRY_MAX_ATTEMPTS", 3)
+RETRY_BASE_S: float = _env_float("RETRY_BASE_S", 0.1)
+RETRY_MAX_S: float = _env_float("RETRY_MAX_S", 2.0)
+RETRY_BUDGET_RATIO: float = _env_float("RETRY_BUDGET_RATIO", 0.1)
+RETRY_BUDGET_MIN_PER_S: float = _env_float("RETRY_BUDGET_MIN_PER_S", 1.0)
 
 # MCP server settings
 APP_NAME: str = "arcology"
 ARCOLOGY_MCP_KEY: str = os.getenv("ARCOLOGY_MCP_KEY", "")
+# More API keys as JSON: {"name": {"key": "...", "rate": 5, "burst": 10,
+# "concurrency": 2}}. Each key (ARCOLOGY_MCP_KEY is "default") gets a token
+# bucket of RATE requests/s up to BURST, and at most CONCURRENCY requests in
+# flight; limits left out use the KEY_* defaults (0 = unlimited).
+ARCOLOGY_MCP_KEYS: str = os.getenv("ARCOLOGY_MCP_KEYS", "")
+KEY_RATE_PER_S: float = _env_float("KEY_RATE_PER_S", 20.0)
+KEY_BURST: int = _env_int("KEY_BURST", 40)
+KEY_MAX_CONCURRENCY: int = _env_int("KEY_MAX_CONCURRENCY", 16)
+
+# Per-call time budget for /mcp tool calls and /obsidian/query, carried to
+# every upstream request (probes included). TOOL_DEADLINES is JSON overriding
+# the built-in per-tool budgets, e.g. {"arcology.read": 5}. Clients can ask
+# for a different budget (params._meta.timeoutMs / ?timeout_s=) up to MAX_S.
+DEADLINE_DEFAULT_S: float = _env_float("DEADLINE_DEFAULT_S", 30.0)
+DEADLINE_MAX_S: float = _env_float("DEADLINE_MAX_S", 120.0)
+TOOL_DEADLINES: str = os.getenv("TOOL_DEADLINES", "")
+QUERY_DEADLINE_S: float = _env_float("QUERY_DEADLINE_S", 20.0)
+
+# JSON-RPC batches on /mcp: max calls per batch and how many run at once
+MCP_BATCH_MAX_SIZE: int = _env_int("MCP_BATCH_MAX_SIZE", 100)
+MCP_BATCH_CONCURRENCY: int = _env_int("MCP_BATCH_CONCURRENCY", 8)
+
+# Streamable HTTP (SSE) responses on /mcp: keepalive comment interval
+SSE_KEEPALIVE_S: float = _env_float("SSE_KEEPALIVE_S", 10.0)
+
+# Negotiated compression of /mcp and /obsidian/query responses (zstd, br and
+# gzip, when their libraries are installed). Bodies under MIN_SIZE bytes are
+# sent as-is. Compressed /mcp request bodies are accepted and inflated up to
+# REQUEST_MAX_BYTES.
+COMPRESSION_ENABLED: bool = _env_bool("COMPRESSION_ENABLED", default=True)
+COMPRESSION_MIN_SIZE: int = _env_int("COMPRESSION_MIN_SIZE", 1024)
+REQUEST_MAX_BYTES: int = _env_int("REQUEST_MAX_BYTES", 32 * 1024 * 1024)
+
+# Cursor pagination for arcology.search / arcology.list.files. The full
+# result is snapshotted on the first page so later pages skip the upstream.
+PAGE_DEFAULT_LIMIT: int = _env_int("PAGE_DEFAULT_LIMIT", 100)
+PAGE_MAX_LIMIT: int = _env_int("PAGE_MAX_LIMIT", 1000)
+PAGE_SNAPSHOT_MAX: int = _env_int("PAGE_SNAPSHOT_MAX", 128)
+PAGE_SNAPSHOT_TTL: float = _env_float("PAGE_SNAPSHOT_TTL", 300.0)
+
+# Write-behind for arcology.write: acknowledge after an fsync'd journal
+# append, coalesce writes to the same path for DELAY_S (at most MAX_DELAY_S
+# after the first), then flush upstream, retrying with backoff up to RETRY_MAX_S.
+# Point the journal at persistent storage so pending writes survive restarts.
+WRITE_BEHIND: bool = _env_bool("WRITE_BEHIND", default=False)
+WRITE_BEHIND_JOURNAL: str = os.getenv(
+    "WRITE_BEHIND_JOURNAL", "/tmp/arcology/write-journal.jsonl"
+)
+WRITE_BEHIND_DELAY_S: float = _env_float("WRITE_BEHIND_DELAY_S", 2.0)
+WRITE_BEHIND_MAX_DELAY_S: float = _env_float("WRITE_BEHIND_MAX_DELAY_S", 10.0)
+WRITE_BEHIND_RETRY_BASE_S: float = _env_float("WRITE_BEHIND_RETRY_BASE_S", 1.0)
+WRITE_BEHIND_RETRY_MAX_S: float = _env_float("WRITE_BEHIND_RETRY_MAX_S", 60.0)
+
+# arcology.read.batch: max paths per call, parallel reads, default deadline
+READ_BATCH_MAX_PATHS: int = _env_int("READ_BATCH_MAX_PATHS", 50)
+READ_BATCH_CONCURRENCY: int = _env_int("READ_BATCH_CONCURRENCY", 8)
+READ_BATCH_TIMEOUT_S: float = _env_float("READ_BATCH_TIMEOUT_S", 20.0)
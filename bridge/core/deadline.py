@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from bridge.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SharedDeadline:
+    """The deadline of work done for several requests: the latest of theirs.
+
+    Requests join while they wait for the work and leave when they stop
+    waiting. While any of them has no deadline, the work has none either.
+    """
+
+    def __init__(self) -> None:
+        self._deadlines: List[Optional[float]] = []
+
+    @property
+    def waiters(self) -> int:
+        return len(self._deadlines)
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self._deadlines or None in self._deadlines:
+            return None
+        return max(d for d in self._deadlines if d is not None)
+
+    def join(self, deadline: Optional[float]) -> None:
+        self._deadlines.append(deadline)
+
+    def leave(self, deadline: Optional[float]) -> None:
+        self._deadlines.remove(deadline)
+
+
+# Absolute time.monotonic() by which the current request must be answered
+_deadline: ContextVar[Union[None, float, SharedDeadline]] = ContextVar(
+    "deadline", default=None
+)
+
+
+class DeadlineExceeded(RuntimeError):
+    """The request's time budget ran out before an upstream call could finish"""
+
+    def __init__(self, what: str) -> None:
+        self.what = what
+        super().__init__(f"Deadline exceeded during {what}")
+
+
+def current_deadline() -> Optional[float]:
+    deadline = _deadline.get()
+    return deadline.value if isinstance(deadline, SharedDeadline) else deadline
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget (None = no deadline)"""
+    deadline = current_deadline()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Give the enclosed work ``seconds`` more at most; never extends a deadline.
+
+    ``None`` clears the deadline, for background work started from a request.
+    """
+    if seconds is None:
+        deadline = None
+    else:
+        deadline = time.monotonic() + seconds
+        outer = current_deadline()
+        if outer is not None:
+            deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def shared_deadline_scope(shared: SharedDeadline) -> Iterator[None]:
+    """Run the enclosed work (and tasks it starts) under ``shared``, which
+    follows the requests waiting for it as they come and go"""
+    token = _deadline.set(shared)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def within_deadline(fn: Callable[[], Awaitable[T]], what: str) -> T:
+    """Await ``fn()`` for at most the remaining budget.
+
+    The call is cancelled (not failed) when the budget runs out, so circuit
+    breakers and metrics see a cancellation rather than a backend error.
+    """
+    left = remaining()
+    if left is None:
+        return await fn()
+    if left <= 0:
+        raise DeadlineExceeded(what)
+    try:
+        return await asyncio.wait_for(fn(), left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(what) from None
+
+
+def parse_budgets(spec: str) -> Dict[str, float]:
+    """Parse a JSON {"name": seconds} map, skipping bad entries"""
+    if not spec.strip():
+        return {}
+    try:
+        raw: Any = json.loads(spec)
+    except ValueError as e:
+        logger.error(f"Ignoring deadline budgets: invalid JSON ({e})")
+        return {}
+    budgets: Dict[str, float] = {}
+    for name, seconds in raw.items() if isinstance(raw, dict) else ():
+        if isinstance(seconds, (int, float)) and seconds > 0:
+            budgets[str(name)] = float(seconds)
+        else:
+            logger.error(f"Ignoring deadline budget for {name!r}: {seconds!r}")
+    return budgets
@@ -0,0 +1,308 @@
+import asyncio
+import bisect
+import time
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import httpx
+
+from bridge.core.timing import request_phase
+
+T = TypeVar("T")
+_M = TypeVar("_M", bound="_Metric")
+
+LabelValues = Tuple[str, ...]
+# (metric name, labels, value) rows produced by a collector at scrape time
+Sample = Tuple[str, Dict[str, str], float]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Sample lines for every label set, without the header"""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}"
+            for k, v in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        if not self.labelnames:
+            self._values[()] = 0.0
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last)], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _fmt(bound)
+                le_label = f'le="{le}"'
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_labels(self.labelnames, key, le_label)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total[0]}")
+            lines.append(
+                f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}"
+            )
+        return lines
+
+
+class Registry:
+    """Minimal Prometheus text-format registry.
+
+    Hot-path updates are plain dict operations; everything else (collector
+    callbacks for caches, breakers, pools) runs only at scrape time.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[
+            Tuple[str, str, str, Callable[[], Iterable[Sample]]]
+        ] = []
+
+    def register(self, metric: _M) -> _M:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        collect: Callable[[], Iterable[Sample]],
+    ) -> None:
+        """Register a callback that yields samples for ``name`` at scrape time"""
+        self._collectors.append((name, kind, help_text, collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        for name, kind, help_text, collect in self._collectors:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in collect():
+                lines.append(
+                    f"{sample_name}{_labels(list(labels), list(labels.values()))} "
+                    f"{_fmt(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+MCP_REQUESTS = REGISTRY.register(
+    Counter(
+        "bridge_mcp_requests_total",
+        "MCP calls handled, by JSON-RPC method, tool and outcome",
+        ("method", "tool", "outcome"),
+    )
+)
+MCP_LATENCY = REGISTRY.register(
+    Histogram(
+        "bridge_mcp_request_duration_seconds",
+        "MCP call latency by JSON-RPC method and tool",
+        ("method", "tool"),
+    )
+)
+MCP_IN_FLIGHT = REGISTRY.register(
+    Gauge("bridge_mcp_in_flight", "MCP calls currently being handled")
+)
+ADMISSION_REJECTIONS = REGISTRY.register(
+    Counter(
+        "bridge_admission_rejections_total",
+        "Requests refused by per-key quotas, by key and reason",
+        ("key", "reason"),
+    )
+)
+QUERY_REQUESTS = REGISTRY.register(
+    Counter(
+        "bridge_query_requests_total",
+        "/obsidian/query requests by outcome",
+        ("outcome",),
+    )
+)
+QUERY_LATENCY = REGISTRY.register(
+    Histogram("bridge_query_request_duration_seconds", "/obsidian/query latency")
+)
+UPSTREAM_REQUESTS = REGISTRY.register(
+    Counter(
+        "bridge_upstream_requests_total",
+        "Upstream HTTP requests by backend, endpoint and status",
+        ("backend", "endpoint", "status"),
+    )
+)
+UPSTREAM_LATENCY = REGISTRY.register(
+    Histogram(
+        "bridge_upstream_request_duration_seconds",
+        "Upstream HTTP request latency by backend and endpoint",
+        ("backend", "endpoint"),
+    )
+)
+UPSTREAM_TIMEOUTS = REGISTRY.register(
+    Counter(
+        "bridge_upstream_timeouts_total",
+        "Upstream HTTP requests that timed out",
+        ("backend", "endpoint"),
+    )
+)
+UPSTREAM_POOL_TIMEOUTS = REGISTRY.register(
+    Counter(
+        "bridge_upstream_pool_timeouts_total",
+        "Upstream requests that timed out waiting for a pooled connection",
+        ("backend",),
+    )
+)
+UPSTREAM_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "bridge_upstream_in_flight",
+        "Upstream HTTP requests currently in flight",
+        ("backend",),
+    )
+)
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """Low-cardinality endpoint label: note paths collapse to '*'"""
+    head, sep, _ = path.lstrip("/").partition("/")
+    if head == "search":
+        return f"{method} {path.split('?', 1)[0]}"
+    return f"{method} /{head}{'/*' if sep else ''}"
+
+
+async def track_upstream(
+    backend: str, endpoint: str, fn: Callable[[], Awaitable[T]]
+) -> T:
+    """Run an upstream request, recording latency, status and timeouts"""
+    UPSTREAM_IN_FLIGHT.inc(backend)
+    started = time.perf_counter()
+    status = "error"
+    try:
+        with request_phase("upstream"):
+            result = await fn()
+        status = str(getattr(result, "status_code", "ok"))
+        return result
+    except httpx.TimeoutException as e:
+        status = "timeout"
+        UPSTREAM_TIMEOUTS.inc(backend, endpoint)
+        if isinstance(e, httpx.PoolTimeout):
+            UPSTREAM_POOL_TIMEOUTS.inc(backend)
+        raise
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    finally:
+        UPSTREAM_IN_FLIGHT.dec(backend)
+        UPSTREAM_REQUESTS.inc(backend, endpoint, status)
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started, backend, endpoint)
+
+
+def stats_samples(
+    name: str, stats: Dict[str, Any], labels: Optional[Dict[str, str]] = None
+) -> List[Sample]:
+    """Turn the numeric fields of a stats() dict into labelled samples"""
+    return [
+        (name, {**(labels or {}), "field": key}, float(value))
+        for key, value in stats.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
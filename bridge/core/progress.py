@@ -0,0 +1,53 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Union
+
+ProgressToken = Union[str, int]
+
+
+class ProgressReporter:
+    """Collects MCP notifications emitted while a streamed request runs.
+
+    Only requests that carried a ``_meta.progressToken`` get notifications;
+    for others every report is dropped, as the MCP spec requires.
+    """
+
+    def __init__(self, token: Optional[ProgressToken]) -> None:
+        self.token = token
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    def progress(
+        self, progress: float, total: Optional[float] = None, message: str = ""
+    ) -> None:
+        if self.token is None:
+            return
+        params: Dict[str, Any] = {"progressToken": self.token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message:
+            params["message"] = message
+        self.queue.put_nowait(
+            {"jsonrpc": "2.0", "method": "notifications/progress", "params": params}
+        )
+
+
+_current_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar(
+    "progress_reporter", default=None
+)
+
+
+def set_reporter(reporter: Optional[ProgressReporter]) -> Any:
+    return _current_reporter.set(reporter)
+
+
+def reset_reporter(token: Any) -> None:
+    _current_reporter.reset(token)
+
+
+def report_progress(
+    progress: float, total: Optional[float] = None, message: str = ""
+) -> None:
+    """Emit notifications/progress on the current streamed request, if any"""
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.progress(progress, total, message)
@@ -0,0 +1,82 @@
+import json
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+
+from bridge.core.timing import request_phase
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - orjson is optional
+    HAS_ORJSON = False
+
+
+def _dumps_stdlib(content: Any) -> bytes:
+    # Same settings as Starlette's JSONResponse
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _dumps_orjson(content: Any) -> bytes:
+    try:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # e.g. integers beyond 64 bits; let the stdlib have a go
+        return _dumps_stdlib(content)
+
+
+_dumps: Callable[[Any], bytes] = _dumps_orjson if HAS_ORJSON else _dumps_stdlib
+
+
+class PreEncoded:
+    """A JSON value that was serialized ahead of time (e.g. the tools list)"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, content: Any) -> None:
+        self.data = _dumps(content)
+
+
+def _holds_pre_encoded(value: Any) -> bool:
+    return isinstance(value, PreEncoded) or (
+        isinstance(value, dict)
+        and any(isinstance(v, PreEncoded) for v in value.values())
+    )
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize to JSON bytes, splicing in PreEncoded values as-is.
+
+    PreEncoded values are recognised at the top level, as values of a
+    top-level dict, and as values of dicts inside a top-level list (a
+    JSON-RPC batch); deeper values are not scanned.
+    """
+    if isinstance(content, PreEncoded):
+        return content.data
+    if isinstance(content, dict) and _holds_pre_encoded(content):
+        return (
+            b"{"
+            + b",".join(
+                _dumps(str(k)) + b":" + encode_json(v) for k, v in content.items()
+            )
+            + b"}"
+        )
+    if isinstance(content, list) and any(_holds_pre_encoded(v) for v in content):
+        return b"[" + b",".join(encode_json(v) for v in content) + b"]"
+    return _dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available (stdlib otherwise)"""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def json_response(content: Any, status_code: int = 200) -> JSONResponse:
+    """Build a JSON response, timing serialization as the "serialize" phase"""
+    with request_phase("serialize"):
+        return FastJSONResponse(content, status_code=status_code)
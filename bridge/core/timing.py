@@ -0,0 +1,111 @@
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+from fastapi import Request, Response
+
+from bridge.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Request paths that get a phase breakdown
+TIMED_PATHS = frozenset({"/mcp", "/obsidian/query"})
+
+
+class RequestTimer:
+    """Accumulates wall time per named phase for one request.
+
+    Phases may overlap (e.g. "probe" is the part of "upstream" spent on
+    endpoints other than the learned route), so they need not sum to total.
+    """
+
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.phases: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"ms": round(total * 1000, 2), "count": int(count)}
+            for name, (total, count) in self.phases.items()
+        }
+
+    def server_timing(self) -> str:
+        """Render as a Server-Timing header value"""
+        parts = []
+        for name, (total, count) in self.phases.items():
+            part = f"{name};dur={total * 1000:.2f}"
+            if count > 1:
+                part += f';desc="{int(count)}x"'
+            parts.append(part)
+        parts.append(f"total;dur={self.total_ms():.2f}")
+        return ", ".join(parts)
+
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar(
+    "request_timer", default=None
+)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current_timer.get()
+
+
+@contextmanager
+def request_phase(name: str) -> Iterator[None]:
+    """Time a block as ``name`` on the current request (no-op outside one)"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+async def timing_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Attach a RequestTimer to timed paths and report it when they finish.
+
+    Adds Server-Timing and X-Request-ID headers and logs one JSON line per
+    request with the phase breakdown.
+    """
+    if request.url.path not in TIMED_PATHS:
+        return await call_next(request)
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:16]
+    timer = RequestTimer(request_id)
+    token = _current_timer.set(timer)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_timer.reset(token)
+    response.headers["Server-Timing"] = timer.server_timing()
+    response.headers["X-Request-ID"] = request_id
+    logger.info(
+        json.dumps(
+            {
+                "event": "request_timing",
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "total_ms": round(timer.total_ms(), 2),
+                "phases": timer.breakdown(),
+            }
+        )
+    )
+    return response
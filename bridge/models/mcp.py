@@ -75,6 +75,9 @@ class MCPToolCallArguments(BaseModel):
     path: Optional[str] = Field(
         default=None, description="File path (for read/write tools)"
     )
+    paths: Optional[List[str]] = Field(
+        default=None, description="File paths (for read.batch tool)"
+    )
     content: Optional[str] = Field(
         default=None, description="File content (for write tool)"
     )
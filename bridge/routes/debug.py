@@ -0,0 +1,94 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from bridge.core.auth import get_key_quotas, verify_bearer_token_unmetered
+from bridge.services.circuit_breaker import breaker_snapshot
+from bridge.services.content_cache import get_content_cache
+from bridge.services.endpoint_routes import get_endpoint_routes
+from bridge.services.hedging import get_search_hedger
+from bridge.services.result_pages import get_result_pages
+from bridge.services.retry import retry_snapshot
+from bridge.services.search_cache import get_search_cache
+from bridge.services.search_index import get_search_index
+from bridge.services.singleflight import singleflight_snapshot
+from bridge.services.tool_catalog import get_tool_catalog
+from bridge.services.upstream_scheduler import get_obsidian_scheduler
+from bridge.services.write_behind import get_write_behind
+
+router = APIRouter(
+    prefix="/debug", dependencies=[Depends(verify_bearer_token_unmetered)]
+)
+
+
+@router.get("/routes")
+async def routes() -> Dict[str, Any]:
+    """Upstream endpoints learned per Obsidian REST operation"""
+    return {"obsidian": get_endpoint_routes().snapshot()}
+
+
+@router.get("/tools")
+async def tools() -> Dict[str, Any]:
+    """State of the cached upstream MCP tool catalog"""
+    return {"mcp": get_tool_catalog().stats()}
+
+
+@router.get("/cache")
+async def cache() -> Dict[str, Any]:
+    """Note content, search result and pagination snapshot counters"""
+    return {
+        "content": get_content_cache().stats(),
+        "search": get_search_cache().stats(),
+        "pages": get_result_pages().stats(),
+    }
+
+
+@router.get("/index")
+async def index() -> Dict[str, Any]:
+    """State of the local search index"""
+    return {"search": get_search_index().stats()}
+
+
+@router.get("/hedge")
+async def hedge() -> Dict[str, Any]:
+    """Per-backend win/latency stats for hedged MCP/REST search"""
+    return {"search": get_search_hedger().snapshot()}
+
+
+@router.get("/breakers")
+async def breakers() -> Dict[str, Any]:
+    """Circuit breaker state per upstream backend"""
+    return {"breakers": breaker_snapshot()}
+
+
+@router.get("/retries")
+async def retries() -> Dict[str, Any]:
+    """Retries per upstream backend and why retrying stopped"""
+    return {"retries": retry_snapshot()}
+
+
+@router.get("/singleflight")
+async def singleflight() -> Dict[str, Any]:
+    """How many upstream calls were shared by concurrent identical requests"""
+    return {"singleflight": singleflight_snapshot()}
+
+
+@router.get("/writes")
+async def writes() -> Dict[str, Any]:
+    """Write-behind queue state (null when WRITE_BEHIND is off)"""
+    queue = get_write_behind()
+    if queue is None:
+        return {"write_behind": None}
+    return {"write_behind": {**queue.stats(), "paths": queue.pending_paths()}}
+
+
+@router.get("/keys")
+async def keys() -> Dict[str, Any]:
+    """Quota usage per API key (names only, never the keys)"""
+    return {"keys": {q.name: q.stats() for q in get_key_quotas()}}
+
+
+@router.get("/scheduler")
+async def scheduler() -> Dict[str, Any]:
+    """Obsidian REST concurrency limit, queue depth and shed counts"""
+    return {"obsidian": get_obsidian_scheduler().stats()}
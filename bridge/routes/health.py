@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from bridge.core.auth import verify_bearer_token_unmetered
+from bridge.core.metrics import REGISTRY
 
 router = APIRouter()
 
@@ -7,3 +11,16 @@ router = APIRouter()
 async def health() -> dict[str, str]:
     """Health check endpoint"""
     return {"status": "ok"}
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(verify_bearer_token_unmetered)],
+)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text-format metrics (bearer token required: they name API
+    keys and show vault activity, and this port is tunnelled publicly)"""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
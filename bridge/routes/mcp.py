@@ -1,11 +1,52 @@
-from typing import Any, Dict
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
 
-from bridge.core.auth import verify_bearer_token
-from bridge.core.config import APP_NAME
-from bridge.services.obsidian_client import ObsidianClient
+from bridge.core.auth import charge_calls, verify_bearer_token
+from bridge.core.config import (
+    APP_NAME,
+    DEADLINE_DEFAULT_S,
+    DEADLINE_MAX_S,
+    MCP_BATCH_CONCURRENCY,
+    MCP_BATCH_MAX_SIZE,
+    PAGE_MAX_LIMIT,
+    READ_BATCH_MAX_PATHS,
+    READ_BATCH_TIMEOUT_S,
+    SEARCH_MAX_HITS,
+    SSE_KEEPALIVE_S,
+    TOOL_DEADLINES,
+)
+from bridge.core.deadline import (
+    DeadlineExceeded,
+    deadline_scope,
+    parse_budgets,
+    remaining,
+)
+from bridge.core.metrics import MCP_IN_FLIGHT, MCP_LATENCY, MCP_REQUESTS
+from bridge.core.progress import (
+    ProgressReporter,
+    report_progress,
+    reset_reporter,
+    set_reporter,
+)
+from bridge.core.responses import PreEncoded, encode_json, json_response
+from bridge.core.timing import request_phase
+from bridge.services.obsidian_client import (
+    PATCH_OPERATIONS,
+    PATCH_TARGET_TYPES,
+    InvalidPatchError,
+    ObsidianClient,
+)
+from bridge.services.result_pages import (
+    InvalidCursorError,
+    Page,
+    get_result_pages,
+)
+from bridge.services.search_index import get_search_index
+from bridge.services.upstream_scheduler import UpstreamShed
 
 router = APIRouter()
 
@@ -18,14 +59,23 @@ def _tool(name: str, description: str, input_schema: Dict[str, Any]) -> Dict[str
     }
 
 
+_PAGE_PROPERTIES: Dict[str, Any] = {
+    "limit": {"type": "integer", "minimum": 1, "maximum": PAGE_MAX_LIMIT},
+    "cursor": {"type": "string"},
+}
+
 TOOLS = [
     _tool(
         "search",
-        "Search Obsidian notes by text query.",
+        "Search Obsidian notes by text query. Results are paged: pass "
+        "nextCursor back as cursor (with no query) for the next page.",
         {
             "type": "object",
-            "properties": {"query": {"type": "string"}},
-            "required": ["query"],
+            "properties": {
+                "query": {"type": "string"},
+                **_PAGE_PROPERTIES,
+            },
+            "required": [],
         },
     ),
     _tool(
@@ -37,6 +87,19 @@ TOOLS = [
             "required": ["path"],
         },
     ),
+    _tool(
+        "read.batch",
+        "Read several notes in parallel. Returns content or an error per path; "
+        "notes still loading after timeout_s are reported as timed out.",
+        {
+            "type": "object",
+            "properties": {
+                "paths": {"type": "array", "items": {"type": "string"}},
+                "timeout_s": {"type": "number"},
+            },
+            "required": ["paths"],
+        },
+    ),
     _tool(
         "write",
         "Write (create/overwrite) a note at relative path.",
@@ -46,81 +109,416 @@ TOOLS = [
             "required": ["path", "content"],
         },
     ),
+    _tool(
+        "append",
+        "Append content to the end of a note (created if missing). Sends only "
+        "the new text; prefer it over write for logs and journals.",
+        {
+            "type": "object",
+            "properties": {"path": {"type": "string"}, "content": {"type": "string"}},
+            "required": ["path", "content"],
+        },
+    ),
+    _tool(
+        "patch",
+        "Insert content into a note relative to a heading, block reference or "
+        "frontmatter field. Nested headings are written 'Heading::Subheading'.",
+        {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string"},
+                "operation": {"type": "string", "enum": list(PATCH_OPERATIONS)},
+                "target_type": {"type": "string", "enum": list(PATCH_TARGET_TYPES)},
+                "target": {"type": "string"},
+                "content": {"type": "string"},
+            },
+            "required": ["path", "operation", "target_type", "target", "content"],
+        },
+    ),
     _tool(
         "list.files",
-        "List files under a directory (relative). If omitted, may list vault root(s) if supported.",
-        {"type": "object", "properties": {"dir": {"type": "string"}}, "required": []},
+        "List files under a directory (relative). If omitted, may list vault root(s) if supported. "
+        "Results are paged: pass nextCursor back as cursor for the next page.",
+        {
+            "type": "object",
+            "properties": {"dir": {"type": "string"}, **_PAGE_PROPERTIES},
+            "required": [],
+        },
     ),
 ]
 
 
-def _mcp_ok(result: Any, *, id_val: str = "1") -> Dict[str, Any]:
+# tools/list never changes at runtime, so its result is serialized once
+_TOOLS_RESULT = PreEncoded({"tools": TOOLS})
+
+MCPReply = Tuple[Dict[str, Any], int]
+
+# Time budget per tool call in seconds; TOOL_DEADLINES overrides these
+_TOOL_DEADLINES: Dict[str, float] = {
+    f"{APP_NAME}.search": 20.0,
+    f"{APP_NAME}.read": 15.0,
+    f"{APP_NAME}.read.batch": 30.0,
+    f"{APP_NAME}.write": 30.0,
+    f"{APP_NAME}.append": 15.0,
+    f"{APP_NAME}.patch": 15.0,
+    f"{APP_NAME}.list.files": 20.0,
+    **parse_budgets(TOOL_DEADLINES),
+}
+
+
+def _deadline_for(body: Dict[str, Any]) -> float:
+    """Budget for a call: the client's _meta.timeoutMs (capped), else per tool"""
+    params = body.get("params") or {}
+    if not isinstance(params, dict) or body.get("method") != "tools/call":
+        return DEADLINE_DEFAULT_S
+    meta = params.get("_meta")
+    timeout_ms = meta.get("timeoutMs") if isinstance(meta, dict) else None
+    if isinstance(timeout_ms, (int, float)) and timeout_ms > 0:
+        return min(timeout_ms / 1000, DEADLINE_MAX_S)
+    return _TOOL_DEADLINES.get(str(params.get("name")), DEADLINE_DEFAULT_S)
+
+
+def _page_result(key: str, page: Page) -> Dict[str, Any]:
+    result: Dict[str, Any] = {key: page.items, "total": page.total}
+    if page.next_cursor:
+        result["nextCursor"] = page.next_cursor
+    return result
+
+
+def _mcp_ok(result: Any, *, id_val: Any = "1") -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": id_val, "result": result}
 
 
-def _mcp_err(message: str, *, id_val: str = "1", code: int = -32000) -> Dict[str, Any]:
+def _mcp_err(message: str, *, id_val: Any = "1", code: int = -32000) -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": id_val, "error": {"code": code, "message": message}}
 
 
-@router.post("/mcp")
-async def mcp(req: Request, _auth: None = Depends(verify_bearer_token)) -> JSONResponse:
-    """MCP protocol endpoint"""
-    body = await req.json()
+_KNOWN_METHODS = {"tools/list", "tools/call", "ping", "mcp.ping"}
+_KNOWN_TOOLS = {t["name"] for t in TOOLS}
+
+
+def _metric_labels(body: Dict[str, Any]) -> Tuple[str, str]:
+    """(method, tool) labels, folding unknown values to keep cardinality low"""
+    method = body.get("method")
+    if method not in _KNOWN_METHODS:
+        return "other", ""
+    if method != "tools/call":
+        return str(method), ""
+    params = body.get("params") or {}
+    name = params.get("name") if isinstance(params, dict) else None
+    return str(method), name if name in _KNOWN_TOOLS else "other"
+
+
+async def _dispatch(body: Dict[str, Any]) -> MCPReply:
+    """Handle one JSON-RPC request object, recording per-call metrics"""
+    method, tool = _metric_labels(body)
+    MCP_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    outcome = "cancelled"
+    try:
+        with deadline_scope(_deadline_for(body)):
+            payload, status = await _handle(body)
+        outcome = "error" if "error" in payload else "ok"
+        return payload, status
+    finally:
+        MCP_IN_FLIGHT.dec()
+        MCP_REQUESTS.inc(method, tool, outcome)
+        MCP_LATENCY.observe(time.perf_counter() - started, method, tool)
+
+
+async def _handle(body: Dict[str, Any]) -> MCPReply:
+    """Handle one JSON-RPC request object; returns (payload, HTTP status)"""
     method = body.get("method")
     params = body.get("params", {}) or {}
     id_val = body.get("id", "1")
 
     try:
         if method == "tools/list":
-            return JSONResponse(_mcp_ok({"tools": TOOLS}, id_val=id_val))
+            return _mcp_ok(_TOOLS_RESULT, id_val=id_val), 200
 
         if method == "tools/call":
             name = params.get("name") or ""
             args = params.get("arguments") or {}
 
             obsidian_client = ObsidianClient()
+            pages = get_result_pages()
 
             # arcology.search
             if name == f"{APP_NAME}.search":
-                q = args.get("query") or ""
-                results = await obsidian_client.search(q)
-                return JSONResponse(_mcp_ok({"items": results}, id_val=id_val))
+                cursor = args.get("cursor")
+                if cursor:
+                    page = pages.next("search", cursor, args.get("limit"))
+                else:
+                    q = args.get("query") or ""
+                    index = get_search_index()
+                    if index.available:
+                        with request_phase("index"):
+                            results = index.search(q, limit=SEARCH_MAX_HITS)
+                    else:
+                        report_progress(0, message="Searching vault")
+                        results = await obsidian_client.search(q)
+                    page = pages.first("search", results, args.get("limit"))
+                report_progress(len(page.items), len(page.items))
+                return _mcp_ok(_page_result("items", page), id_val=id_val), 200
 
             # arcology.read
             if name == f"{APP_NAME}.read":
                 path = args.get("path") or ""
                 content = await obsidian_client.read(path)
-                return JSONResponse(
-                    _mcp_ok({"path": path, "content": content}, id_val=id_val)
-                )
+                return _mcp_ok({"path": path, "content": content}, id_val=id_val), 200
+
+            # arcology.read.batch
+            if name == f"{APP_NAME}.read.batch":
+                paths = args.get("paths")
+                if not isinstance(paths, list) or not all(
+                    isinstance(p, str) for p in paths
+                ):
+                    return (
+                        _mcp_err(
+                            "paths must be a list of strings",
+                            id_val=id_val,
+                            code=-32602,
+                        ),
+                        400,
+                    )
+                timeout = args.get("timeout_s")
+                if timeout is None:
+                    timeout = READ_BATCH_TIMEOUT_S
+                elif isinstance(timeout, bool) or not (
+                    isinstance(timeout, (int, float)) and timeout > 0
+                ):
+                    return (
+                        _mcp_err(
+                            "timeout_s must be a positive number",
+                            id_val=id_val,
+                            code=-32602,
+                        ),
+                        400,
+                    )
+                if len(paths) > READ_BATCH_MAX_PATHS:
+                    return (
+                        _mcp_err(
+                            f"Too many paths: {len(paths)} > {READ_BATCH_MAX_PATHS}",
+                            id_val=id_val,
+                        ),
+                        400,
+                    )
+                timeout = float(timeout)
+                left = remaining()
+                if left is not None:
+                    # Leave room to send what finished before the deadline
+                    timeout = min(timeout, max(0.0, left * 0.9))
+                unique = list(dict.fromkeys(paths))
+                by_path: Dict[str, Dict[str, Any]] = {}
+                report_progress(0, len(unique))
+                async for item in obsidian_client.iter_read_many(
+                    unique, timeout=timeout
+                ):
+                    by_path[item["path"]] = item
+                    report_progress(len(by_path), len(unique))
+                items = [by_path[p] for p in unique]
+                return _mcp_ok({"items": items}, id_val=id_val), 200
 
             # arcology.write
             if name == f"{APP_NAME}.write":
                 path = args.get("path") or ""
                 content = args.get("content") or ""
                 res = await obsidian_client.write(path, content)
-                return JSONResponse(_mcp_ok(res, id_val=id_val))
+                return _mcp_ok(res, id_val=id_val), 200
+
+            # arcology.append
+            if name == f"{APP_NAME}.append":
+                path = args.get("path") or ""
+                content = args.get("content") or ""
+                res = await obsidian_client.append(path, content)
+                return _mcp_ok(res, id_val=id_val), 200
+
+            # arcology.patch
+            if name == f"{APP_NAME}.patch":
+                res = await obsidian_client.patch(
+                    args.get("path") or "",
+                    args.get("content") or "",
+                    operation=args.get("operation") or "",
+                    target_type=args.get("target_type") or "",
+                    target=args.get("target") or "",
+                )
+                return _mcp_ok(res, id_val=id_val), 200
 
             # arcology.list.files
             if name == f"{APP_NAME}.list.files":
-                dir_arg = args.get("dir")
-                files = await obsidian_client.list_files(dir_arg)
-                return JSONResponse(_mcp_ok({"files": files}, id_val=id_val))
+                cursor = args.get("cursor")
+                if cursor:
+                    page = pages.next("list.files", cursor, args.get("limit"))
+                else:
+                    files = await obsidian_client.list_files(args.get("dir"))
+                    page = pages.first("list.files", files, args.get("limit"))
+                return _mcp_ok(_page_result("files", page), id_val=id_val), 200
 
-            return JSONResponse(
-                _mcp_err(f"Unknown tool: {name}", id_val=id_val), status_code=400
-            )
+            return _mcp_err(f"Unknown tool: {name}", id_val=id_val), 400
 
         if method in ("ping", "mcp.ping"):
-            return JSONResponse(_mcp_ok({"ok": True}, id_val=id_val))
+            return _mcp_ok({"ok": True}, id_val=id_val), 200
 
-        return JSONResponse(
-            _mcp_err(f"Unknown method: {method}", id_val=id_val), status_code=400
-        )
+        return _mcp_err(f"Unknown method: {method}", id_val=id_val), 400
 
+    except (InvalidCursorError, InvalidPatchError) as ve:
+        # Bad tool arguments (including stale pagination cursors)
+        return _mcp_err(str(ve), id_val=id_val, code=-32602), 400
+    except DeadlineExceeded as de:
+        return _mcp_err(str(de), id_val=id_val, code=-32001), 504
+    except UpstreamShed as us:
+        # Obsidian is saturated; fail fast rather than time out in the queue
+        return _mcp_err(str(us), id_val=id_val), 503
     except HTTPException as he:
-        return JSONResponse(
-            _mcp_err(he.detail, id_val=id_val), status_code=he.status_code
-        )
+        return _mcp_err(he.detail, id_val=id_val), he.status_code
     except Exception as e:
-        return JSONResponse(_mcp_err(str(e), id_val=id_val), status_code=500)
+        return _mcp_err(str(e), id_val=id_val), 500
+
+
+def _call_cost(body: Any) -> int:
+    """Upstream calls a request object stands for (read.batch fans out)"""
+    if not isinstance(body, dict) or body.get("method") != "tools/call":
+        return 1
+    params = body.get("params") or {}
+    if not isinstance(params, dict) or params.get("name") != f"{APP_NAME}.read.batch":
+        return 1
+    args = params.get("arguments") or {}
+    paths = args.get("paths") if isinstance(args, dict) else None
+    return max(1, len(paths)) if isinstance(paths, list) else 1
+
+
+def _batch_key(body: Dict[str, Any]) -> Optional[str]:
+    """Note path a call touches; calls sharing a path are not independent"""
+    params = body.get("params") or {}
+    if body.get("method") != "tools/call" or not isinstance(params, dict):
+        return None
+    args = params.get("arguments") or {}
+    path = args.get("path") if isinstance(args, dict) else None
+    return path or None
+
+
+async def _dispatch_batch(items: List[Any]) -> List[Dict[str, Any]]:
+    """Run a JSON-RPC batch concurrently (capped by MCP_BATCH_CONCURRENCY).
+
+    Calls that touch the same note path run one after another in batch order;
+    everything else runs in parallel. Notifications (no "id") get no reply.
+    """
+    sem = asyncio.Semaphore(max(1, MCP_BATCH_CONCURRENCY))
+    path_locks: Dict[str, asyncio.Lock] = {}
+
+    async def run(item: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(item, dict):
+            return _mcp_err("Invalid Request", id_val=None, code=-32600)
+        key = _batch_key(item)
+        if key is None:
+            async with sem:
+                payload, _ = await _dispatch(item)
+        else:
+            # Locks are taken before the semaphore so same-path calls keep order
+            async with path_locks.setdefault(key, asyncio.Lock()), sem:
+                payload, _ = await _dispatch(item)
+        return payload if "id" in item else None
+
+    replies = await asyncio.gather(*(run(item) for item in items))
+    return [r for r in replies if r is not None]
+
+
+def _sse_event(message: Any) -> bytes:
+    return b"event: message\ndata: " + encode_json(message) + b"\n\n"
+
+
+async def _stream_dispatch(body: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """Run one request, streaming its notifications then its response as SSE.
+
+    Progress notifications are sent for requests that
+    carry ``params._meta.progressToken``. Keepalive comments are sent while
+    nothing else is ready, so long tool calls do not look idle to clients.
+    """
+    params = body.get("params") or {}
+    meta = params.get("_meta") if isinstance(params, dict) else None
+    token = meta.get("progressToken") if isinstance(meta, dict) else None
+    reporter = ProgressReporter(token)
+
+    ctx_token = set_reporter(reporter)
+    try:
+        task = asyncio.create_task(_dispatch(body))
+    finally:
+        reset_reporter(ctx_token)
+
+    try:
+        while not (task.done() and reporter.queue.empty()):
+            getter = asyncio.ensure_future(reporter.queue.get())
+            done, _ = await asyncio.wait(
+                {getter, task},
+                timeout=SSE_KEEPALIVE_S,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if getter in done:
+                yield _sse_event(getter.result())
+                continue
+            getter.cancel()
+            if not done:
+                yield b": keepalive\n\n"
+        payload, _ = task.result()
+        yield _sse_event(payload)
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _wants_sse(req: Request) -> bool:
+    return "text/event-stream" in req.headers.get("accept", "")
+
+
+@router.get("/mcp")
+async def mcp_stream(_auth: None = Depends(verify_bearer_token)) -> Response:
+    """Server-initiated SSE streams are not offered (Streamable HTTP allows 405)"""
+    return Response(status_code=405, headers={"Allow": "POST"})
+
+
+@router.post("/mcp")
+async def mcp(req: Request, _auth: None = Depends(verify_bearer_token)) -> Response:
+    """MCP protocol endpoint (single request or JSON-RPC 2.0 batch).
+
+    Single tools/call requests from clients that accept text/event-stream are
+    answered over SSE (MCP Streamable HTTP) with progress notifications.
+    """
+    body = await req.json()
+
+    if isinstance(body, list):
+        if not body:
+            return json_response(
+                _mcp_err("Invalid Request: empty batch", id_val=None, code=-32600),
+                status_code=400,
+            )
+        if len(body) > MCP_BATCH_MAX_SIZE:
+            return json_response(
+                _mcp_err(
+                    f"Batch too large: {len(body)} > {MCP_BATCH_MAX_SIZE}",
+                    id_val=None,
+                    code=-32600,
+                ),
+                status_code=400,
+            )
+        charge_calls(req, sum(_call_cost(item) for item in body))
+        replies = await _dispatch_batch(body)
+        if not replies:
+            return Response(status_code=204)
+        return json_response(replies)
+
+    if not isinstance(body, dict):
+        return json_response(
+            _mcp_err("Invalid Request", id_val=None, code=-32600), status_code=400
+        )
+
+    charge_calls(req, _call_cost(body))
+
+    if _wants_sse(req) and body.get("method") == "tools/call":
+        return StreamingResponse(
+            _stream_dispatch(body),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    payload, status = await _dispatch(body)
+    return json_response(payload, status_code=status)
@@ -1,24 +1,83 @@
+import math
+import time
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 
-from bridge.core.config import MCP_FIRST
+from bridge.core.config import (
+    DEADLINE_MAX_S,
+    MCP_FIRST,
+    QUERY_DEADLINE_S,
+    SEARCH_HEDGE,
+    SEARCH_HEDGE_DELAY_S,
+    SEARCH_MAX_HITS,
+)
+from bridge.core.deadline import DeadlineExceeded, deadline_scope, remaining
+from bridge.core.metrics import QUERY_LATENCY, QUERY_REQUESTS
+from bridge.core.responses import json_response
+from bridge.core.timing import request_phase
+from bridge.services.hedging import HedgeError, get_search_hedger
 from bridge.services.mcp_client import MCPClient
 from bridge.services.obsidian_client import ObsidianClient
+from bridge.services.search_index import get_search_index
+from bridge.services.upstream_scheduler import UpstreamShed
 
 router = APIRouter()
 
+# /obsidian/query returns at most this many hits
+QUERY_MAX_HITS = 20
+
+
+def _shed_response(shed: UpstreamShed, detail: str) -> HTTPException:
+    """503 with the scheduler's Retry-After for a search Obsidian shed"""
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(shed.retry_after)))},
+    )
+
 
-async def unified_search(query: str) -> list[dict]:
-    """Unified search that tries MCP first (if configured) then falls back to Obsidian REST"""
+async def unified_search(query: str, max_hits: Optional[int] = None) -> list[dict]:
+    """Unified search that answers from the local index once it is built,
+    otherwise tries MCP first (if configured) then falls back to Obsidian REST.
+
+    ``max_hits`` is passed down so upstream results are only normalized as far
+    as needed (default: SEARCH_MAX_HITS).
+    """
+    index = get_search_index()
+    if index.available:
+        with request_phase("index"):
+            return index.search(query, limit=max_hits or SEARCH_MAX_HITS)
+    if MCP_FIRST and SEARCH_HEDGE:
+        try:
+            return await get_search_hedger().run(
+                ("mcp", lambda: MCPClient().search(query, max_hits=max_hits)),
+                ("rest", lambda: ObsidianClient().search(query, max_hits=max_hits)),
+                delay=SEARCH_HEDGE_DELAY_S,
+            )
+        except HedgeError as e:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise HTTPException(status_code=504, detail=str(e))
+            shed = [err for err in e.errors.values() if isinstance(err, UpstreamShed)]
+            if shed:
+                raise _shed_response(shed[0], str(e))
+            raise HTTPException(status_code=502, detail=str(e))
     last_err = None
     if MCP_FIRST:
         try:
             mcp_client = MCPClient()
-            return await mcp_client.search(query)
+            return await mcp_client.search(query, max_hits=max_hits)
         except Exception as e:
             last_err = e
     try:
         obsidian_client = ObsidianClient()
-        return await obsidian_client.search(query)
+        return await obsidian_client.search(query, max_hits=max_hits)
+    except UpstreamShed as e:
+        raise _shed_response(e, str(e))
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         if last_err:
             raise HTTPException(
@@ -28,16 +87,29 @@ async def unified_search(query: str) -> list[dict]:
 
 
 @router.get("/obsidian/query")
-async def query(q: str = Query(..., description="Search query")) -> dict:
+async def query(
+    q: str = Query(..., description="Search query"),
+    timeout_s: Optional[float] = Query(
+        None, gt=0, description="Time budget in seconds (capped)"
+    ),
+) -> JSONResponse:
     """Query Obsidian notes"""
-    results = await unified_search(q)
-    short = []
-    for h in results[:20]:
-        short.append(
-            {
-                "path": h.get("path") or h.get("id") or "",
-                "snippet": (h.get("snippet") or "")[:240],
-                "score": h.get("score"),
-            }
-        )
-    return {"query": q, "count": len(results), "results": short}
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with deadline_scope(min(timeout_s or QUERY_DEADLINE_S, DEADLINE_MAX_S)):
+            results = await unified_search(q, max_hits=QUERY_MAX_HITS)
+        outcome = "ok"
+    finally:
+        QUERY_REQUESTS.inc(outcome)
+        QUERY_LATENCY.observe(time.perf_counter() - started)
+    # Hits are already budgeted and snippet-shaped by the search backends
+    short = [
+        {
+            "path": h.get("path") or h.get("id") or "",
+            "snippet": h.get("snippet") or "",
+            "score": h.get("score"),
+        }
+        for h in results[:QUERY_MAX_HITS]
+    ]
+    return json_response({"query": q, "count": len(short), "results": short})
@@ -2,9 +2,20 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from bridge.core.admission import QuotaExceeded, quota_exceeded_handler
+from bridge.core.compression import CompressionMiddleware
+from bridge.core.config import (
+    COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE,
+    REQUEST_MAX_BYTES,
+)
 from bridge.core.logger import setup_logging
-from bridge.routes import health, mcp, obsidian
+from bridge.core.timing import timing_middleware
+from bridge.routes import debug, health, mcp, obsidian
 from bridge.services.http_client import shutdown_http_client, startup_http_client
+from bridge.services.obsidian_client import ObsidianClient
+from bridge.services.search_index import shutdown_search_index, startup_search_index
+from bridge.services.write_behind import shutdown_write_behind, startup_write_behind
 
 
 @asynccontextmanager
@@ -13,14 +24,30 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging()
     await startup_http_client()
+    await startup_write_behind(lambda p, c: ObsidianClient().write_through(p, c))
+    await startup_search_index(ObsidianClient())
     yield
     # Shutdown
+    await shutdown_search_index()
+    await shutdown_write_behind()
     await shutdown_http_client()
 
 
 app = FastAPI(title="MCP Bridge (arcology)", version="1.0", lifespan=lifespan)
+app.middleware("http")(timing_middleware)
+app.add_exception_handler(QuotaExceeded, quota_exceeded_handler)
+if COMPRESSION_ENABLED:
+    # Added last so it is outermost: Server-Timing excludes compression time
+    app.add_middleware(
+        CompressionMiddleware,
+        paths={"/mcp", "/obsidian/query"},
+        inflate_paths={"/mcp"},
+        minimum_size=COMPRESSION_MIN_SIZE,
+        max_request_bytes=REQUEST_MAX_BYTES,
+    )
 
 # Include routers
 app.include_router(health.router)
 app.include_router(obsidian.router)
 app.include_router(mcp.router)
+app.include_router(debug.router)
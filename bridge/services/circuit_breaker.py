@@ -0,0 +1,230 @@
+import asyncio
+import time
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from bridge.core.config import (
+    BREAKER_FAILURE_RATE,
+    BREAKER_MIN_CALLS,
+    BREAKER_OPEN_S,
+    BREAKER_SLOW_CALL_RATE,
+    BREAKER_SLOW_CALL_S,
+    BREAKER_WINDOW,
+)
+from bridge.core.logger import get_logger
+from bridge.core.metrics import REGISTRY, Sample, stats_samples
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose breaker is open"""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"{name} backend unavailable (circuit open, retry in {retry_after:.1f}s)"
+        )
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling window of recent calls.
+
+    The breaker opens when, over at least ``min_calls`` recent calls, the
+    failure rate or the slow-call rate reaches its threshold. While open,
+    calls fail fast with CircuitOpenError. After ``open_for`` seconds a single
+    probe call is let through (half-open); its outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        slow_call_s: float = BREAKER_SLOW_CALL_S,
+        slow_call_rate: float = BREAKER_SLOW_CALL_RATE,
+        min_calls: int = BREAKER_MIN_CALLS,
+        window: int = BREAKER_WINDOW,
+        open_for: float = BREAKER_OPEN_S,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_s = slow_call_s
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.open_for = open_for
+        # (failed, slow) per recent call
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._retry_after() <= 0:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend right now"""
+        if self._state == CLOSED:
+            return True
+        if self._state == OPEN:
+            if self._retry_after() > 0:
+                return False
+            self._state = HALF_OPEN
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, elapsed: float) -> None:
+        if self._state == HALF_OPEN:
+            self._close()
+            return
+        self._record(failed=False, slow=elapsed >= self.slow_call_s)
+
+    def record_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._open()
+            return
+        self._record(failed=True, slow=False)
+
+    def release(self) -> None:
+        """Forget a call that was cancelled before it had an outcome"""
+        self._probe_in_flight = False
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        is_failure: Optional[Callable[[T], bool]] = None,
+    ) -> T:
+        """Run ``fn`` through the breaker.
+
+        Exceptions count as failures, as do results for which ``is_failure``
+        returns True; the result is still returned to the caller.
+        """
+        if not self.allow():
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self._retry_after())
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        if is_failure is not None and is_failure(result):
+            self.record_failure()
+        else:
+            self.record_success(time.monotonic() - started)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = len(self._outcomes)
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+        return {
+            "state": self.state,
+            "window_calls": calls,
+            "failure_rate": round(failures / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(slow / calls, 3) if calls else 0.0,
+            "retry_after_s": round(max(0.0, self._retry_after()), 1)
+            if self._state == OPEN
+            else None,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def reset(self) -> None:
+        self._outcomes.clear()
+        self._state = CLOSED
+        self._probe_in_flight = False
+
+    def _record(self, *, failed: bool, slow: bool) -> None:
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if self._state != CLOSED or calls < self.min_calls:
+            return
+        failures = sum(1 for f, _ in self._outcomes if f)
+        slow_calls = sum(1 for _, s in self._outcomes if s)
+        if (
+            failures / calls >= self.failure_rate
+            or slow_calls / calls >= self.slow_call_rate
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        if self._state != OPEN:
+            logger.warning(f"Circuit for {self.name} opened for {self.open_for}s")
+            self.times_opened += 1
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def _close(self) -> None:
+        logger.info(f"Circuit for {self.name} closed")
+        self._state = CLOSED
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def _retry_after(self) -> float:
+        return self._opened_at + self.open_for - time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get (or create) the process-wide breaker for a backend"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+def breaker_snapshot() -> Dict[str, Any]:
+    return {name: b.snapshot() for name, b in _breakers.items()}
+
+
+_STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _collect() -> List[Sample]:
+    samples: List[Sample] = []
+    for name, breaker in _breakers.items():
+        snapshot = breaker.snapshot()
+        snapshot["state"] = _STATE_CODES[breaker.state]
+        samples += stats_samples("bridge_circuit_breaker", snapshot, {"backend": name})
+    return samples
+
+
+REGISTRY.register_collector(
+    "bridge_circuit_breaker",
+    "untyped",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open) and counters",
+    _collect,
+)
@@ -0,0 +1,185 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from bridge.core.config import (
+    CONTENT_CACHE_FRESH_S,
+    CONTENT_CACHE_MAX_BYTES,
+    CONTENT_CACHE_TTL,
+)
+from bridge.core.metrics import REGISTRY, stats_samples
+
+# Rough per-entry bookkeeping cost on top of the path and content bytes
+_ENTRY_OVERHEAD = 200
+# Recent invalidations remembered per path to catch fetches that straddle them
+_MAX_TRACKED_INVALIDATIONS = 4096
+
+
+@dataclass
+class CachedNote:
+    """A cached note body plus whatever validators the upstream gave us"""
+
+    content: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    nbytes: int = 0
+    stored_at: float = field(default_factory=time.monotonic)
+
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional GET that answers 304 if unchanged"""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ContentCache:
+    """Size-bounded, byte-accounted LRU cache of note contents keyed by path.
+
+    Entries younger than ``fresh_for`` seconds are served as-is. Older entries
+    with validators (ETag or Last-Modified) are revalidated with a conditional
+    GET; entries without validators expire after ``ttl`` seconds.
+
+    A fetch takes a ``generation()`` token before it starts and hands it to
+    ``put``, which drops the note if the path was invalidated in between: the
+    fetch may have read the note before the write that invalidated it.
+    """
+
+    def __init__(self, max_bytes: int, fresh_for: float, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CachedNote]" = OrderedDict()
+        self._bytes = 0
+        # Invalidation counter; per path, the count at its last invalidation
+        self._generation = 0
+        self._invalidated_at: "OrderedDict[str, int]" = OrderedDict()
+        self._invalidated_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def lookup(self, path: str) -> Optional[CachedNote]:
+        """Get the entry for path (fresh or needing revalidation), or None"""
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        age = time.monotonic() - entry.stored_at
+        if age >= self.ttl and not entry.has_validators():
+            self._drop(path)
+            return None
+        self._entries.move_to_end(path)
+        return entry
+
+    def is_fresh(self, entry: CachedNote) -> bool:
+        return time.monotonic() - entry.stored_at < self.fresh_for
+
+    def record_hit(self, entry: CachedNote, *, revalidated: bool = False) -> None:
+        self.hits += 1
+        if revalidated:
+            self.revalidations += 1
+            entry.stored_at = time.monotonic()
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def generation(self) -> int:
+        """Token to take before fetching a note and pass to ``put``"""
+        return self._generation
+
+    def put(
+        self, path: str, note: CachedNote, generation: Optional[int] = None
+    ) -> None:
+        """Store a note, evicting least recently used entries to fit.
+
+        With a ``generation`` token, the note is only stored if the path was
+        not invalidated since the token was taken.
+        """
+        if not self.enabled:
+            return
+        if generation is not None:
+            # Paths no longer tracked count as invalidated at the floor
+            if self._invalidated_at.get(path, self._invalidated_floor) > generation:
+                self.stale_puts += 1
+                return
+        note.nbytes = len(note.content.encode("utf-8")) + len(path) + _ENTRY_OVERHEAD
+        self._drop(path)
+        if note.nbytes > self.max_bytes:
+            return
+        while self._entries and self._bytes + note.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+            self.evictions += 1
+        self._entries[path] = note
+        self._bytes += note.nbytes
+
+    def invalidate(self, path: str) -> None:
+        self._generation += 1
+        self._invalidated_at[path] = self._generation
+        self._invalidated_at.move_to_end(path)
+        if len(self._invalidated_at) > _MAX_TRACKED_INVALIDATIONS:
+            _, self._invalidated_floor = self._invalidated_at.popitem(last=False)
+        if self._drop(path):
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        # Fetches already in flight must not refill the cache
+        self._generation += 1
+        self._invalidated_at.clear()
+        self._invalidated_floor = self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+        }
+
+    def _drop(self, path: str) -> bool:
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.nbytes
+        return True
+
+
+_content_cache = ContentCache(
+    max_bytes=CONTENT_CACHE_MAX_BYTES,
+    fresh_for=CONTENT_CACHE_FRESH_S,
+    ttl=CONTENT_CACHE_TTL,
+)
+
+
+def get_content_cache() -> ContentCache:
+    return _content_cache
+
+
+REGISTRY.register_collector(
+    "bridge_content_cache",
+    "untyped",
+    "Note content cache statistics by field",
+    lambda: stats_samples("bridge_content_cache", _content_cache.stats()),
+)
@@ -0,0 +1,54 @@
+from typing import Dict, List, Optional, Sequence
+
+from bridge.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EndpointRoutes:
+    """Remembers which upstream endpoint works for each operation.
+
+    The Obsidian REST plugins disagree on endpoint shapes, so ObsidianClient
+    probes a list of candidates. Once a candidate answers, it is remembered for
+    the process lifetime and tried first; it is only forgotten (and the
+    candidates re-probed) when it stops working.
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, str] = {}
+
+    def get(self, operation: str) -> Optional[str]:
+        """Get the learned route for an operation, if any"""
+        return self._routes.get(operation)
+
+    def order(self, operation: str, candidates: Sequence[str]) -> List[str]:
+        """Order candidates so the learned route (if any) is tried first"""
+        learned = self._routes.get(operation)
+        if learned is None or learned not in candidates:
+            return list(candidates)
+        return [learned, *(c for c in candidates if c != learned)]
+
+    def remember(self, operation: str, route: str) -> None:
+        """Record the route that worked for an operation"""
+        if self._routes.get(operation) != route:
+            logger.info(f"Learned route for {operation}: {route}")
+            self._routes[operation] = route
+
+    def forget(self, operation: str) -> None:
+        """Drop the learned route so the next call re-probes"""
+        if self._routes.pop(operation, None) is not None:
+            logger.info(f"Forgot route for {operation}; re-probing")
+
+    def snapshot(self) -> Dict[str, str]:
+        """Copy of the learned routes (for debugging)"""
+        return dict(self._routes)
+
+    def clear(self) -> None:
+        self._routes.clear()
+
+
+_endpoint_routes = EndpointRoutes()
+
+
+def get_endpoint_routes() -> EndpointRoutes:
+    return _endpoint_routes
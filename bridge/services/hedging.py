@@ -0,0 +1,148 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from bridge.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Backend = Tuple[str, Callable[[], Awaitable[Any]]]
+
+# Hedge delay used until the primary has enough latency samples
+_DEFAULT_DELAY_S = 1.0
+_MIN_SAMPLES = 20
+
+
+class BackendStats:
+    """Win/error counters and recent latencies for one backend.
+
+    Latencies are those of successful calls plus, for calls cancelled after
+    losing a race, the time they had run so far: a lower bound, but leaving
+    them out would bias p95 low and make hedging fire ever more often.
+    """
+
+    def __init__(self, window: int = 256) -> None:
+        self.started = 0
+        self.wins = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.50), self.percentile(0.95)
+        return {
+            "started": self.started,
+            "wins": self.wins,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class HedgeError(Exception):
+    """Every hedged backend failed; ``errors`` maps backend name to exception"""
+
+    def __init__(self, errors: Dict[str, BaseException]) -> None:
+        self.errors = errors
+        super().__init__(
+            "; ".join(f"{name} failed: {err}" for name, err in errors.items())
+        )
+
+
+class Hedger:
+    """Runs a primary backend and, if it is slow, a backup in parallel.
+
+    The backup starts once the primary has not answered within the hedge
+    delay (a fixed value, or the primary's learned p95 latency) or as soon as
+    the primary fails. The first success wins and the loser is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, BackendStats] = {}
+
+    def stats(self, name: str) -> BackendStats:
+        return self._stats.setdefault(name, BackendStats())
+
+    def delay_for(self, name: str, fixed: Optional[float] = None) -> float:
+        """Fixed delay if configured, else the backend's learned p95"""
+        if fixed:
+            return fixed
+        stats = self.stats(name)
+        p95 = stats.percentile(0.95)
+        if p95 is None or len(stats.latencies) < _MIN_SAMPLES:
+            return _DEFAULT_DELAY_S
+        return p95
+
+    async def run(
+        self, primary: Backend, backup: Backend, *, delay: Optional[float] = None
+    ) -> Any:
+        hedge_after = self.delay_for(primary[0], delay)
+        tasks: Dict["asyncio.Task[Any]", str] = {}
+        started_at: Dict["asyncio.Task[Any]", float] = {}
+        errors: Dict[str, BaseException] = {}
+
+        def start(backend: Backend) -> None:
+            name, call = backend
+            self.stats(name).started += 1
+            task = asyncio.create_task(self._timed(name, call))
+            tasks[task] = name
+            started_at[task] = time.monotonic()
+
+        start(primary)
+        pending = set(tasks)
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                logger.debug(
+                    f"Hedging {primary[0]} with {backup[0]} after {hedge_after:.3f}s"
+                )
+            backup_started = False
+            while True:
+                for task in done:
+                    name = tasks[task]
+                    err = task.exception()
+                    if err is None:
+                        self.stats(name).wins += 1
+                        return task.result()
+                    self.stats(name).errors += 1
+                    errors[name] = err
+                if not backup_started:
+                    start(backup)
+                    backup_started = True
+                    pending |= {t for t, n in tasks.items() if n == backup[0]}
+                if not pending:
+                    raise HedgeError(errors)
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task, name in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    stats = self.stats(name)
+                    stats.cancelled += 1
+                    stats.latencies.append(time.monotonic() - started_at[task])
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    async def _timed(self, name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        result = await call()
+        self.stats(name).latencies.append(time.monotonic() - started)
+        return result
+
+
+_search_hedger = Hedger()
+
+
+def get_search_hedger() -> Hedger:
+    return _search_hedger
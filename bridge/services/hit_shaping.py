@@ -0,0 +1,177 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bridge.core.config import SEARCH_MAX_BYTES, SEARCH_MAX_HITS, SEARCH_SNIPPET_CHARS
+from bridge.services.search_index import tokenize
+
+# Rough JSON framing cost per hit ({"path":..,"snippet":..,"score":..})
+_HIT_OVERHEAD = 40
+# Narrowest window worth showing when a hit has several match contexts
+_MIN_SEGMENT_CHARS = 80
+_SEPARATOR = " … "
+
+
+@dataclass
+class Context:
+    """A piece of note text around a match; ``start`` is its offset in the note
+    (when the upstream reports it) and ``match`` the match offset within it"""
+
+    text: str
+    match: Optional[int] = None
+    start: Optional[int] = None
+
+
+def center_snippet(text: str, pos: int, width: int) -> str:
+    """Window of ``width`` chars around ``pos``, shifted to stay inside text"""
+    if len(text) <= width:
+        return text.strip()
+    start = min(max(0, pos - width // 2), len(text) - width)
+    return text[start : start + width].strip()
+
+
+def merge_contexts(contexts: List[Context]) -> List[Context]:
+    """Stitch contexts whose note ranges overlap into one; drop duplicates"""
+    located = sorted(
+        (c for c in contexts if c.start is not None), key=lambda c: c.start or 0
+    )
+    merged: List[Context] = []
+    for ctx in located:
+        prev = merged[-1] if merged else None
+        if prev is not None and prev.start is not None:
+            prev_end = prev.start + len(prev.text)
+            if ctx.start is not None and ctx.start <= prev_end:
+                overlap = prev_end - ctx.start
+                prev.text += ctx.text[overlap:]
+                continue
+        merged.append(Context(ctx.text, ctx.match, ctx.start))
+    for ctx in contexts:
+        if ctx.start is None and not any(ctx.text in m.text for m in merged):
+            merged.append(Context(ctx.text, ctx.match))
+    return merged
+
+
+@dataclass
+class _Shaped:
+    hit: Dict[str, Any]
+    contexts: List[Context] = field(default_factory=list)
+    nbytes: int = 0
+
+
+class HitShaper:
+    """Builds search hits under a max_hits / max_bytes budget.
+
+    Snippets are cut to ``snippet_chars`` around the match (the first query
+    term when the upstream gives no position). Contexts for a file that was
+    already added are merged into its hit instead of producing another one.
+    Callers stop feeding items once ``full`` is set, so oversized upstream
+    results are never normalized in full. A limit of 0 means unlimited.
+    """
+
+    def __init__(
+        self,
+        query: str = "",
+        *,
+        max_hits: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        snippet_chars: int = SEARCH_SNIPPET_CHARS,
+    ) -> None:
+        self.terms = set(tokenize(query))
+        self.max_hits = SEARCH_MAX_HITS if max_hits is None else max_hits
+        self.max_bytes = SEARCH_MAX_BYTES if max_bytes is None else max_bytes
+        self.snippet_chars = snippet_chars
+        self.nbytes = 0
+        self._shaped: List[_Shaped] = []
+        self._by_path: Dict[str, _Shaped] = {}
+
+    @property
+    def full(self) -> bool:
+        if self.max_hits and len(self._shaped) >= self.max_hits:
+            return True
+        return bool(self.max_bytes) and self.nbytes >= self.max_bytes
+
+    @property
+    def budget(self) -> Tuple[int, int, int]:
+        """Limits that change the output (part of search cache keys)"""
+        return (self.max_hits, self.max_bytes, self.snippet_chars)
+
+    @property
+    def hits(self) -> List[Dict[str, Any]]:
+        return [s.hit for s in self._shaped]
+
+    def add(self, path: str, contexts: List[Context], score: Any = None) -> bool:
+        """Add (or merge) a hit; returns False if the budget had no room"""
+        shaped = self._by_path.get(path) if path else None
+        if shaped is None:
+            if self.full:
+                return False
+            shaped = _Shaped(hit={"path": path, "snippet": "", "score": score})
+            self._shaped.append(shaped)
+            if path:
+                self._by_path[path] = shaped
+        elif _higher(score, shaped.hit["score"]):
+            shaped.hit["score"] = score
+
+        shaped.contexts = merge_contexts(shaped.contexts + contexts)
+        shaped.hit["snippet"] = self._snippet(shaped.contexts)
+        nbytes = _HIT_OVERHEAD + len(path) + len(shaped.hit["snippet"])
+        self.nbytes += nbytes - shaped.nbytes
+        shaped.nbytes = nbytes
+        return True
+
+    def extend(self, hits: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Shape already-normalized {"path", "snippet", "score"} hits"""
+        for h in hits:
+            if not isinstance(h, dict):
+                h = {"snippet": str(h)}
+            path = str(h.get("path") or h.get("id") or "")
+            snippet = str(h.get("snippet") or "")
+            if not self.add(path, [Context(snippet)], h.get("score")):
+                break
+        return self.hits
+
+    def _snippet(self, contexts: List[Context]) -> str:
+        if not contexts:
+            return ""
+        count = max(1, min(len(contexts), self.snippet_chars // _MIN_SEGMENT_CHARS))
+        width = self.snippet_chars // count
+        parts = [
+            center_snippet(c.text, self._match_pos(c), width) for c in contexts[:count]
+        ]
+        return _SEPARATOR.join(p for p in parts if p)
+
+    def _match_pos(self, ctx: Context) -> int:
+        if ctx.match is not None:
+            return ctx.match
+        lowered = ctx.text.lower()
+        positions = [p for p in (lowered.find(t) for t in self.terms) if p >= 0]
+        return min(positions) if positions else 0
+
+
+def _higher(a: Any, b: Any) -> bool:
+    try:
+        return b is None or (a is not None and a > b)
+    except TypeError:
+        return False
+
+
+def match_contexts(matches: List[Any], context_length: int) -> List[Context]:
+    """Contexts from Local REST API matches: [{"match": {start, end}, "context"}].
+
+    The plugin slices ``context`` from ``start - context_length``, so the match
+    sits ``min(start, context_length)`` chars in.
+    """
+    contexts: List[Context] = []
+    for m in matches:
+        if not isinstance(m, dict):
+            continue
+        text = m.get("context") or m.get("text") or m.get("preview") or ""
+        if not text:
+            continue
+        span = m.get("match")
+        start = span.get("start") if isinstance(span, dict) else None
+        if isinstance(start, int) and start >= 0:
+            offset = min(start, context_length)
+            contexts.append(Context(text, match=offset, start=start - offset))
+        else:
+            contexts.append(Context(text))
+    return contexts
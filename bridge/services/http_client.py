@@ -1,25 +1,147 @@
+import importlib.util
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
 import httpx
 
-from bridge.core.config import OBSIDIAN_VERIFY_SSL
+from bridge.core.config import (
+    MCP_HTTP2,
+    MCP_HTTP_CONNECT_TIMEOUT,
+    MCP_HTTP_KEEPALIVE_EXPIRY,
+    MCP_HTTP_MAX_CONNECTIONS,
+    MCP_HTTP_MAX_KEEPALIVE,
+    MCP_HTTP_POOL_TIMEOUT,
+    MCP_HTTP_READ_TIMEOUT,
+    OBSIDIAN_HTTP2,
+    OBSIDIAN_HTTP_CONNECT_TIMEOUT,
+    OBSIDIAN_HTTP_KEEPALIVE_EXPIRY,
+    OBSIDIAN_HTTP_MAX_CONNECTIONS,
+    OBSIDIAN_HTTP_MAX_KEEPALIVE,
+    OBSIDIAN_HTTP_POOL_TIMEOUT,
+    OBSIDIAN_HTTP_READ_TIMEOUT,
+    OBSIDIAN_VERIFY_SSL,
+)
+from bridge.core.logger import get_logger
+from bridge.core.metrics import REGISTRY, UPSTREAM_IN_FLIGHT, Sample
+
+logger = get_logger(__name__)
+
+MCP = "mcp"
+OBSIDIAN = "obsidian"
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool and timeout settings for one upstream"""
+
+    max_connections: int
+    max_keepalive: int
+    keepalive_expiry: float
+    connect_timeout: float
+    read_timeout: float
+    pool_timeout: float
+    http2: bool
+    verify: bool = True
+
+
+POOL_SETTINGS: Dict[str, PoolSettings] = {
+    MCP: PoolSettings(
+        max_connections=MCP_HTTP_MAX_CONNECTIONS,
+        max_keepalive=MCP_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=MCP_HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=MCP_HTTP_CONNECT_TIMEOUT,
+        read_timeout=MCP_HTTP_READ_TIMEOUT,
+        pool_timeout=MCP_HTTP_POOL_TIMEOUT,
+        http2=MCP_HTTP2,
+    ),
+    OBSIDIAN: PoolSettings(
+        max_connections=OBSIDIAN_HTTP_MAX_CONNECTIONS,
+        max_keepalive=OBSIDIAN_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=OBSIDIAN_HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=OBSIDIAN_HTTP_CONNECT_TIMEOUT,
+        read_timeout=OBSIDIAN_HTTP_READ_TIMEOUT,
+        pool_timeout=OBSIDIAN_HTTP_POOL_TIMEOUT,
+        http2=OBSIDIAN_HTTP2,
+        verify=OBSIDIAN_VERIFY_SSL,
+    ),
+}
+
+_http_clients: Dict[str, httpx.AsyncClient] = {}
 
-_http_client: httpx.AsyncClient | None = None
 
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
 
-def get_http_client() -> httpx.AsyncClient:
-    if _http_client is None:
+
+def _build_client(name: str, settings: PoolSettings) -> httpx.AsyncClient:
+    http2 = settings.http2
+    if http2 and not _http2_available():
+        logger.warning(f"HTTP/2 requested for {name} but 'h2' is not installed")
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        verify=settings.verify,
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.connect_timeout,
+            read=settings.read_timeout,
+            write=settings.read_timeout,
+            pool=settings.pool_timeout,
+        ),
+    )
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Get the shared client for an upstream ("mcp" or "obsidian")"""
+    client = _http_clients.get(name)
+    if client is None:
         raise RuntimeError(
             "HTTP client not initialized. Call startup_http_client() first."
         )
-    return _http_client
+    return client
 
 
 async def startup_http_client() -> None:
-    global _http_client
-    _http_client = httpx.AsyncClient(timeout=25.0, verify=OBSIDIAN_VERIFY_SSL)
+    for name, settings in POOL_SETTINGS.items():
+        if name not in _http_clients:
+            _http_clients[name] = _build_client(name, settings)
 
 
 async def shutdown_http_client() -> None:
-    global _http_client
-    if _http_client is not None:
-        await _http_client.aclose()
-        _http_client = None
+    for name in list(_http_clients):
+        await _http_clients.pop(name).aclose()
+
+
+def _pool_gauge(
+    name: str, help_text: str, value: Callable[[PoolSettings, float], float]
+) -> None:
+    """Register a per-upstream pool gauge; ``value`` gets (settings, in use)"""
+
+    def collect() -> List[Sample]:
+        return [
+            (name, {"upstream": upstream}, value(s, UPSTREAM_IN_FLIGHT.value(upstream)))
+            for upstream, s in POOL_SETTINGS.items()
+        ]
+
+    REGISTRY.register_collector(name, "gauge", help_text, collect)
+
+
+_pool_gauge(
+    "bridge_http_pool_max_connections",
+    "Per-upstream connection pool size",
+    lambda s, in_use: float(s.max_connections),
+)
+_pool_gauge(
+    "bridge_http_pool_in_use",
+    "Per-upstream requests holding a pooled connection",
+    lambda s, in_use: in_use,
+)
+_pool_gauge(
+    "bridge_http_pool_saturation",
+    "Per-upstream pool saturation (in use / size, 0-1)",
+    lambda s, in_use: in_use / s.max_connections if s.max_connections else 0.0,
+)
@@ -1,25 +1,61 @@
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Dict, List, Optional
 
 from bridge.core.config import MCP_ENDPOINT_URL
+from bridge.core.deadline import within_deadline
 from bridge.core.logger import get_logger
-from bridge.services.http_client import get_http_client
+from bridge.core.metrics import track_upstream
+from bridge.core.timing import request_phase
+from bridge.services.circuit_breaker import get_breaker
+from bridge.services.hit_shaping import HitShaper
+from bridge.services.http_client import MCP, get_http_client
+from bridge.services.retry import get_retry_policy, is_transient_status
+from bridge.services.search_cache import get_search_cache
+from bridge.services.singleflight import get_singleflight
+from bridge.services.tool_catalog import get_tool_catalog
 
 logger = get_logger(__name__)
 
 
+def _is_unknown_tool(err: Exception) -> bool:
+    return "unknown tool" in str(err).lower()
+
+
 class MCPClient:
     """Client for interacting with upstream MCP server"""
 
     def __init__(self) -> None:
         self.endpoint_url = MCP_ENDPOINT_URL
 
-    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make an MCP JSON-RPC call"""
+    async def call(
+        self, method: str, params: Dict[str, Any], *, idempotent: bool = False
+    ) -> Dict[str, Any]:
+        """Make an MCP JSON-RPC call; ``idempotent`` calls are retried on
+        transient errors"""
         if not self.endpoint_url:
             raise RuntimeError("MCP endpoint not configured.")
         payload = {"jsonrpc": "2.0", "id": "1", "method": method, "params": params}
-        client = get_http_client()
-        resp = await client.post(self.endpoint_url, json=payload)
+        client = get_http_client(MCP)
+        what = f"mcp {method}"
+
+        def attempt() -> Awaitable[Any]:
+            return within_deadline(
+                lambda: get_breaker("mcp").call(
+                    lambda: track_upstream(
+                        "mcp",
+                        method,
+                        lambda: client.post(self.endpoint_url, json=payload),
+                    ),
+                    is_failure=lambda r: r.status_code >= 500,
+                ),
+                what,
+            )
+
+        if idempotent:
+            resp = await get_retry_policy("mcp").run(
+                attempt, what, retry_result=is_transient_status
+            )
+        else:
+            resp = await attempt()
         resp.raise_for_status()
         json_resp = resp.json()
         if "error" in json_resp:
@@ -27,26 +63,63 @@ class MCPClient:
             raise RuntimeError(f"MCP error: {json_resp['error']}")
         return json_resp.get("result", {})
 
+    async def fetch_tool_list(self) -> List[Dict[str, Any]]:
+        """Fetch available tools from the MCP server, bypassing the catalog cache"""
+        return (await self.call("tools/list", {}, idempotent=True)).get("tools", [])
+
     async def tool_list(self) -> List[Dict[str, Any]]:
-        """List available tools from the MCP server"""
-        return (await self.call("tools/list", {})).get("tools", [])
-
-    async def search(self, query: str) -> List[Dict[str, Any]]:
-        """Search using the MCP server's search tool"""
-        tools = await self.tool_list()
-        tool_name = None
-        for t in tools:
-            if "search" in (t.get("name") or "").lower():
-                tool_name = t["name"]
-                break
+        """List available tools from the MCP server (cached)"""
+        return await get_tool_catalog().tools(self.fetch_tool_list)
+
+    async def search(
+        self,
+        query: str,
+        *,
+        max_hits: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search using the MCP server's search tool, shaped to the hit budget"""
+        cache = get_search_cache()
+        shaper = HitShaper(query, max_hits=max_hits, max_bytes=max_bytes)
+        key = cache.key("mcp", query, shaper.budget)
+        cached = cache.get(key) if cache.enabled else None
+        if cached is not None:
+            return cached
+
+        async def fetch() -> List[Dict[str, Any]]:
+            # Stored under the token of the shared call, not of a later joiner
+            generation = cache.generation()
+            hits = await self._search(query, shaper)
+            cache.put(key, hits, generation)
+            return hits
+
+        hits = await get_singleflight("mcp.search").do(key, fetch)
+        return list(hits)
+
+    async def _search(self, query: str, shaper: HitShaper) -> List[Dict[str, Any]]:
+        catalog = get_tool_catalog()
+        tool_name = await catalog.search_tool(self.fetch_tool_list)
         if not tool_name:
             raise RuntimeError("No MCP search tool found.")
         params = {"name": tool_name, "arguments": {"query": query}}
-        result = await self.call("tools/call", params)
-
-        hits = result.get("result") or result.get("data") or result
-        if isinstance(hits, dict) and "items" in hits:
-            hits = hits["items"]
-        if not isinstance(hits, list):
-            hits = [hits]
-        return hits
+        try:
+            result = await self.call("tools/call", params, idempotent=True)
+        except RuntimeError as e:
+            if not _is_unknown_tool(e):
+                raise
+            # Upstream tools changed under us; rebuild the catalog and retry once
+            logger.info(f"MCP search tool {tool_name} unknown upstream; refreshing")
+            catalog.invalidate()
+            tool_name = await catalog.search_tool(self.fetch_tool_list)
+            if not tool_name:
+                raise RuntimeError("No MCP search tool found.")
+            params = {"name": tool_name, "arguments": {"query": query}}
+            result = await self.call("tools/call", params, idempotent=True)
+
+        with request_phase("normalize"):
+            hits = result.get("result") or result.get("data") or result
+            if isinstance(hits, dict) and "items" in hits:
+                hits = hits["items"]
+            if not isinstance(hits, list):
+                hits = [hits]
+            return shaper.extend(hits)
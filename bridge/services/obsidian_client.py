@@ -1,13 +1,112 @@
+import asyncio
 import json
 import urllib.parse
-from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, ContextManager, Dict, List, Optional, Set
 
-from bridge.core.config import OBSIDIAN_API_KEY, OBSIDIAN_REST_URL
+import httpx
+
+from bridge.core.config import (
+    OBSIDIAN_API_KEY,
+    OBSIDIAN_REST_URL,
+    READ_BATCH_CONCURRENCY,
+)
+from bridge.core.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    remaining,
+    within_deadline,
+)
 from bridge.core.logger import get_logger
-from bridge.services.http_client import get_http_client
+from bridge.core.metrics import endpoint_label, track_upstream
+from bridge.core.timing import request_phase
+from bridge.services.circuit_breaker import CircuitOpenError, get_breaker
+from bridge.services.content_cache import CachedNote, get_content_cache
+from bridge.services.endpoint_routes import get_endpoint_routes
+from bridge.services.hit_shaping import Context, HitShaper, match_contexts
+from bridge.services.http_client import OBSIDIAN, get_http_client
+from bridge.services.retry import get_retry_policy, is_transient_status
+from bridge.services.search_cache import get_search_cache
+from bridge.services.search_index import reindex_note, update_search_index
+from bridge.services.singleflight import get_singleflight
+from bridge.services.upstream_scheduler import (
+    PRIORITY_READ,
+    PRIORITY_SEARCH,
+    PRIORITY_WRITE,
+    UpstreamShed,
+    get_obsidian_scheduler,
+)
+from bridge.services.write_behind import get_write_behind
 
 logger = get_logger(__name__)
 
+# Candidate endpoints, in probe order. The first one that works is remembered
+# (see EndpointRoutes) and tried first on later calls.
+READ_ROUTES = (
+    "/vault/{encoded}",  # Primary endpoint per obsidian-local-rest-api
+    "/vault/{raw}",  # Try without encoding in case API handles it
+    "/file/{encoded}",
+    "/file/{raw}",
+)
+WRITE_ROUTES = (
+    "POST /file",
+    "PUT /file",
+    "POST /vault/file",
+    "PUT /vault/file",
+    "POST /write",
+    "PUT /write",
+)
+# "/vault/{dir}" is obsidian-local-rest-api's own listing (GET /vault/ for the
+# root, /vault/Sub/Dir/ below it); the others take the directory as ?dir=
+LIST_FILES_ROUTES = ("/vault/{dir}", "/list", "/files", "/vault/list", "/vault/files")
+# Append (POST) and PATCH are only offered by obsidian-local-rest-api
+NOTE_EDIT_ROUTE = "/vault/{encoded}"
+PATCH_OPERATIONS = ("append", "prepend", "replace")
+PATCH_TARGET_TYPES = ("heading", "block", "frontmatter")
+
+
+# Errors about the request or backend as a whole, not the route being probed.
+# Transport errors have already been retried (idempotent calls) by then.
+_STOP_PROBING = (
+    CircuitOpenError,
+    UpstreamShed,
+    DeadlineExceeded,
+    httpx.TransportError,
+)
+
+
+class InvalidPatchError(ValueError):
+    """A patch operation or target type the REST API does not support"""
+
+
+def _probe_phase(probing: bool) -> ContextManager[None]:
+    """Time attempts on endpoints other than the learned route as the probe phase"""
+    return request_phase("probe") if probing else nullcontext()
+
+
+def _priority(method: str, path: str) -> int:
+    """Scheduler priority: note reads and listings ahead of searches and writes"""
+    if path.startswith("/search"):
+        return PRIORITY_SEARCH
+    return PRIORITY_READ if method == "GET" else PRIORITY_WRITE
+
+
+def _is_idempotent(method: str, path: str) -> bool:
+    """Reads, listings and searches (a POST) are safe to retry; edits are not"""
+    return method == "GET" or path.startswith("/search")
+
+
+def _is_upstream_failure(r: Any) -> bool:
+    """5xx responses count against the backend's circuit breaker"""
+    return r.status_code >= 500
+
+
+def _forget_note(path: str) -> None:
+    """Drop the cached note and make later reads fetch it afresh (a read in
+    flight may already have the old content)"""
+    get_content_cache().invalidate(path)
+    get_singleflight("obsidian.read").forget(path)
+
 
 def _pick(d: Dict[str, Any], *paths: str, default: Any = None) -> Any:
     """Pick first existing nested key using dotted paths."""
@@ -38,6 +137,41 @@ class ObsidianClient:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
 
+    async def _send(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request to Obsidian REST API through the backend's circuit breaker"""
+        if not self.rest_url:
+            raise RuntimeError("Obsidian REST URL not configured.")
+        client = get_http_client(OBSIDIAN)
+        endpoint = endpoint_label(method, path)
+        what = f"obsidian {endpoint}"
+        if (left := remaining()) is not None and left <= 0:
+            raise DeadlineExceeded(what)
+
+        async def attempt() -> Any:
+            # Queue outside the breaker so waiting does not count as a slow call
+            scheduler = get_obsidian_scheduler()
+            async with scheduler.slot(_priority(method, path), current_deadline()):
+                return await within_deadline(
+                    lambda: get_breaker("obsidian").call(
+                        lambda: track_upstream(
+                            "obsidian",
+                            endpoint,
+                            lambda: client.request(
+                                method, f"{self.rest_url}{path}", **kwargs
+                            ),
+                        ),
+                        is_failure=_is_upstream_failure,
+                    ),
+                    what,
+                )
+
+        if not _is_idempotent(method, path):
+            return await attempt()
+        # Backoff happens outside the scheduler slot
+        return await get_retry_policy("obsidian").run(
+            attempt, what, retry_result=is_transient_status
+        )
+
     async def _get(
         self,
         path: str,
@@ -46,12 +180,8 @@ class ObsidianClient:
         headers: Optional[Dict[str, str]] = None,
     ) -> Any:
         """Make a GET request to Obsidian REST API"""
-        if not self.rest_url:
-            raise RuntimeError("Obsidian REST URL not configured.")
-        client = get_http_client()
         h = self._get_headers(headers)
-        r = await client.get(f"{self.rest_url}{path}", params=params, headers=h)
-        return r
+        return await self._send("GET", path, params=params, headers=h)
 
     async def _post(
         self,
@@ -62,14 +192,8 @@ class ObsidianClient:
         headers: Optional[Dict[str, str]] = None,
     ) -> Any:
         """Make a POST request to Obsidian REST API"""
-        if not self.rest_url:
-            raise RuntimeError("Obsidian REST URL not configured.")
-        client = get_http_client()
         h = {"Content-Type": "application/json", **self._get_headers(headers)}
-        r = await client.post(
-            f"{self.rest_url}{path}", params=params, json=json_body, headers=h
-        )
-        return r
+        return await self._send("POST", path, params=params, json=json_body, headers=h)
 
     async def _put(
         self,
@@ -79,30 +203,60 @@ class ObsidianClient:
         headers: Optional[Dict[str, str]] = None,
     ) -> Any:
         """Make a PUT request to Obsidian REST API"""
-        if not self.rest_url:
-            raise RuntimeError("Obsidian REST URL not configured.")
-        client = get_http_client()
         h = {"Content-Type": "application/json", **self._get_headers(headers)}
-        r = await client.put(f"{self.rest_url}{path}", json=json_body, headers=h)
-        return r
+        return await self._send("PUT", path, json=json_body, headers=h)
 
     async def search(
-        self, query: str, context_length: int = 120
+        self,
+        query: str,
+        context_length: int = 120,
+        *,
+        max_hits: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search Obsidian notes by text query.
+
+        ``max_hits`` / ``max_bytes`` bound the result (defaults from config).
+        """
+        cache = get_search_cache()
+        shaper = HitShaper(query, max_hits=max_hits, max_bytes=max_bytes)
+        key = cache.key("rest", query, (context_length, *shaper.budget))
+        cached = cache.get(key) if cache.enabled else None
+        if cached is not None:
+            return cached
+
+        async def fetch() -> List[Dict[str, Any]]:
+            # Stored under the token of the shared call, not of a later joiner
+            generation = cache.generation()
+            hits = await self._search(query, context_length, shaper)
+            cache.put(key, hits, generation)
+            return hits
+
+        hits = await get_singleflight("obsidian.search").do(key, fetch)
+        return list(hits)
+
+    async def _search(
+        self, query: str, context_length: int, shaper: HitShaper
     ) -> List[Dict[str, Any]]:
-        """Search Obsidian notes by text query"""
         if not self.rest_url:
             raise RuntimeError("Obsidian REST URL not configured.")
         headers = self._get_headers()
-        client = get_http_client()
         params: Dict[str, Any] = {"query": query, "contextLength": str(context_length)}
-        r = await client.post(
-            f"{self.rest_url}/search/simple/", params=params, headers=headers
-        )
+        r = await self._send("POST", "/search/simple/", params=params, headers=headers)
         r.raise_for_status()
-        data = r.json()
+        with request_phase("normalize"):
+            return self._normalize_hits(r.json(), shaper, context_length)
 
-        # --- patched normalization so path/snippet are populated ---
-        hits: List[Dict[str, Any]] = []
+    @staticmethod
+    def _normalize_hits(
+        data: Any, shaper: Optional[HitShaper] = None, context_length: int = 120
+    ) -> List[Dict[str, Any]]:
+        """Normalize plugin search results to {"path", "snippet", "score"} hits.
+
+        Items are fed to ``shaper`` (default budget from config) and the loop
+        stops as soon as its max_hits / max_bytes budget is used up.
+        """
+        shaper = shaper or HitShaper()
 
         # Primary iterable from your current API
         iterable = data if isinstance(data, list) else data.get("results", [])
@@ -116,6 +270,8 @@ class ObsidianClient:
                     break
 
         for item in iterable:
+            if not isinstance(item, dict):
+                continue
             # Try many path locations your plugin might use
             path = (
                 item.get("path")
@@ -128,57 +284,38 @@ class ObsidianClient:
                 or item.get("id")
                 or ""
             )
+            if not isinstance(path, str):
+                path = (path.get("path") or "") if isinstance(path, dict) else str(path)
 
-            # Best-effort snippet candidates
-            snippet = (
-                item.get("snippet")
-                or item.get("preview")
-                or item.get("context")
-                or item.get("text")
-                or ""
-            )
-
-            # Many plugins return matches: [{"text"/"preview"/"context", ...}, ...]
-            if (
-                not snippet
-                and isinstance(item.get("matches"), list)
-                and item["matches"]
-            ):
-                m0 = item["matches"][0]
-                snippet = m0.get("text") or m0.get("preview") or m0.get("context") or ""
+            # Local REST API: matches: [{"match": {"start", "end"}, "context"}, ...]
+            contexts: List[Context] = []
+            if isinstance(item.get("matches"), list):
+                contexts = match_contexts(item["matches"], context_length)
 
-            # final fallbacks so you see *something* useful
-            if not path and isinstance(item.get("file"), dict):
-                path = item["file"].get("path") or ""
+            # Best-effort snippet candidates
+            if not contexts:
+                snippet = (
+                    item.get("snippet")
+                    or item.get("preview")
+                    or item.get("context")
+                    or item.get("text")
+                    or ""
+                )
+                if snippet:
+                    contexts = [Context(str(snippet))]
 
-            if not snippet:
+            # final fallback so you see *something* useful
+            if not contexts and not shaper.full:
+                fields = ("path", "file", "filePath", "notePath", "snippet", "preview")
                 try:
-                    snippet = json.dumps(
-                        {
-                            k: item.get(k)
-                            for k in (
-                                "path",
-                                "file",
-                                "filePath",
-                                "notePath",
-                                "snippet",
-                                "preview",
-                                "text",
-                            )
-                            if k in item
-                        }
-                    )[:240]
-                except Exception:
-                    snippet = ""
-
-            hits.append(
-                {
-                    "path": path,
-                    "snippet": (snippet or "").strip(),
-                    "score": item.get("score"),
-                }
-            )
-        return hits
+                    blob = json.dumps({k: item[k] for k in fields if k in item})
+                    contexts = [Context(blob[: shaper.snippet_chars])]
+                except (TypeError, ValueError):
+                    pass
+
+            if not shaper.add(path, contexts, item.get("score")):
+                break
+        return shaper.hits
 
     async def read(self, path: str) -> str:
         """Read a note by relative path
@@ -186,36 +323,80 @@ class ObsidianClient:
         Based on obsidian-local-rest-api: https://github.com/coddingtonbear/obsidian-local-rest-api
         The endpoint is GET /vault/{path} where path is URL-encoded
         """
+        queue = get_write_behind()
+        pending = queue.pending_content(path) if queue is not None else None
+        if pending is not None:
+            return pending
+        return await get_singleflight("obsidian.read").do(
+            path, lambda: self._read(path)
+        )
+
+    async def read_uncached(self, path: str) -> str:
+        """Read a note straight from Obsidian, bypassing the content cache and
+        read coalescing (for bulk readers such as search index rebuilds)"""
+        queue = get_write_behind()
+        pending = queue.pending_content(path) if queue is not None else None
+        if pending is not None:
+            return pending
+        r = await self._fetch_note(path)
+        return self._read_note(r).content
+
+    async def _read(self, path: str) -> str:
+        cache = get_content_cache()
+        generation = cache.generation()
+        entry = cache.lookup(path) if cache.enabled else None
+        if entry is not None and cache.is_fresh(entry):
+            cache.record_hit(entry)
+            return entry.content
+
+        headers = entry.conditional_headers() if entry is not None else None
+        try:
+            r = await self._fetch_note(path, headers=headers)
+        except RuntimeError:
+            cache.invalidate(path)
+            raise
+
+        if r.status_code == 304 and entry is not None:
+            cache.record_hit(entry, revalidated=True)
+            return entry.content
+
+        note = self._read_note(r)
+        if cache.enabled:
+            cache.record_miss()
+            cache.put(path, note, generation)
+        return note.content
+
+    async def _fetch_note(
+        self, path: str, *, headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """GET a note through the learned read route, probing if needed.
+
+        Returns the 200 response, or a 304 when conditional headers are given
+        and the note is unchanged.
+        """
         # URL encode the path for use in URL
         encoded_path = urllib.parse.quote(path, safe="/")
 
-        # Based on obsidian-local-rest-api docs, the endpoint is GET /vault/{path}
-        endpoints_to_try = [
-            f"/vault/{encoded_path}",  # Primary endpoint per obsidian-local-rest-api
-            f"/vault/{path}",  # Try without encoding in case API handles it
-            f"/file/{encoded_path}",
-            f"/file/{path}",
-        ]
+        routes = get_endpoint_routes()
+        learned = routes.get("read")
+        tried: Set[str] = set()
 
-        for ep in endpoints_to_try:
+        for route in routes.order("read", READ_ROUTES):
+            ep = route.format(encoded=encoded_path, raw=path)
+            if ep in tried:
+                continue
+            tried.add(ep)
             try:
-                r = await self._get(ep)
-
-                if r.status_code == 200:
-                    ct = r.headers.get("Content-Type", "")
-                    if "application/json" in ct:
-                        data = r.json()
-                        # Try various content field names
-                        content = (
-                            data.get("content")
-                            or data.get("text")
-                            or data.get("body")
-                            or json.dumps(data, indent=2)
-                        )
-                        return content
-                    # Return text content directly
-                    return r.text
+                with _probe_phase(route != learned):
+                    r = await self._get(ep, headers=dict(headers) if headers else None)
+
+                if r.status_code in (200, 304):
+                    routes.remember("read", route)
+                    return r
                 elif r.status_code == 404:
+                    if route == learned:
+                        # The learned route is authoritative: the note is missing
+                        break
                     # Continue trying other endpoints
                     continue
                 else:
@@ -223,31 +404,125 @@ class ObsidianClient:
                     logger.warning(
                         f"Unexpected status {r.status_code} from GET {ep}: {r.text[:200]}"
                     )
+            except _STOP_PROBING:
+                raise
             except Exception as e:
                 logger.debug(f"Error trying GET {ep}: {e}")
-                continue
+            if route == learned:
+                routes.forget("read")
 
         raise RuntimeError(
             f"Obsidian REST read not found for path '{path}' - tried all endpoints"
         )
 
+    @staticmethod
+    def _read_note(r: Any) -> CachedNote:
+        """Extract note content and validators from a successful read response"""
+        note = CachedNote(
+            content="",
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+        )
+        ct = r.headers.get("Content-Type", "")
+        if "application/json" in ct:
+            data = r.json()
+            # Try various content field names
+            note.content = (
+                data.get("content")
+                or data.get("text")
+                or data.get("body")
+                or json.dumps(data, indent=2)
+            )
+            return note
+        # Return text content directly
+        note.content = r.text
+        return note
+
+    async def iter_read_many(
+        self,
+        paths: List[str],
+        *,
+        concurrency: int = READ_BATCH_CONCURRENCY,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Read many notes in parallel, yielding each result as it completes.
+
+        Yields {"path", "content"} or {"path", "error"} per unique path. At most
+        ``concurrency`` reads are in flight; paths still pending when
+        ``timeout`` expires are cancelled and yielded as errors.
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def read_one(path: str) -> Dict[str, Any]:
+            async with sem:
+                try:
+                    return {"path": path, "content": await self.read(path)}
+                except Exception as e:
+                    return {"path": path, "error": str(e)}
+
+        tasks = {asyncio.create_task(read_one(p)): p for p in dict.fromkeys(paths)}
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        try:
+            while pending:
+                left = deadline - loop.time() if deadline is not None else None
+                if left is not None and left <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=left, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+            for task in pending:
+                task.cancel()
+                yield {"path": tasks[task], "error": "timed out"}
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def read_many(
+        self, paths: List[str], *, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Read many notes in parallel; results follow the order of ``paths``"""
+        by_path = {
+            item["path"]: item
+            async for item in self.iter_read_many(paths, timeout=timeout)
+        }
+        return [by_path[p] for p in dict.fromkeys(paths)]
+
     async def write(self, path: str, content: str) -> Dict[str, Any]:
-        """Write (create/overwrite) a note at relative path"""
+        """Write (create/overwrite) a note at relative path.
+
+        With WRITE_BEHIND on, the write is journaled and acknowledged at once
+        ({"queued": True}); it reaches Obsidian when the queue flushes it.
+        """
+        queue = get_write_behind()
+        if queue is None:
+            return await self.write_through(path, content)
+        result = await queue.enqueue(path, content)
+        _forget_note(path)
+        get_search_cache().invalidate_path(path)
+        update_search_index(path, content)
+        return result
+
+    async def write_through(self, path: str, content: str) -> Dict[str, Any]:
+        """Write a note to Obsidian now, bypassing the write-behind queue"""
         body = {"path": path, "content": content}
-        for method, ep in (
-            ("POST", "/file"),
-            ("PUT", "/file"),
-            ("POST", "/vault/file"),
-            ("PUT", "/vault/file"),
-            ("POST", "/write"),
-            ("PUT", "/write"),
-        ):
+        _forget_note(path)
+        routes = get_endpoint_routes()
+        learned = routes.get("write")
+        for route in routes.order("write", WRITE_ROUTES):
+            method, ep = route.split(" ", 1)
             try:
-                if method == "POST":
-                    r = await self._post(ep, json_body=body)
-                else:
-                    r = await self._put(ep, json_body=body)
+                with _probe_phase(route != learned):
+                    if method == "POST":
+                        r = await self._post(ep, json_body=body)
+                    else:
+                        r = await self._put(ep, json_body=body)
                 if r.status_code in (200, 201, 204):
+                    routes.remember("write", route)
                     try:
                         data: Dict[str, Any] = r.json()
                     except Exception:
@@ -256,30 +531,124 @@ class ObsidianClient:
                         data = {"ok": True}
                     data.setdefault("ok", True)
                     data.setdefault("path", path)
+                    _forget_note(path)
+                    get_search_cache().invalidate_path(path)
+                    update_search_index(path, content)
                     return data
+            except _STOP_PROBING:
+                raise
             except Exception:
-                continue
+                pass
+            if route == learned:
+                routes.forget("write")
         raise RuntimeError("Obsidian REST write not found")
 
+    async def append(self, path: str, content: str) -> Dict[str, Any]:
+        """Append content to the end of a note (created if missing)"""
+        return await self._edit("POST", path, content)
+
+    async def patch(
+        self,
+        path: str,
+        content: str,
+        *,
+        operation: str,
+        target_type: str,
+        target: str,
+        delimiter: str = "::",
+    ) -> Dict[str, Any]:
+        """Insert content relative to a heading, block reference or frontmatter field.
+
+        Nested headings are addressed as "Heading::Subheading" (``delimiter``).
+        """
+        if operation not in PATCH_OPERATIONS:
+            raise InvalidPatchError(
+                f"operation must be one of {', '.join(PATCH_OPERATIONS)}"
+            )
+        if target_type not in PATCH_TARGET_TYPES:
+            raise InvalidPatchError(
+                f"target_type must be one of {', '.join(PATCH_TARGET_TYPES)}"
+            )
+        headers = {
+            "Operation": operation,
+            "Target-Type": target_type,
+            "Target": urllib.parse.quote(target),
+            "Target-Delimiter": delimiter,
+        }
+        return await self._edit("PATCH", path, content, headers)
+
+    async def _edit(
+        self,
+        method: str,
+        path: str,
+        content: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Send an in-place edit (only the delta) and drop what it made stale"""
+        queue = get_write_behind()
+        if queue is not None:
+            # The edit must land on top of any write still waiting to flush
+            await queue.flush_path(path)
+        ep = NOTE_EDIT_ROUTE.format(encoded=urllib.parse.quote(path, safe="/"))
+        headers = self._get_headers(
+            {"Content-Type": "text/markdown", **(extra_headers or {})}
+        )
+        _forget_note(path)
+        r = await self._send(method, ep, content=content.encode(), headers=headers)
+        _forget_note(path)
+        if r.status_code not in (200, 201, 204):
+            raise RuntimeError(
+                f"Obsidian REST {method.lower()} of {path} failed "
+                f"({r.status_code}): {r.text[:200]}"
+            )
+        get_search_cache().invalidate_path(path)
+        reindex_note(path, self)
+        return {"ok": True, "path": path}
+
     async def list_files(self, dir_path: Optional[str] = None) -> List[str]:
         """List files under a directory (relative). If omitted, may list vault root(s) if supported."""
-        params = {"dir": dir_path} if dir_path else {}
-        for ep in ("/list", "/files", "/vault/list", "/vault/files"):
+        files = await get_singleflight("obsidian.list_files").do(
+            dir_path or "", lambda: self._list_files(dir_path)
+        )
+        return list(files)
+
+    async def _list_files(self, dir_path: Optional[str]) -> List[str]:
+        dir_path = (dir_path or "").strip("/")
+        routes = get_endpoint_routes()
+        learned = routes.get("list_files")
+        for ep in routes.order("list_files", LIST_FILES_ROUTES):
+            if "{dir}" in ep:
+                encoded = urllib.parse.quote(dir_path, safe="/")
+                path, params = ep.format(dir=f"{encoded}/" if encoded else ""), {}
+            else:
+                path, params = ep, {"dir": dir_path} if dir_path else {}
             try:
-                resp = await self._get(ep, params=params)
+                with _probe_phase(ep != learned):
+                    resp = await self._get(path, params=params)
                 if resp.status_code == 200:
                     json_resp = resp.json()
                     if isinstance(json_resp, list):
+                        routes.remember("list_files", ep)
                         return [str(x) for x in json_resp]
                     if isinstance(json_resp, dict):
                         items = json_resp.get("files") or json_resp.get("items") or []
                         out: List[str] = []
                         for it in items:
+                            if isinstance(it, str):
+                                out.append(it)
+                                continue
                             p = _pick(it, "path", "file.path", "id")
                             if p:
                                 out.append(p)
-                        if out:
+                        # An empty listing from the learned route is a real answer
+                        if out or ep == learned:
+                            routes.remember("list_files", ep)
                             return out
+                        continue
+            except _STOP_PROBING:
+                raise
             except Exception:
-                continue
+                pass
+            if ep == learned:
+                routes.forget("list_files")
         return []
@@ -0,0 +1,160 @@
+import base64
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from bridge.core.config import (
+    PAGE_DEFAULT_LIMIT,
+    PAGE_MAX_LIMIT,
+    PAGE_SNAPSHOT_MAX,
+    PAGE_SNAPSHOT_TTL,
+)
+from bridge.core.metrics import REGISTRY, stats_samples
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed, for another tool, or its snapshot has expired"""
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class _Snapshot:
+    kind: str
+    items: List[Any]
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+class ResultPages:
+    """Point-in-time result snapshots behind opaque pagination cursors.
+
+    The first page of a result that does not fit in ``limit`` stores the full
+    result; later pages are sliced from that snapshot without re-running the
+    upstream query. Snapshots are LRU-capped and expire after ``ttl`` seconds.
+    A cursor encodes (snapshot id, offset) and is only valid for its ``kind``.
+    """
+
+    def __init__(self, max_snapshots: int, ttl: float) -> None:
+        self.max_snapshots = max_snapshots
+        self.ttl = ttl
+        self._snapshots: "OrderedDict[str, _Snapshot]" = OrderedDict()
+        self.pages_served = 0
+        self.snapshots_created = 0
+        self.expired = 0
+
+    @staticmethod
+    def clamp_limit(limit: Any) -> int:
+        try:
+            value = int(limit) if limit is not None else PAGE_DEFAULT_LIMIT
+        except (TypeError, ValueError):
+            value = PAGE_DEFAULT_LIMIT
+        return max(1, min(value, PAGE_MAX_LIMIT))
+
+    def first(self, kind: str, items: List[Any], limit: Any = None) -> Page:
+        """First page of a fresh result, snapshotting it if more pages remain"""
+        size = self.clamp_limit(limit)
+        self.pages_served += 1
+        if len(items) <= size or self.max_snapshots <= 0:
+            # Without snapshot room there is nothing to resume from
+            return Page(items=list(items[:size]), total=len(items))
+        snapshot_id = secrets.token_urlsafe(9)
+        self._store(snapshot_id, _Snapshot(kind=kind, items=list(items)))
+        return Page(
+            items=items[:size],
+            total=len(items),
+            next_cursor=self._encode(snapshot_id, size),
+        )
+
+    def next(self, kind: str, cursor: str, limit: Any = None) -> Page:
+        """Page starting at ``cursor``; raises InvalidCursorError if unusable"""
+        snapshot_id, offset = self._decode(cursor)
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is not None and time.monotonic() - snapshot.stored_at >= self.ttl:
+            del self._snapshots[snapshot_id]
+            self.expired += 1
+            snapshot = None
+        if snapshot is None:
+            raise InvalidCursorError("Cursor expired; repeat the query")
+        if snapshot.kind != kind or offset > len(snapshot.items):
+            raise InvalidCursorError("Invalid cursor")
+        self._snapshots.move_to_end(snapshot_id)
+        self.pages_served += 1
+
+        end = offset + self.clamp_limit(limit)
+        next_cursor = None
+        if end < len(snapshot.items):
+            next_cursor = self._encode(snapshot_id, end)
+        else:
+            # Last page read; the snapshot is not needed any more
+            del self._snapshots[snapshot_id]
+        return Page(
+            items=snapshot.items[offset:end],
+            total=len(snapshot.items),
+            next_cursor=next_cursor,
+        )
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": len(self._snapshots),
+            "max_snapshots": self.max_snapshots,
+            "ttl_s": self.ttl,
+            "snapshots_created": self.snapshots_created,
+            "pages_served": self.pages_served,
+            "expired": self.expired,
+        }
+
+    def _store(self, snapshot_id: str, snapshot: _Snapshot) -> None:
+        now = time.monotonic()
+        for key in [
+            k for k, s in self._snapshots.items() if now - s.stored_at >= self.ttl
+        ]:
+            del self._snapshots[key]
+            self.expired += 1
+        while len(self._snapshots) >= self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        self._snapshots[snapshot_id] = snapshot
+        self.snapshots_created += 1
+
+    @staticmethod
+    def _encode(snapshot_id: str, offset: int) -> str:
+        raw = f"{snapshot_id}:{offset}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(cursor: str) -> Tuple[str, int]:
+        try:
+            padded = str(cursor) + "=" * (-len(str(cursor)) % 4)
+            snapshot_id, _, offset = (
+                base64.urlsafe_b64decode(padded).decode().partition(":")
+            )
+            value = int(offset)
+        except (ValueError, UnicodeDecodeError):
+            raise InvalidCursorError("Invalid cursor") from None
+        if not snapshot_id or value < 0:
+            raise InvalidCursorError("Invalid cursor")
+        return snapshot_id, value
+
+
+_result_pages = ResultPages(max_snapshots=PAGE_SNAPSHOT_MAX, ttl=PAGE_SNAPSHOT_TTL)
+
+
+def get_result_pages() -> ResultPages:
+    return _result_pages
+
+
+REGISTRY.register_collector(
+    "bridge_result_pages",
+    "untyped",
+    "Pagination snapshot statistics by field",
+    lambda: stats_samples("bridge_result_pages", _result_pages.stats()),
+)
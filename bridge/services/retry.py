@@ -0,0 +1,192 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+import httpx
+
+from bridge.core.config import (
+    RETRY_BASE_S,
+    RETRY_BUDGET_MIN_PER_S,
+    RETRY_BUDGET_RATIO,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_S,
+)
+from bridge.core.deadline import remaining
+from bridge.core.logger import get_logger
+from bridge.core.metrics import REGISTRY, Sample, stats_samples
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Statuses a proxy or a restarting plugin answers with; worth another try
+TRANSIENT_STATUSES = frozenset({502, 503, 504})
+
+
+def is_transient_status(r: Any) -> bool:
+    return getattr(r, "status_code", None) in TRANSIENT_STATUSES
+
+
+def is_transient_error(e: BaseException) -> bool:
+    """Connection resets, refused connects and read timeouts.
+
+    Pool timeouts are not retried: the pool is exhausted by our own traffic,
+    and retrying would only add to it.
+    """
+    return isinstance(e, httpx.TransportError) and not isinstance(e, httpx.PoolTimeout)
+
+
+class RetryBudget:
+    """Caps retries at ``ratio`` of calls over the last ``window`` seconds.
+
+    ``min_per_s`` retries per second are always allowed so that a backend
+    seeing little traffic can still recover from an occasional reset.
+    """
+
+    def __init__(self, ratio: float, min_per_s: float, window: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_per_s = min_per_s
+        self.window = window
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def record_call(self) -> None:
+        self._calls.append(time.monotonic())
+
+    def try_withdraw(self) -> bool:
+        """Claim one retry if the budget allows it"""
+        now = time.monotonic()
+        self._trim(now)
+        allowed = self.ratio * len(self._calls) + self.min_per_s * self.window
+        if len(self._retries) + 1 > allowed:
+            return False
+        self._retries.append(now)
+        return True
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        for q in (self._calls, self._retries):
+            while q and q[0] < cutoff:
+                q.popleft()
+
+
+class RetryPolicy:
+    """Retries idempotent upstream calls with full-jitter exponential backoff.
+
+    A call is tried at most ``max_attempts`` times; before attempt ``n + 1``
+    it sleeps a random time in ``[0, min(max_delay, base * 2**(n - 1))]``. A
+    retry is skipped when the shared budget is spent or the sleep would run
+    past the request's deadline, and the last error (or response) is returned.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base: float = RETRY_BASE_S,
+        max_delay: float = RETRY_MAX_S,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base = base
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MIN_PER_S)
+        self.calls = 0
+        self.retries = 0
+        self.recovered = 0
+        self.gave_up: Dict[str, int] = {"attempts": 0, "budget": 0, "deadline": 0}
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        what: str,
+        *,
+        retry_result: Optional[Callable[[T], bool]] = None,
+    ) -> T:
+        """Run ``fn``, retrying transient errors and results ``retry_result``
+        flags (the last such result is returned when retries run out)"""
+        self.calls += 1
+        self.budget.record_call()
+        attempt = 1
+        while True:
+            try:
+                result = await fn()
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                delay = self._next_delay(attempt)
+                if delay is None:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if retry_result is None or not retry_result(result):
+                    if attempt > 1:
+                        self.recovered += 1
+                    return result
+                delay = self._next_delay(attempt)
+                if delay is None:
+                    return result
+                reason = f"status {getattr(result, 'status_code', '?')}"
+            logger.debug(
+                f"Retrying {what} in {delay * 1000:.0f}ms "
+                f"(attempt {attempt + 1}/{self.max_attempts}, {reason})"
+            )
+            self.retries += 1
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _next_delay(self, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None to give up"""
+        if attempt >= self.max_attempts:
+            self.gave_up["attempts"] += 1
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base * 2 ** (attempt - 1)))
+        left = remaining()
+        if left is not None and delay >= left:
+            self.gave_up["deadline"] += 1
+            return None
+        if not self.budget.try_withdraw():
+            self.gave_up["budget"] += 1
+            return None
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "gave_up_attempts": self.gave_up["attempts"],
+            "gave_up_budget": self.gave_up["budget"],
+            "gave_up_deadline": self.gave_up["deadline"],
+        }
+
+
+_policies: Dict[str, RetryPolicy] = {}
+
+
+def get_retry_policy(name: str) -> RetryPolicy:
+    """Get (or create) the process-wide retry policy for a backend"""
+    policy = _policies.get(name)
+    if policy is None:
+        policy = _policies[name] = RetryPolicy(name)
+    return policy
+
+
+def retry_snapshot() -> Dict[str, Any]:
+    return {name: p.stats() for name, p in _policies.items()}
+
+
+def _collect() -> List[Sample]:
+    samples: List[Sample] = []
+    for name, policy in _policies.items():
+        samples += stats_samples("bridge_retry", policy.stats(), {"backend": name})
+    return samples
+
+
+REGISTRY.register_collector(
+    "bridge_retry", "untyped", "Upstream retry statistics by field", _collect
+)
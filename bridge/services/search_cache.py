@@ -0,0 +1,176 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+from bridge.core.config import (
+    SEARCH_CACHE_INVALIDATION,
+    SEARCH_CACHE_MAX_BYTES,
+    SEARCH_CACHE_TTL,
+)
+from bridge.core.metrics import REGISTRY, stats_samples
+
+_HIT_OVERHEAD = 64
+_ENTRY_OVERHEAD = 200
+
+SearchKey = Tuple[str, str, Hashable]
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _hit_size(hit: Any) -> int:
+    if isinstance(hit, dict):
+        return len(str(hit.get("path") or "")) + len(str(hit.get("snippet") or ""))
+    return len(str(hit))
+
+
+@dataclass
+class _Entry:
+    hits: List[Dict[str, Any]]
+    paths: FrozenSet[str]
+    nbytes: int
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+class SearchCache:
+    """TTL + byte-capped LRU of normalized search results.
+
+    Keys are (backend, normalized query, extra), e.g. ("rest", "boros", 120).
+    When the bridge writes a note, entries whose hits reference that path are
+    dropped; in "all" mode every entry is dropped, since a write can also add
+    a brand-new match.
+
+    A search takes a ``generation()`` token before it starts and hands it to
+    ``put``. Its hits are not stored if any note was written in between, since
+    the search may have seen the vault from before that write.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, invalidation: str = "path") -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.invalidation = invalidation
+        self._entries: "OrderedDict[SearchKey, _Entry]" = OrderedDict()
+        self._by_path: Dict[str, Set[SearchKey]] = {}
+        self._bytes = 0
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    @staticmethod
+    def key(backend: str, query: str, extra: Hashable = None) -> SearchKey:
+        return (backend, normalize_query(query), extra)
+
+    def get(self, key: SearchKey) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at >= self.ttl:
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry.hits)
+
+    def generation(self) -> int:
+        """Token to take before searching and pass to ``put``"""
+        return self._generation
+
+    def put(
+        self,
+        key: SearchKey,
+        hits: List[Dict[str, Any]],
+        generation: Optional[int] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        if generation is not None and generation != self._generation:
+            self.stale_puts += 1
+            return
+        nbytes = _ENTRY_OVERHEAD + sum(_HIT_OVERHEAD + _hit_size(h) for h in hits)
+        self._drop(key)
+        if nbytes > self.max_bytes:
+            return
+        while self._entries and self._bytes + nbytes > self.max_bytes:
+            old_key = next(iter(self._entries))
+            self._drop(old_key)
+            self.evictions += 1
+        paths = frozenset(
+            str(h["path"]) for h in hits if isinstance(h, dict) and h.get("path")
+        )
+        self._entries[key] = _Entry(hits=list(hits), paths=paths, nbytes=nbytes)
+        self._bytes += nbytes
+        for p in paths:
+            self._by_path.setdefault(p, set()).add(key)
+
+    def invalidate_path(self, path: str) -> None:
+        """Drop cached results affected by a write to ``path``"""
+        self._generation += 1
+        if self.invalidation == "all":
+            self.invalidations += len(self._entries)
+            self.clear()
+            return
+        for key in list(self._by_path.get(path, ())):
+            self._drop(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._by_path.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl,
+            "invalidation": self.invalidation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+        }
+
+    def _drop(self, key: SearchKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.nbytes
+        for p in entry.paths:
+            keys = self._by_path.get(p)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_path[p]
+
+
+_search_cache = SearchCache(
+    max_bytes=SEARCH_CACHE_MAX_BYTES,
+    ttl=SEARCH_CACHE_TTL,
+    invalidation=SEARCH_CACHE_INVALIDATION,
+)
+
+
+def get_search_cache() -> SearchCache:
+    return _search_cache
+
+
+REGISTRY.register_collector(
+    "bridge_search_cache",
+    "untyped",
+    "Search result cache statistics by field",
+    lambda: stats_samples("bridge_search_cache", _search_cache.stats()),
+)
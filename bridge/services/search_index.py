@@ -0,0 +1,312 @@
+import asyncio
+import heapq
+import math
+import re
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Protocol, Set, Tuple
+
+from bridge.core.config import (
+    SEARCH_INDEX_CONCURRENCY,
+    SEARCH_INDEX_ENABLED,
+    SEARCH_INDEX_EXCERPT_CHARS,
+    SEARCH_INDEX_REFRESH_S,
+)
+from bridge.core.deadline import deadline_scope
+from bridge.core.logger import get_logger
+from bridge.core.metrics import REGISTRY, stats_samples
+from bridge.services.content_cache import get_content_cache
+from bridge.services.upstream_scheduler import PRIORITY_BACKGROUND, upstream_priority
+
+logger = get_logger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Only these files are indexed when walking the vault
+INDEXED_EXTENSIONS = (".md", ".markdown", ".txt")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """In-process BM25 inverted index over note contents.
+
+    Postings are stored per term as three parallel ``array('I')`` of doc ids,
+    term frequencies and the offset of the term's first occurrence. Doc ids
+    only grow, so postings stay sorted and new documents are appended in
+    place; re-indexing or removing a note marks its old doc id dead until the
+    next full rebuild compacts the arrays. Only the first ``excerpt_chars`` of
+    each note are kept, for snippets.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        excerpt_chars: int = SEARCH_INDEX_EXCERPT_CHARS,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.excerpt_chars = excerpt_chars
+        self._postings: Dict[str, Tuple[array[int], array[int], array[int]]] = {}
+        self._paths: List[str] = []
+        self._excerpts: List[str] = []
+        self._truncated = bytearray()
+        self._lengths: array[int] = array("I")
+        self._live = bytearray()
+        self._doc_ids: Dict[str, int] = {}
+        self._total_len = 0
+        self.ready = False
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    @property
+    def available(self) -> bool:
+        """Built and holding notes, so searches can be answered locally"""
+        return self.ready and bool(self._doc_ids)
+
+    def add(self, path: str, content: str) -> None:
+        """Index (or re-index) a note"""
+        self.remove(path)
+        terms: Counter[str] = Counter()
+        first: Dict[str, int] = {}
+        # Offsets are into the lowered text; they can drift by a few chars
+        # from the original for the rare letters whose case forms differ
+        for m in _TOKEN_RE.finditer(content.lower()):
+            term = m.group()
+            terms[term] += 1
+            first.setdefault(term, m.start())
+        doc_id = len(self._paths)
+        self._paths.append(path)
+        self._excerpts.append(content[: self.excerpt_chars])
+        self._truncated.append(len(content) > self.excerpt_chars)
+        length = sum(terms.values())
+        self._lengths.append(length)
+        self._live.append(1)
+        self._doc_ids[path] = doc_id
+        self._total_len += length
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"), array("I"))
+            postings[0].append(doc_id)
+            postings[1].append(tf)
+            postings[2].append(first[term])
+
+    def remove(self, path: str) -> None:
+        """Drop a note from results (space is reclaimed on rebuild)"""
+        doc_id = self._doc_ids.pop(path, None)
+        if doc_id is None:
+            return
+        self._live[doc_id] = 0
+        self._excerpts[doc_id] = ""
+        self._total_len -= self._lengths[doc_id]
+
+    def search(
+        self, query: str, *, limit: int = 100, context_length: int = 120
+    ) -> List[Dict[str, Any]]:
+        """BM25-ranked hits shaped like ObsidianClient.search results (limit 0 = all)"""
+        n_docs = len(self._doc_ids)
+        terms = set(tokenize(query))
+        if not n_docs or not terms:
+            return []
+        avgdl = self._total_len / n_docs or 1.0
+        k1, b = self.k1, self.b
+        lengths, live = self._lengths, self._live
+        scores: Dict[int, float] = {}
+        # Earliest offset of any query term, per matching doc
+        offsets: Dict[int, int] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            doc_ids, tfs, firsts = postings
+            df = sum(1 for d in doc_ids if live[d])
+            if not df:
+                continue
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for d, tf, pos in zip(doc_ids, tfs, firsts):
+                if not live[d]:
+                    continue
+                norm = k1 * (1.0 - b + b * lengths[d] / avgdl)
+                scores[d] = scores.get(d, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+                offsets[d] = min(pos, offsets.get(d, pos))
+        top = heapq.nlargest(limit or len(scores), scores.items(), key=lambda kv: kv[1])
+        return [
+            {
+                "path": self._paths[d],
+                "snippet": self._snippet(d, offsets[d], context_length),
+                "score": round(score, 4),
+            }
+            for d, score in top
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "documents": len(self._doc_ids),
+            "dead_documents": len(self._paths) - len(self._doc_ids),
+            "terms": len(self._postings),
+            "excerpt_chars": sum(len(e) for e in self._excerpts),
+            "built_at": self.built_at,
+        }
+
+    def _snippet(self, doc_id: int, pos: int, context_length: int) -> str:
+        """Text around ``pos``, from the excerpt or else the content cache"""
+        text = self._excerpts[doc_id]
+        if self._truncated[doc_id] and pos + context_length // 2 > len(text):
+            cached = get_content_cache().lookup(self._paths[doc_id])
+            if cached is not None:
+                text = cached.content
+            else:
+                pos = 0  # match is past the excerpt; show the note's start
+        start = max(0, pos - context_length // 2)
+        return text[start : start + context_length].strip()
+
+
+class NoteSource(Protocol):
+    async def list_files(self, dir_path: Optional[str] = None) -> List[str]: ...
+
+    async def read(self, path: str) -> str: ...
+
+    async def read_uncached(self, path: str) -> str: ...
+
+
+def _child_path(dir_path: Optional[str], name: str) -> str:
+    if not dir_path or name.startswith(dir_path.rstrip("/") + "/"):
+        return name
+    return f"{dir_path.rstrip('/')}/{name}"
+
+
+async def _walk_vault(source: NoteSource) -> List[str]:
+    """Recursively list indexable files in the vault"""
+    files: List[str] = []
+    pending: List[Optional[str]] = [None]
+    seen: Set[str] = set()
+    while pending:
+        dir_path = pending.pop()
+        for name in await source.list_files(dir_path):
+            path = _child_path(dir_path, name)
+            if path.endswith("/"):
+                if path not in seen:
+                    seen.add(path)
+                    pending.append(path.rstrip("/"))
+            elif path.lower().endswith(INDEXED_EXTENSIONS):
+                files.append(path)
+    return files
+
+
+async def build_search_index(source: NoteSource, concurrency: int) -> SearchIndex:
+    """Build a fresh index from list_files + read_uncached (a full pass over
+    the vault would otherwise evict the hot notes from the content cache)"""
+    started = time.monotonic()
+    index = SearchIndex()
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def index_one(path: str) -> None:
+        async with sem:
+            try:
+                index.add(path, await source.read_uncached(path))
+            except Exception as e:
+                logger.debug(f"Skipping {path} while indexing: {e}")
+
+    paths = await _walk_vault(source)
+    if not paths:
+        # Most likely a listing route this backend does not offer; keep
+        # answering searches upstream rather than from an empty index
+        raise RuntimeError("vault listing found no notes to index")
+    await asyncio.gather(*(index_one(p) for p in paths))
+    if not len(index):
+        raise RuntimeError(f"none of the {len(paths)} listed notes could be read")
+    index.ready = True
+    index.built_at = time.time()
+    logger.info(
+        f"Search index built: {len(index)} notes in {time.monotonic() - started:.1f}s"
+    )
+    return index
+
+
+_search_index = SearchIndex()
+_index_task: Optional[asyncio.Task[None]] = None
+# Notes written while a rebuild is running, replayed onto the new index
+_writes_during_build: Optional[Dict[str, str]] = None
+# Background re-reads after append/patch (held so they are not collected)
+_reindex_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def get_search_index() -> SearchIndex:
+    return _search_index
+
+
+REGISTRY.register_collector(
+    "bridge_search_index",
+    "gauge",
+    "Local search index size by field",
+    lambda: stats_samples("bridge_search_index", _search_index.stats()),
+)
+
+
+def update_search_index(path: str, content: str) -> None:
+    """Re-index a note the bridge just wrote"""
+    _search_index.add(path, content)
+    if _writes_during_build is not None:
+        _writes_during_build[path] = content
+
+
+def reindex_note(path: str, source: NoteSource) -> None:
+    """Re-read and re-index, in the background, a note edited in place upstream"""
+    if not _search_index.ready and _writes_during_build is None:
+        return
+
+    async def run() -> None:
+        try:
+            # Not bound by the deadline of the request that made the edit
+            with deadline_scope(None):
+                update_search_index(path, await source.read(path))
+        except Exception as e:
+            logger.debug(f"Could not re-index {path}: {e}")
+
+    task = asyncio.create_task(run())
+    _reindex_tasks.add(task)
+    task.add_done_callback(_reindex_tasks.discard)
+
+
+async def _maintain_search_index(source: NoteSource) -> None:
+    global _search_index, _writes_during_build
+    while True:
+        _writes_during_build = {}
+        try:
+            # Rebuild reads queue behind interactive traffic
+            with upstream_priority(PRIORITY_BACKGROUND):
+                index = await build_search_index(source, SEARCH_INDEX_CONCURRENCY)
+            for path, content in _writes_during_build.items():
+                index.add(path, content)
+            _search_index = index
+        except Exception as e:
+            logger.warning(f"Search index build failed: {e}")
+        finally:
+            _writes_during_build = None
+        await asyncio.sleep(SEARCH_INDEX_REFRESH_S)
+
+
+async def startup_search_index(source: NoteSource) -> None:
+    """Start building the index in the background and rebuild it periodically"""
+    global _index_task
+    if SEARCH_INDEX_ENABLED and _index_task is None:
+        _index_task = asyncio.create_task(_maintain_search_index(source))
+
+
+async def shutdown_search_index() -> None:
+    global _index_task
+    if _index_task is not None:
+        _index_task.cancel()
+        try:
+            await _index_task
+        except asyncio.CancelledError:
+            pass
+        _index_task = None
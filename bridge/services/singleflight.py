@@ -0,0 +1,152 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+from bridge.core.deadline import (
+    DeadlineExceeded,
+    SharedDeadline,
+    current_deadline,
+    remaining,
+    shared_deadline_scope,
+    within_deadline,
+)
+from bridge.core.metrics import REGISTRY, Sample, stats_samples
+from bridge.core.timing import request_phase
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one in-flight upstream call.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task and share its result or exception. A
+    caller being cancelled does not cancel the shared call for the others,
+    but once no caller is left waiting the shared call is cancelled too, so
+    it stops holding upstream slots.
+
+    The shared call runs under the latest deadline of the callers waiting for
+    it (see SharedDeadline), so upstream scheduling and retries see a real
+    budget; each caller waits only as long as its own deadline allows. A
+    caller that joined after the call had fixed a shorter budget, and still
+    has time left when that budget runs out, starts a fresh call.
+    """
+
+    def __init__(self, name: str = "shared call") -> None:
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._deadlines: Dict["asyncio.Task[Any]", SharedDeadline] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            return await self._wait(key, self._start(key, fn))
+        self.shared += 1
+        with request_phase("coalesced"):
+            try:
+                return await self._wait(key, task)
+            except DeadlineExceeded:
+                if not self._outlived(task):
+                    raise
+        # Our budget outlasted the one the shared call ran out of
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = self._start(key, fn)
+        return await self._wait(key, task)
+
+    def forget(self, key: Hashable) -> None:
+        """Start a fresh call for later callers of ``key``.
+
+        Callers already waiting keep the call in flight; it is used when
+        what the call fetches has changed since it started.
+        """
+        self._inflight.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "upstream": self.calls - self.shared,
+            "coalesced": self.shared,
+            "coalescing_ratio": round(self.shared / self.calls, 4)
+            if self.calls
+            else 0.0,
+            "in_flight": len(self._inflight),
+        }
+
+    def _start(
+        self, key: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> "asyncio.Task[T]":
+        shared = SharedDeadline()
+        with shared_deadline_scope(shared):
+            task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        self._deadlines[task] = shared
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    async def _wait(self, key: Hashable, task: "asyncio.Task[T]") -> T:
+        shared = self._deadlines[task]
+        deadline = current_deadline()
+        shared.join(deadline)
+        try:
+            return await within_deadline(lambda: asyncio.shield(task), self.name)
+        finally:
+            shared.leave(deadline)
+            if not shared.waiters:
+                del self._deadlines[task]
+                if not task.done():
+                    # Every caller gave up; nobody wants the result any more
+                    if self._inflight.get(key) is task:
+                        del self._inflight[key]
+                    task.cancel()
+
+    @staticmethod
+    def _outlived(task: "asyncio.Task[Any]") -> bool:
+        """Whether the call ran out of budget while we still have some"""
+        if not task.done() or task.cancelled():
+            return False
+        if not isinstance(task.exception(), DeadlineExceeded):
+            return False
+        left = remaining()
+        return left is None or left > 0
+
+    def _done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Get (or create) the process-wide single-flight group for an operation"""
+    flight = _flights.get(name)
+    if flight is None:
+        flight = _flights[name] = SingleFlight(name)
+    return flight
+
+
+def singleflight_snapshot() -> Dict[str, Any]:
+    return {name: f.snapshot() for name, f in _flights.items()}
+
+
+def _collect() -> List[Sample]:
+    samples: List[Sample] = []
+    for name, flight in _flights.items():
+        samples += stats_samples(
+            "bridge_singleflight", flight.snapshot(), {"operation": name}
+        )
+    return samples
+
+
+REGISTRY.register_collector(
+    "bridge_singleflight",
+    "untyped",
+    "Single-flight coalescing statistics by operation and field",
+    _collect,
+)
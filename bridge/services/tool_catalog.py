@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bridge.core.config import MCP_TOOL_CATALOG_TTL
+from bridge.core.deadline import deadline_scope
+from bridge.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ToolFetcher = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def find_search_tool(tools: List[Dict[str, Any]]) -> Optional[str]:
+    """Name of the first tool whose name contains "search", if any"""
+    for t in tools:
+        if "search" in (t.get("name") or "").lower():
+            return t["name"]
+    return None
+
+
+class ToolCatalog:
+    """TTL cache of the upstream MCP server's tools/list result.
+
+    The first lookup fetches synchronously. Once the TTL has passed, lookups
+    keep serving the cached catalog while a single background task refreshes
+    it. invalidate() drops the catalog so the next lookup refetches.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._search_tool: Optional[str] = None
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+
+    def is_fresh(self) -> bool:
+        return (
+            self._tools is not None and time.monotonic() - self._fetched_at < self.ttl
+        )
+
+    async def tools(self, fetch: ToolFetcher) -> List[Dict[str, Any]]:
+        """Get the cached tool list, fetching or refreshing as needed"""
+        if self._tools is None:
+            async with self._lock:
+                if self._tools is None:
+                    await self._refresh(fetch)
+        elif not self.is_fresh():
+            self._schedule_refresh(fetch)
+        return self._tools or []
+
+    async def search_tool(self, fetch: ToolFetcher) -> Optional[str]:
+        """Get the resolved upstream search tool name"""
+        await self.tools(fetch)
+        return self._search_tool
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog so the next lookup refetches it"""
+        self._tools = None
+        self._search_tool = None
+        self._fetched_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached": self._tools is not None,
+            "fresh": self.is_fresh(),
+            "age_s": (
+                round(time.monotonic() - self._fetched_at, 3)
+                if self._tools is not None
+                else None
+            ),
+            "ttl_s": self.ttl,
+            "tools": len(self._tools or []),
+            "search_tool": self._search_tool,
+        }
+
+    async def _refresh(self, fetch: ToolFetcher) -> None:
+        tools = await fetch()
+        self._tools = tools
+        self._search_tool = find_search_tool(tools)
+        self._fetched_at = time.monotonic()
+
+    def _schedule_refresh(self, fetch: ToolFetcher) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh(fetch))
+
+    async def _background_refresh(self, fetch: ToolFetcher) -> None:
+        try:
+            # Not bound by the deadline of the request that found it stale
+            with deadline_scope(None):
+                async with self._lock:
+                    if not self.is_fresh():
+                        await self._refresh(fetch)
+        except Exception as e:
+            logger.warning(f"Background MCP tool catalog refresh failed: {e}")
+
+
+_tool_catalog = ToolCatalog(ttl=MCP_TOOL_CATALOG_TTL)
+
+
+def get_tool_catalog() -> ToolCatalog:
+    return _tool_catalog
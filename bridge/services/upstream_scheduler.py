@@ -0,0 +1,192 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from bridge.core.config import (
+    OBSIDIAN_MAX_CONCURRENCY,
+    OBSIDIAN_QUEUE_MAX,
+    OBSIDIAN_QUEUE_WAIT_S,
+)
+from bridge.core.metrics import REGISTRY, stats_samples
+from bridge.core.timing import request_phase
+
+# Lower runs first
+PRIORITY_READ = 0
+PRIORITY_WRITE = 1
+PRIORITY_SEARCH = 1
+PRIORITY_BACKGROUND = 2
+
+# Overrides the per-request priority (e.g. for search index rebuilds)
+_priority_override: ContextVar[Optional[int]] = ContextVar(
+    "upstream_priority", default=None
+)
+
+
+class UpstreamShed(RuntimeError):
+    """Raised instead of queueing a request that could not be served in time"""
+
+    def __init__(self, name: str, reason: str, retry_after: float) -> None:
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(
+            f"{name} is overloaded ({reason}); retry in {retry_after:.1f}s"
+        )
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: "asyncio.Future[None]" = field(compare=False)
+
+
+@contextmanager
+def upstream_priority(priority: int) -> Iterator[None]:
+    """Run upstream calls in this context at ``priority``"""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+class UpstreamScheduler:
+    """Concurrency limiter with a bounded priority queue and load shedding.
+
+    At most ``limit`` calls run at once. Others wait in a queue of at most
+    ``max_queue`` entries, ordered by priority then arrival. A caller is shed
+    (UpstreamShed) when the queue is full, when the expected wait (calls ahead
+    of it times the average service time, spread over ``limit`` slots) would
+    run past its deadline, or when the deadline passes while it waits.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._active = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        # Moving average of how long a call holds its slot, in seconds
+        self.service_time = 0.05
+        self.admitted = 0
+        self.queued = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "deadline": 0}
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._queue if not w.future.done())
+
+    def expected_wait(self, priority: int) -> float:
+        ahead = sum(
+            1 for w in self._queue if w.priority <= priority and not w.future.done()
+        )
+        return (ahead + 1) * self.service_time / max(1, self.limit)
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: int, deadline: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold one of the ``limit`` slots for the duration of the block"""
+        override = _priority_override.get()
+        await self.acquire(priority if override is None else override, deadline)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    async def acquire(self, priority: int, deadline: Optional[float] = None) -> None:
+        if self.limit <= 0 or (self._active < self.limit and not self.waiting):
+            self._active += 1
+            self.admitted += 1
+            return
+        now = time.monotonic()
+        if deadline is None:
+            deadline = now + self.max_wait
+        if self.waiting >= self.max_queue:
+            self._shed("queue_full", self.expected_wait(priority))
+        expected = self.expected_wait(priority)
+        if now + expected > deadline:
+            self._shed("deadline", expected)
+
+        waiter = _Waiter(
+            priority, next(self._seq), asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._queue, waiter)
+        self.queued += 1
+        try:
+            with request_phase("queue"):
+                await asyncio.wait_for(
+                    asyncio.shield(waiter.future), max(0.0, deadline - now)
+                )
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._shed("deadline", self.expected_wait(priority))
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(None)  # the slot was handed over; pass it on
+            else:
+                waiter.future.cancel()
+            raise
+        self.admitted += 1
+
+    def release(self, held_for: Optional[float]) -> None:
+        if held_for is not None:
+            self.service_time += 0.2 * (held_for - self.service_time)
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if not waiter.future.done():
+                # Hand the slot straight to the next waiter
+                waiter.future.set_result(None)
+                return
+        self._active = max(0, self._active - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self._active,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "service_time_ms": round(self.service_time * 1000, 2),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed_queue_full": self.shed["queue_full"],
+            "shed_deadline": self.shed["deadline"],
+        }
+
+    def _shed(self, reason: str, retry_after: float) -> None:
+        self.shed[reason] += 1
+        raise UpstreamShed(self.name, reason, retry_after)
+
+
+_obsidian_scheduler = UpstreamScheduler(
+    "obsidian",
+    limit=OBSIDIAN_MAX_CONCURRENCY,
+    max_queue=OBSIDIAN_QUEUE_MAX,
+    max_wait=OBSIDIAN_QUEUE_WAIT_S,
+)
+
+
+def get_obsidian_scheduler() -> UpstreamScheduler:
+    return _obsidian_scheduler
+
+
+REGISTRY.register_collector(
+    "bridge_upstream_scheduler",
+    "untyped",
+    "Obsidian REST scheduler statistics by field",
+    lambda: stats_samples(
+        "bridge_upstream_scheduler",
+        _obsidian_scheduler.stats(),
+        {"backend": "obsidian"},
+    ),
+)
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bridge.core.config import (
+    WRITE_BEHIND,
+    WRITE_BEHIND_DELAY_S,
+    WRITE_BEHIND_JOURNAL,
+    WRITE_BEHIND_MAX_DELAY_S,
+    WRITE_BEHIND_RETRY_BASE_S,
+    WRITE_BEHIND_RETRY_MAX_S,
+)
+from bridge.core.logger import get_logger
+from bridge.core.metrics import REGISTRY, stats_samples
+
+logger = get_logger(__name__)
+
+Flush = Callable[[str, str], Awaitable[Any]]
+
+
+@dataclass
+class PendingWrite:
+    content: str
+    seq: int
+    first_at: float = field(default_factory=time.monotonic)
+    due_at: float = 0.0
+    attempts: int = 0
+
+
+@dataclass
+class _FlushLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class WriteBehindQueue:
+    """Journaled, per-path coalescing write-behind queue.
+
+    ``enqueue`` appends the write to a JSON-lines journal (fsync'd) before it
+    returns, so an acknowledged write survives a crash. Later writes to the
+    same path replace the pending content and push the flush back by
+    ``delay`` (never beyond ``max_delay`` after the first one). A worker task
+    flushes due writes through ``flush`` and journals a "done" record; failed
+    flushes are retried with exponential backoff. Flushes of one path are
+    serialized, so an older version can never land after a newer one. On
+    start, writes without a "done" record are replayed from the journal.
+    """
+
+    def __init__(
+        self,
+        journal_path: str,
+        flush: Flush,
+        *,
+        delay: float = WRITE_BEHIND_DELAY_S,
+        max_delay: float = WRITE_BEHIND_MAX_DELAY_S,
+        retry_base: float = WRITE_BEHIND_RETRY_BASE_S,
+        retry_max: float = WRITE_BEHIND_RETRY_MAX_S,
+    ) -> None:
+        self.journal_path = journal_path
+        self.flush = flush
+        self.delay = delay
+        self.max_delay = max_delay
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._pending: "OrderedDict[str, PendingWrite]" = OrderedDict()
+        self._flush_locks: Dict[str, _FlushLock] = {}
+        self._seq = 0
+        self._journal: Any = None
+        self._journal_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopping = False
+        self.enqueued = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.failures = 0
+
+    def pending_content(self, path: str) -> Optional[str]:
+        """Content acknowledged for ``path`` but not yet flushed upstream"""
+        pending = self._pending.get(path)
+        return pending.content if pending is not None else None
+
+    def pending_paths(self) -> List[str]:
+        return list(self._pending)
+
+    async def enqueue(self, path: str, content: str) -> Dict[str, Any]:
+        """Journal a write and schedule it; returns once the journal is synced"""
+        async with self._journal_lock:
+            self._seq += 1
+            seq = self._seq
+            await self._append(
+                {"op": "write", "seq": seq, "path": path, "content": content}
+            )
+        self.enqueued += 1
+
+        now = time.monotonic()
+        pending = self._pending.get(path)
+        if pending is None:
+            pending = PendingWrite(content=content, seq=seq)
+            self._pending[path] = pending
+        else:
+            self.coalesced += 1
+            pending.content = content
+            pending.seq = seq
+        pending.due_at = min(now + self.delay, pending.first_at + self.max_delay)
+        self._wakeup.set()
+        return {"ok": True, "path": path, "queued": True, "seq": seq}
+
+    async def start(self) -> None:
+        """Open the journal, replay unflushed writes and start the worker"""
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        await asyncio.to_thread(self._recover)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} journaled write(s)")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush whatever is pending (best effort) and stop the worker"""
+        if self._task is not None:
+            # Let an in-flight flush finish so it is not sent twice
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._task = None
+        try:
+            await asyncio.wait_for(self._flush_due(force=True), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{len(self._pending)} write(s) still pending at shutdown; "
+                "they stay in the journal"
+            )
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "flushed": self.flushed,
+            "failures": self.failures,
+        }
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            await self._flush_due()
+            if self._stopping:
+                return
+            due = [p.due_at for p in self._pending.values()]
+            timeout = max(0.0, min(due) - time.monotonic()) if due else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def flush_path(self, path: str) -> None:
+        """Flush a pending write for ``path`` now (before a delta edit upstream)"""
+        if path in self._pending and not await self._flush_one(path):
+            raise RuntimeError(f"Pending write for {path} could not be flushed")
+
+    async def _flush_due(self, force: bool = False) -> None:
+        now = time.monotonic()
+        for path, pending in list(self._pending.items()):
+            if not force and pending.due_at > now:
+                continue
+            if not await self._flush_one(path) and force:
+                return
+
+    async def _flush_one(self, path: str) -> bool:
+        """Flush the latest pending write for ``path``, waiting for any flush
+        of the same path already in flight"""
+        entry = self._flush_locks.get(path)
+        if entry is None:
+            entry = self._flush_locks[path] = _FlushLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                return await self._flush_locked(path)
+        finally:
+            entry.users -= 1
+            if not entry.users:
+                del self._flush_locks[path]
+
+    async def _flush_locked(self, path: str) -> bool:
+        pending = self._pending.get(path)
+        if pending is None:
+            return True  # flushed by whoever held the lock before us
+        seq, content = pending.seq, pending.content
+        try:
+            await self.flush(path, content)
+        except Exception as e:
+            self.failures += 1
+            pending.attempts += 1
+            backoff = self.retry_base * 2 ** (pending.attempts - 1)
+            pending.due_at = time.monotonic() + min(backoff, self.retry_max)
+            logger.warning(
+                f"Write-behind flush of {path} failed (attempt {pending.attempts}): {e}"
+            )
+            return False
+        self.flushed += 1
+        async with self._journal_lock:
+            await self._append({"op": "done", "seq": seq, "path": path})
+            # A newer write may have arrived while flushing; keep that one
+            if self._pending.get(path) is pending and pending.seq == seq:
+                del self._pending[path]
+            if not self._pending:
+                await asyncio.to_thread(self._truncate)
+        return True
+
+    async def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        await asyncio.to_thread(self._write_line, line)
+
+    def _write_line(self, line: str) -> None:
+        self._journal.write(line)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _truncate(self) -> None:
+        self._journal.truncate(0)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _recover(self) -> None:
+        """Rebuild pending writes from the journal, then compact it"""
+        writes: Dict[str, Dict[str, Any]] = {}
+        done: Dict[str, int] = {}
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash mid-append
+                    seq = int(record.get("seq") or 0)
+                    self._seq = max(self._seq, seq)
+                    path = record.get("path")
+                    if record.get("op") == "write":
+                        writes[path] = record
+                    elif record.get("op") == "done":
+                        done[path] = max(done.get(path, 0), seq)
+        except FileNotFoundError:
+            return
+
+        now = time.monotonic()
+        for path, record in writes.items():
+            if record["seq"] > done.get(path, 0):
+                self._pending[path] = PendingWrite(
+                    content=record["content"], seq=record["seq"], due_at=now
+                )
+
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for path, pending in self._pending.items():
+                record = {
+                    "op": "write",
+                    "seq": pending.seq,
+                    "path": path,
+                    "content": pending.content,
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal_path)
+
+
+_write_behind: Optional[WriteBehindQueue] = None
+
+
+def get_write_behind() -> Optional[WriteBehindQueue]:
+    """The write-behind queue, or None when WRITE_BEHIND is off"""
+    return _write_behind
+
+
+async def startup_write_behind(flush: Flush) -> None:
+    global _write_behind
+    if WRITE_BEHIND and _write_behind is None:
+        queue = WriteBehindQueue(WRITE_BEHIND_JOURNAL, flush)
+        await queue.start()
+        _write_behind = queue
+
+
+async def shutdown_write_behind() -> None:
+    global _write_behind
+    if _write_behind is not None:
+        await _write_behind.stop()
+        _write_behind = None
+
+
+REGISTRY.register_collector(
+    "bridge_write_behind",
+    "untyped",
+    "Write-behind queue statistics by field",
+    lambda: stats_samples(
+        "bridge_write_behind", _write_behind.stats() if _write_behind else {}
+    ),
+)
@@ -0,0 +1,34 @@
+from typing import Callable, Iterator, List
+
+import httpx
+import pytest
+
+from bridge.services import circuit_breaker, http_client, retry
+from bridge.services.endpoint_routes import get_endpoint_routes
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def upstream() -> Iterator[Callable[[Handler], List[httpx.Request]]]:
+    """Install a mock-transport HTTP client; returns the list of seen requests"""
+    seen: List[httpx.Request] = []
+
+    def install(handler: Handler) -> List[httpx.Request]:
+        def record(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return handler(request)
+
+        transport = httpx.MockTransport(record)
+        for name in http_client.POOL_SETTINGS:
+            http_client._http_clients[name] = httpx.AsyncClient(transport=transport)
+        return seen
+
+    get_endpoint_routes().clear()
+    circuit_breaker._breakers.clear()
+    retry._policies.clear()
+    yield install
+    http_client._http_clients.clear()
+    get_endpoint_routes().clear()
+    circuit_breaker._breakers.clear()
+    retry._policies.clear()
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from bridge.bench.harness import compare, percentile, summarize
+from bridge.bench.stub_server import StubConfig, create_stub_app
+
+
+def _stub(shape: str) -> TestClient:
+    config = StubConfig(notes=20, latency_ms=0, jitter_ms=0, shape=shape)
+    return TestClient(create_stub_app(config))
+
+
+class TestStubServer:
+    def test_vault_shape(self) -> None:
+        client = _stub("vault")
+        assert client.get("/vault/Folder0/Note 0.md").status_code == 200
+        assert client.get("/file/Folder0/Note 0.md").status_code == 404
+        listing = client.get("/vault/list").json()["files"]
+        assert "Folder0/" in listing
+
+    def test_file_shape_and_search(self) -> None:
+        client = _stub("file")
+        assert client.get("/files", params={"dir": "Folder1"}).json()["files"]
+        hits = client.post("/search/simple/", params={"query": "note"}).json()
+        assert hits and "filename" in hits[0] and hits[0]["matches"]
+
+    def test_error_injection(self) -> None:
+        config = StubConfig(notes=1, latency_ms=0, jitter_ms=0, error_rate=1.0)
+        client = TestClient(create_stub_app(config))
+        assert client.get("/vault/Folder0/Note 0.md").status_code == 500
+
+
+class TestReport:
+    def test_percentiles(self) -> None:
+        values = [i / 1000 for i in range(1, 101)]
+        assert percentile(values, 0.5) == 0.05
+        assert percentile(values, 0.99) == 0.099
+        stats = summarize(values, errors=0, elapsed=1.0)
+        assert stats["throughput_rps"] == 100.0
+        assert stats["p95_ms"] == 95.0
+
+    def test_compare_flags_regressions(self) -> None:
+        base = {"results": {"read": {"p95_ms": 10.0, "throughput_rps": 100.0}}}
+        worse = {"results": {"read": {"p95_ms": 15.0, "throughput_rps": 70.0}}}
+        same = {"results": {"read": {"p95_ms": 11.0, "throughput_rps": 95.0}}}
+        assert len(compare(worse, base, 0.2)) == 2
+        assert compare(same, base, 0.2) == []
@@ -0,0 +1,117 @@
+from typing import Iterator
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from bridge.core import auth
+from bridge.core.admission import (
+    KeyQuota,
+    QuotaExceeded,
+    TokenBucket,
+    load_key_quotas,
+    quota_exceeded_handler,
+)
+from bridge.routes import mcp
+
+
+class TestTokenBucket:
+    def test_burst_then_wait(self) -> None:
+        bucket = TokenBucket(rate=2.0, burst=3)
+        assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.take() == pytest.approx(0.5, abs=0.01)
+
+
+class TestKeyQuota:
+    def test_concurrency_quota(self) -> None:
+        quota = KeyQuota("a", "k", rate=0, concurrency=2)
+        quota.admit()
+        quota.admit()
+        with pytest.raises(QuotaExceeded) as exc:
+            quota.admit()
+        assert exc.value.reason == "concurrency"
+        quota.release()
+        quota.admit()
+
+    def test_rate_quota_sets_retry_after(self) -> None:
+        quota = KeyQuota("a", "k", rate=0.1, burst=1, concurrency=0)
+        quota.admit()
+        with pytest.raises(QuotaExceeded) as exc:
+            quota.admit()
+        assert exc.value.status_code == 429
+        assert exc.value.headers == {"Retry-After": "10"}
+
+    def test_charge_for_fan_out(self) -> None:
+        quota = KeyQuota("a", "k", rate=0.1, burst=5, concurrency=0)
+        quota.admit()
+        quota.charge(3)
+        with pytest.raises(QuotaExceeded):
+            quota.charge(2)
+
+    def test_load_key_quotas(self) -> None:
+        quotas = load_key_quotas(
+            "main",
+            '{"agent": {"key": "k2", "rate": 1, "concurrency": 3}, "bare": "k3",'
+            ' "broken": {}}',
+        )
+        assert [q.name for q in quotas] == ["default", "agent", "bare"]
+        assert quotas[1].max_concurrency == 3
+        assert quotas[1].bucket.rate == 1
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    monkeypatch.setattr(
+        auth,
+        "_key_quotas",
+        [
+            KeyQuota("a", "key-a", rate=0.01, burst=1, concurrency=0),
+            KeyQuota("b", "key-b", rate=0, concurrency=0),
+        ],
+    )
+    app = FastAPI()
+    app.add_exception_handler(QuotaExceeded, quota_exceeded_handler)
+
+    @app.post("/mcp")
+    async def mcp(_auth: None = Depends(auth.verify_bearer_token)) -> dict:
+        return {"ok": True}
+
+    yield TestClient(app)
+
+
+class TestVerifyBearerToken:
+    def test_keys_have_separate_quotas(self, client: TestClient) -> None:
+        a = {"Authorization": "Bearer key-a"}
+        assert client.post("/mcp", headers=a).status_code == 200
+        resp = client.post("/mcp", headers=a)
+        assert resp.status_code == 429
+        assert int(resp.headers["Retry-After"]) >= 1
+        assert resp.json()["error"]["data"]["reason"] == "rate"
+
+        b = {"Authorization": "Bearer key-b"}
+        assert client.post("/mcp", headers=b).status_code == 200
+        assert auth._key_quotas[1].in_flight == 0
+
+    def test_batches_are_charged_per_call(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            auth, "_key_quotas", [KeyQuota("a", "key-a", rate=0.01, burst=10)]
+        )
+        app = FastAPI()
+        app.add_exception_handler(QuotaExceeded, quota_exceeded_handler)
+        app.include_router(mcp.router)
+        client = TestClient(app)
+        headers = {"Authorization": "Bearer key-a"}
+        ping = {"jsonrpc": "2.0", "method": "ping"}
+
+        batch = [{**ping, "id": i} for i in range(6)]
+        assert client.post("/mcp", json=batch, headers=headers).status_code == 200
+        # 6 of 10 tokens spent: another 6-call batch is over quota
+        resp = client.post("/mcp", json=batch, headers=headers)
+        assert resp.status_code == 429
+        assert resp.json()["error"]["code"] == -32029
+
+    def test_unknown_key(self, client: TestClient) -> None:
+        resp = client.post("/mcp", headers={"Authorization": "Bearer nope"})
+        assert resp.status_code == 403
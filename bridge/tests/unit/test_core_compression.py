@@ -0,0 +1,143 @@
+import gzip
+import zlib
+from typing import AsyncIterator, Iterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from bridge.core.compression import (
+    HAS_BROTLI,
+    HAS_ZSTD,
+    CompressionMiddleware,
+    negotiate,
+)
+
+BIG = "boros " * 1000
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    app = FastAPI()
+
+    @app.post("/mcp")
+    async def mcp(req: Request) -> PlainTextResponse:
+        body = await req.body()
+        return PlainTextResponse(f"{len(body)}:{body[:5].decode()}")
+
+    @app.get("/obsidian/query")
+    async def query(size: int) -> PlainTextResponse:
+        return PlainTextResponse(BIG[:size])
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def events() -> AsyncIterator[bytes]:
+            for i in range(3):
+                yield f"data: {BIG[:500]} {i}\n\n".encode()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_middleware(
+        CompressionMiddleware,
+        paths={"/mcp", "/obsidian/query", "/stream"},
+        inflate_paths={"/mcp"},
+        minimum_size=1024,
+        max_request_bytes=64 * 1024,
+    )
+    yield TestClient(app)
+
+
+class TestNegotiate:
+    def test_prefers_highest_q(self) -> None:
+        assert negotiate("gzip;q=0.5, br", ["zstd", "br", "gzip"]) == "br"
+
+    def test_ties_use_server_order(self) -> None:
+        assert negotiate("gzip, br, zstd", ["zstd", "br", "gzip"]) == "zstd"
+
+    def test_wildcard_and_refusals(self) -> None:
+        assert negotiate("*;q=0.1, zstd;q=0", ["zstd", "gzip"]) == "gzip"
+        assert negotiate("identity", ["gzip"]) is None
+        assert negotiate("", ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+    def test_large_body_is_compressed(self, client: TestClient) -> None:
+        resp = client.get(
+            "/obsidian/query?size=5000", headers={"Accept-Encoding": "gzip"}
+        )
+        assert resp.headers["content-encoding"] == "gzip"
+        assert int(resp.headers["content-length"]) < 5000
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.text == BIG[:5000]
+
+    def test_small_body_is_sent_as_is(self, client: TestClient) -> None:
+        resp = client.get(
+            "/obsidian/query?size=100", headers={"Accept-Encoding": "gzip"}
+        )
+        assert "content-encoding" not in resp.headers
+        assert resp.text == BIG[:100]
+
+    def test_streamed_body_is_compressed_per_chunk(self, client: TestClient) -> None:
+        with client.stream(
+            "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+        ) as resp:
+            assert resp.headers["content-encoding"] == "gzip"
+            assert "content-length" not in resp.headers
+            raw = b"".join(resp.iter_raw())
+        text = zlib.decompress(raw, 16 + zlib.MAX_WBITS).decode()
+        assert text.count("data: ") == 3
+
+    def test_gzip_request_body_is_inflated(self, client: TestClient) -> None:
+        body = b'{"x":"' + b"a" * 20000 + b'"}'
+        resp = client.post(
+            "/mcp", content=gzip.compress(body), headers={"Content-Encoding": "gzip"}
+        )
+        assert resp.text == f'{len(body)}:{{"x":'
+
+    def test_request_body_size_is_capped(self, client: TestClient) -> None:
+        resp = client.post(
+            "/mcp",
+            content=gzip.compress(b"a" * 100_000),
+            headers={"Content-Encoding": "gzip"},
+        )
+        assert resp.status_code == 413
+
+    @pytest.mark.skipif(not HAS_BROTLI, reason="brotli not installed")
+    def test_brotli_bomb_is_refused(self, client: TestClient) -> None:
+        import brotli
+
+        bomb = brotli.compress(b"\0" * (8 * 1024 * 1024))
+        resp = client.post("/mcp", content=bomb, headers={"Content-Encoding": "br"})
+        assert resp.status_code == 413
+
+    @pytest.mark.skipif(not HAS_ZSTD, reason="zstandard not installed")
+    def test_zstd_bomb_is_refused(self, client: TestClient) -> None:
+        import zstandard
+
+        bomb = zstandard.ZstdCompressor().compress(b"\0" * (8 * 1024 * 1024))
+        resp = client.post("/mcp", content=bomb, headers={"Content-Encoding": "zstd"})
+        assert resp.status_code == 413
+
+    @pytest.mark.skipif(not HAS_ZSTD, reason="zstandard not installed")
+    def test_zstd_request_body_is_inflated(self, client: TestClient) -> None:
+        import zstandard
+
+        body = b'{"x":"' + b"a" * 20000 + b'"}'
+        resp = client.post(
+            "/mcp",
+            content=zstandard.ZstdCompressor().compress(body),
+            headers={"Content-Encoding": "zstd"},
+        )
+        assert resp.text == f'{len(body)}:{{"x":'
+
+    def test_bad_request_body(self, client: TestClient) -> None:
+        resp = client.post(
+            "/mcp", content=b"not gzip", headers={"Content-Encoding": "gzip"}
+        )
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == -32700
+
+    def test_unknown_request_coding(self, client: TestClient) -> None:
+        resp = client.post("/mcp", content=b"x", headers={"Content-Encoding": "lzma"})
+        assert resp.status_code == 415
@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import pytest
+
+from bridge.core.deadline import (
+    DeadlineExceeded,
+    SharedDeadline,
+    deadline_scope,
+    parse_budgets,
+    remaining,
+    within_deadline,
+)
+from bridge.routes.mcp import _deadline_for
+from bridge.services.circuit_breaker import get_breaker
+from bridge.services.endpoint_routes import get_endpoint_routes
+from bridge.services.obsidian_client import ObsidianClient
+
+
+class TestDeadlineScope:
+    def test_no_deadline_by_default(self) -> None:
+        assert remaining() is None
+
+    def test_inner_scope_cannot_extend_outer(self) -> None:
+        with deadline_scope(1.0):
+            with deadline_scope(60.0):
+                left = remaining()
+                assert left is not None and left <= 1.0
+            with deadline_scope(None):
+                assert remaining() is None
+        assert remaining() is None
+
+    async def test_within_deadline_cancels_the_call(self) -> None:
+        cancelled = False
+
+        async def slow() -> None:
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded, match="slow call"):
+                await within_deadline(slow, "slow call")
+        assert cancelled
+
+    async def test_spent_budget_fails_before_calling(self) -> None:
+        called = False
+
+        async def call() -> None:
+            nonlocal called
+            called = True
+
+        with deadline_scope(0.0):
+            with pytest.raises(DeadlineExceeded):
+                await within_deadline(call, "call")
+        assert not called
+
+    def test_shared_deadline_follows_its_waiters(self) -> None:
+        shared = SharedDeadline()
+        shared.join(10.0)
+        shared.join(20.0)
+        assert shared.value == 20.0
+        shared.join(None)
+        assert shared.value is None
+        shared.leave(None)
+        shared.leave(20.0)
+        assert shared.value == 10.0 and shared.waiters == 1
+
+    def test_parse_budgets_skips_bad_entries(self) -> None:
+        spec = '{"arcology.read": 5, "arcology.search": -1, "x": "y"}'
+        assert parse_budgets(spec) == {"arcology.read": 5.0}
+        assert parse_budgets("not json") == {}
+        assert parse_budgets("") == {}
+
+
+class TestToolDeadlines:
+    def _body(self, name: str, **params) -> dict:
+        return {"method": "tools/call", "params": {"name": name, **params}}
+
+    def test_per_tool_budget(self) -> None:
+        assert _deadline_for(self._body("arcology.read")) == 15.0
+        assert _deadline_for({"method": "tools/list"}) == 30.0
+
+    def test_client_budget_is_capped(self) -> None:
+        body = self._body("arcology.read", _meta={"timeoutMs": 2500})
+        assert _deadline_for(body) == 2.5
+        body = self._body("arcology.read", _meta={"timeoutMs": 10**9})
+        assert _deadline_for(body) == 120.0
+
+
+class TestUpstreamDeadline:
+    async def test_timeout_is_not_a_breaker_failure(self, upstream) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(5)
+            return httpx.Response(200, text="late")
+
+        upstream(handler)
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded, match="obsidian"):
+                await client.read("a.md")
+        assert get_breaker("obsidian").snapshot()["window_calls"] == 0
@@ -0,0 +1,99 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bridge.core import auth
+from bridge.core.admission import KeyQuota
+from bridge.core.metrics import (
+    REGISTRY,
+    UPSTREAM_TIMEOUTS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    endpoint_label,
+    track_upstream,
+)
+from bridge.routes import health
+from bridge.services import http_client  # noqa: F401  (registers pool gauges)
+
+
+class TestRegistry:
+    def test_render_counter_gauge_and_collector(self) -> None:
+        registry = Registry()
+        counter = registry.register(Counter("c_total", "A counter", ("tool",)))
+        gauge = registry.register(Gauge("g", "A gauge"))
+        counter.inc("arcology.read")
+        counter.inc("arcology.read")
+        gauge.inc()
+        registry.register_collector(
+            "cache", "untyped", "Cache", lambda: [("cache", {"field": "hits"}, 3)]
+        )
+
+        text = registry.render()
+        assert "# TYPE c_total counter" in text
+        assert 'c_total{tool="arcology.read"} 2' in text
+        assert "g 1" in text
+        assert 'cache{field="hits"} 3' in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        hist = Histogram("h", "A histogram", ("method",), buckets=(0.1, 1.0))
+        hist.observe(0.05, "read")
+        hist.observe(0.5, "read")
+        hist.observe(5.0, "read")
+        lines = hist.render()
+        assert 'h_bucket{method="read",le="0.1"} 1' in lines
+        assert 'h_bucket{method="read",le="1"} 2' in lines
+        assert 'h_bucket{method="read",le="+Inf"} 3' in lines
+        assert 'h_count{method="read"} 3' in lines
+        assert hist.count("read") == 3
+
+    def test_every_sample_belongs_to_its_type_line(self) -> None:
+        family, kind = "", ""
+        for line in REGISTRY.render().splitlines():
+            if line.startswith("# TYPE "):
+                _, _, family, kind = line.split(" ")
+                continue
+            if line.startswith("#"):
+                continue
+            name = line.split("{")[0].split(" ")[0]
+            suffixes = ("_bucket", "_sum", "_count") if kind == "histogram" else ()
+            assert name in (family, *(family + s for s in suffixes)), line
+
+
+class TestUpstreamTracking:
+    def test_endpoint_label_collapses_note_paths(self) -> None:
+        assert endpoint_label("GET", "/vault/Magic/Boros.md") == "GET /vault/*"
+        assert endpoint_label("GET", "/list") == "GET /list"
+        assert endpoint_label("POST", "/search/simple/") == "POST /search/simple/"
+
+    async def test_timeout_is_counted(self) -> None:
+        async def timeout() -> httpx.Response:
+            raise httpx.ReadTimeout("slow")
+
+        before = UPSTREAM_TIMEOUTS.value("test", "GET /x")
+        with pytest.raises(httpx.ReadTimeout):
+            await track_upstream("test", "GET /x", timeout)
+        assert UPSTREAM_TIMEOUTS.value("test", "GET /x") == before + 1
+
+
+class TestMetricsEndpoint:
+    def test_requires_bearer_token_but_no_rate(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        quota = KeyQuota("scraper", "key-s", rate=0.001, burst=1)
+        monkeypatch.setattr(auth, "_key_quotas", [quota])
+        app = FastAPI()
+        app.include_router(health.router)
+        client = TestClient(app)
+
+        assert client.get("/metrics").status_code == 403
+        headers = {"Authorization": "Bearer key-s"}
+        for _ in range(3):
+            resp = client.get("/metrics", headers=headers)
+            assert resp.status_code == 200
+        assert 'bridge_key_in_flight{key="scraper"}' in resp.text
+        # Scrapes leave the key's rate budget for its real calls
+        assert quota.bucket is not None and quota.bucket.tokens == 1
+        assert client.get("/health").status_code == 200
@@ -0,0 +1,42 @@
+import json
+
+from bridge.core.responses import (
+    FastJSONResponse,
+    PreEncoded,
+    _dumps_stdlib,
+    encode_json,
+)
+
+
+class TestEncodeJSON:
+    def test_matches_stdlib_output(self) -> None:
+        payload = {"jsonrpc": "2.0", "id": 1, "result": {"content": "Zoë ✓", "n": 1.5}}
+        assert json.loads(encode_json(payload)) == payload
+        assert json.loads(_dumps_stdlib(payload)) == payload
+
+    def test_splices_pre_encoded_result(self) -> None:
+        tools = PreEncoded({"tools": [{"name": "arcology.read"}]})
+        reply = {"jsonrpc": "2.0", "id": "7", "result": tools}
+        assert json.loads(encode_json(reply)) == {
+            "jsonrpc": "2.0",
+            "id": "7",
+            "result": {"tools": [{"name": "arcology.read"}]},
+        }
+
+    def test_splices_inside_batch(self) -> None:
+        tools = PreEncoded({"tools": []})
+        batch = [
+            {"jsonrpc": "2.0", "id": 1, "result": tools},
+            {"jsonrpc": "2.0", "id": 2, "error": {"code": -1, "message": "x"}},
+        ]
+        decoded = json.loads(encode_json(batch))
+        assert decoded[0]["result"] == {"tools": []}
+        assert decoded[1]["error"]["code"] == -1
+
+    def test_big_ints_fall_back(self) -> None:
+        assert json.loads(encode_json({"n": 2**70})) == {"n": 2**70}
+
+    def test_response_body(self) -> None:
+        resp = FastJSONResponse({"ok": True})
+        assert resp.body == b'{"ok":true}'
+        assert resp.media_type == "application/json"
@@ -0,0 +1,45 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bridge.core.auth import verify_bearer_token
+from bridge.core.timing import RequestTimer, request_phase, timing_middleware
+from bridge.routes import health, mcp
+
+
+class TestRequestTimer:
+    def test_server_timing_header(self) -> None:
+        timer = RequestTimer("abc")
+        timer.add("upstream", 0.010)
+        timer.add("upstream", 0.005)
+        timer.add("serialize", 0.001)
+        header = timer.server_timing()
+        assert header.startswith('upstream;dur=15.00;desc="2x", serialize;dur=1.00')
+        assert ", total;dur=" in header
+
+    def test_phase_outside_request_is_noop(self) -> None:
+        with request_phase("upstream"):
+            pass
+
+
+class TestTimingMiddleware:
+    def _client(self) -> TestClient:
+        app = FastAPI()
+        app.middleware("http")(timing_middleware)
+        app.include_router(mcp.router)
+        app.include_router(health.router)
+        app.dependency_overrides[verify_bearer_token] = lambda: None
+        return TestClient(app)
+
+    def test_mcp_gets_server_timing_and_request_id(self) -> None:
+        resp = self._client().post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+            headers={"X-Request-ID": "req-1"},
+        )
+        assert resp.headers["X-Request-ID"] == "req-1"
+        assert "serialize;dur=" in resp.headers["Server-Timing"]
+        assert "total;dur=" in resp.headers["Server-Timing"]
+
+    def test_untimed_paths_are_untouched(self) -> None:
+        resp = self._client().get("/health")
+        assert "Server-Timing" not in resp.headers
@@ -0,0 +1,248 @@
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bridge.core.auth import verify_bearer_token
+from bridge.routes import mcp
+from bridge.services import search_index
+from bridge.services.search_index import SearchIndex
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    app = FastAPI()
+    app.include_router(mcp.router)
+    app.dependency_overrides[verify_bearer_token] = lambda: None
+    yield TestClient(app)
+
+
+@pytest.fixture
+def index(monkeypatch: pytest.MonkeyPatch) -> SearchIndex:
+    index = SearchIndex()
+    for i in range(45):
+        index.add(f"note{i}.md", f"boros note {i}")
+    index.ready = True
+    monkeypatch.setattr(search_index, "_search_index", index)
+    return index
+
+
+def _call(client: TestClient, tool: str, **arguments: Any) -> Dict[str, Any]:
+    return client.post(
+        "/mcp",
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": f"arcology.{tool}", "arguments": arguments},
+        },
+    ).json()
+
+
+class TestMCPBatch:
+    def test_single_request(self, client: TestClient) -> None:
+        resp = client.post("/mcp", json={"jsonrpc": "2.0", "id": 7, "method": "ping"})
+        assert resp.status_code == 200
+        assert resp.json() == {"jsonrpc": "2.0", "id": 7, "result": {"ok": True}}
+
+    def test_batch_preserves_ids_and_reports_errors(self, client: TestClient) -> None:
+        resp = client.post(
+            "/mcp",
+            json=[
+                {"jsonrpc": "2.0", "id": "a", "method": "ping"},
+                {"jsonrpc": "2.0", "id": "b", "method": "nope"},
+                {"jsonrpc": "2.0", "method": "ping"},  # notification
+                "garbage",
+                {"jsonrpc": "2.0", "id": 3, "method": "tools/list"},
+            ],
+        )
+        assert resp.status_code == 200
+        replies = resp.json()
+        assert [r["id"] for r in replies] == ["a", "b", None, 3]
+        assert replies[0]["result"] == {"ok": True}
+        assert replies[1]["error"]["message"] == "Unknown method: nope"
+        assert replies[2]["error"]["code"] == -32600
+        assert "tools" in replies[3]["result"]
+
+    def test_empty_batch(self, client: TestClient) -> None:
+        resp = client.post("/mcp", json=[])
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == -32600
+
+    def test_notification_only_batch(self, client: TestClient) -> None:
+        resp = client.post("/mcp", json=[{"jsonrpc": "2.0", "method": "ping"}])
+        assert resp.status_code == 204
+
+
+def _sse_messages(text: str) -> List[Dict[str, Any]]:
+    return [
+        json.loads(line[len("data: ") :])
+        for line in text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+class TestMCPStreaming:
+    def test_search_reports_progress_and_returns_hits(
+        self, client: TestClient, index
+    ) -> None:
+        resp = client.post(
+            "/mcp",
+            headers={"Accept": "application/json, text/event-stream"},
+            json={
+                "jsonrpc": "2.0",
+                "id": 5,
+                "method": "tools/call",
+                "params": {
+                    "name": "arcology.search",
+                    "arguments": {"query": "boros"},
+                    "_meta": {"progressToken": "t1"},
+                },
+            },
+        )
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        messages = _sse_messages(resp.text)
+        methods = {m.get("method") for m in messages[:-1]}
+        assert methods == {"notifications/progress"}
+        assert messages[-2]["params"] == {
+            "progressToken": "t1",
+            "progress": 45,
+            "total": 45,
+        }
+        final = messages[-1]
+        assert final["id"] == 5
+        # Spec clients only read the response, so it carries every hit
+        assert len(final["result"]["items"]) == 45
+        assert all("boros" in h["snippet"].lower() for h in final["result"]["items"])
+
+    def test_read_batch_reports_each_note(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def iter_read_many(self, paths, timeout):
+            for p in reversed(paths):
+                yield {"path": p, "content": f"body of {p}"}
+
+        monkeypatch.setattr(mcp.ObsidianClient, "iter_read_many", iter_read_many)
+        resp = client.post(
+            "/mcp",
+            headers={"Accept": "text/event-stream"},
+            json={
+                "jsonrpc": "2.0",
+                "id": 7,
+                "method": "tools/call",
+                "params": {
+                    "name": "arcology.read.batch",
+                    "arguments": {"paths": ["a.md", "b.md", "a.md"]},
+                    "_meta": {"progressToken": "t2"},
+                },
+            },
+        )
+        messages = _sse_messages(resp.text)
+        progress = [
+            (m["params"]["progress"], m["params"]["total"])
+            for m in messages
+            if m.get("method") == "notifications/progress"
+        ]
+        assert progress == [(0, 2), (1, 2), (2, 2)]
+        assert messages[-1]["result"] == {
+            "items": [
+                {"path": "a.md", "content": "body of a.md"},
+                {"path": "b.md", "content": "body of b.md"},
+            ]
+        }
+
+    def test_no_progress_token_only_sends_response(
+        self, client: TestClient, index
+    ) -> None:
+        resp = client.post(
+            "/mcp",
+            headers={"Accept": "text/event-stream"},
+            json={
+                "jsonrpc": "2.0",
+                "id": 6,
+                "method": "tools/call",
+                "params": {"name": "arcology.search", "arguments": {"query": "boros"}},
+            },
+        )
+        messages = _sse_messages(resp.text)
+        assert len(messages) == 1
+        assert messages[0]["id"] == 6
+
+    def test_get_is_not_offered(self, client: TestClient) -> None:
+        assert client.get("/mcp").status_code == 405
+
+
+class TestMCPPagination:
+    def test_search_pages_through_snapshot(
+        self, client: TestClient, index: SearchIndex
+    ) -> None:
+        first = _call(client, "search", query="boros", limit=20)["result"]
+        assert len(first["items"]) == 20
+        assert first["total"] == 45
+
+        # Later pages come from the snapshot, not a new query
+        index.ready = False
+        second = _call(client, "search", cursor=first["nextCursor"], limit=20)["result"]
+        third = _call(client, "search", cursor=second["nextCursor"], limit=20)["result"]
+        assert len(third["items"]) == 5
+        assert "nextCursor" not in third
+        paths = [h["path"] for page in (first, second, third) for h in page["items"]]
+        assert len(set(paths)) == 45
+
+    def test_single_page_has_no_cursor(self, client: TestClient, index) -> None:
+        result = _call(client, "search", query="boros")["result"]
+        assert len(result["items"]) == 45
+        assert "nextCursor" not in result
+
+    def test_bad_cursor_is_invalid_params(self, client: TestClient) -> None:
+        reply = _call(client, "list.files", cursor="not-a-cursor")
+        assert reply["error"]["code"] == -32602
+
+    def test_bad_patch_operation_is_invalid_params(self, client: TestClient) -> None:
+        reply = _call(
+            client,
+            "patch",
+            path="a.md",
+            content="x",
+            operation="explode",
+            target_type="heading",
+            target="H",
+        )
+        assert reply["error"]["code"] == -32602
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            {"paths": "a.md"},
+            {"paths": ["a.md", 3]},
+            {"paths": ["a.md"], "timeout_s": "soon"},
+            {"paths": ["a.md"], "timeout_s": 0},
+            {"paths": ["a.md"], "timeout_s": True},
+        ],
+    )
+    def test_bad_read_batch_arguments_are_invalid_params(
+        self, client: TestClient, args: dict
+    ) -> None:
+        reply = _call(client, "read.batch", **args)
+        assert reply["error"]["code"] == -32602
+
+    def test_unparseable_upstream_reply_is_not_a_client_error(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def list_files(self, dir_path=None):
+            return json.loads("<html>bad gateway</html>")
+
+        monkeypatch.setattr(mcp.ObsidianClient, "list_files", list_files)
+        resp = client.post(
+            "/mcp",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "arcology.list.files", "arguments": {}},
+            },
+        )
+        assert resp.status_code == 500
+        assert resp.json()["error"]["code"] != -32602
@@ -0,0 +1,81 @@
+import httpx
+import pytest
+
+from bridge.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_breaker,
+)
+from bridge.services.obsidian_client import ObsidianClient
+
+
+async def _ok() -> str:
+    return "ok"
+
+
+async def _boom() -> str:
+    raise ConnectionError("refused")
+
+
+def _breaker(**kwargs: float) -> CircuitBreaker:
+    opts = {"min_calls": 4, "window": 10, "open_for": 60.0, **kwargs}
+    return CircuitBreaker("test", **opts)  # type: ignore[arg-type]
+
+
+class TestCircuitBreaker:
+    async def test_opens_on_failure_rate(self) -> None:
+        breaker = _breaker()
+        await breaker.call(_ok)
+        await breaker.call(_ok)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(_boom)
+        assert breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_ok)
+        assert breaker.rejected == 1
+
+    async def test_opens_on_slow_calls(self) -> None:
+        breaker = _breaker(slow_call_s=0.0, slow_call_rate=1.0)
+        for _ in range(4):
+            await breaker.call(_ok)
+        assert breaker.state == OPEN
+
+    async def test_half_open_probe_closes_or_reopens(self) -> None:
+        breaker = _breaker(open_for=0.0)
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                await breaker.call(_boom)
+        assert breaker.state == HALF_OPEN
+
+        with pytest.raises(ConnectionError):
+            await breaker.call(_boom)
+        assert breaker.times_opened == 2
+
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == CLOSED
+
+    async def test_is_failure_classifies_results(self) -> None:
+        breaker = _breaker()
+        for _ in range(4):
+            await breaker.call(_ok, is_failure=lambda r: r == "ok")
+        assert breaker.state == OPEN
+
+
+class TestObsidianBreaker:
+    async def test_open_breaker_skips_upstream(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(503))
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+
+        while get_breaker("obsidian").state != OPEN:
+            with pytest.raises(RuntimeError):
+                await client.read("a.md")
+        calls = len(seen)
+        with pytest.raises(CircuitOpenError):
+            await client.read("a.md")
+        assert len(seen) == calls
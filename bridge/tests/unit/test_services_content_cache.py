@@ -0,0 +1,93 @@
+import httpx
+import pytest
+
+from bridge.services import content_cache
+from bridge.services.content_cache import CachedNote, ContentCache, get_content_cache
+from bridge.services.obsidian_client import ObsidianClient
+
+
+class TestContentCache:
+    def test_lru_eviction_by_bytes(self) -> None:
+        cache = ContentCache(max_bytes=1200, fresh_for=60, ttl=60)
+        cache.put("a.md", CachedNote(content="a" * 300))
+        cache.put("b.md", CachedNote(content="b" * 300))
+        cache.lookup("a.md")  # a is now most recently used
+        cache.put("c.md", CachedNote(content="c" * 300))
+
+        assert cache.lookup("b.md") is None
+        assert cache.lookup("a.md") is not None
+        assert cache.evictions == 1
+        assert cache.stats()["bytes"] <= 1200
+
+    def test_oversized_entry_not_stored(self) -> None:
+        cache = ContentCache(max_bytes=100, fresh_for=60, ttl=60)
+        cache.put("big.md", CachedNote(content="x" * 500))
+        assert cache.lookup("big.md") is None
+        assert cache.stats()["bytes"] == 0
+
+    def test_entry_without_validators_expires(self) -> None:
+        cache = ContentCache(max_bytes=1000, fresh_for=0, ttl=0)
+        cache.put("a.md", CachedNote(content="a"))
+        assert cache.lookup("a.md") is None
+
+    def test_conditional_headers(self) -> None:
+        note = CachedNote(content="a", etag='"v1"')
+        assert note.conditional_headers() == {"If-None-Match": '"v1"'}
+        note = CachedNote(content="a", last_modified="Tue, 14 Nov 2023 22:13:20 GMT")
+        assert "If-Modified-Since" in note.conditional_headers()
+
+    def test_put_after_invalidation_is_dropped(self) -> None:
+        cache = ContentCache(max_bytes=10_000, fresh_for=60, ttl=60)
+        generation = cache.generation()
+        cache.invalidate("a.md")  # a write lands while the fetch is in flight
+        cache.put("a.md", CachedNote(content="old"), generation)
+        assert cache.lookup("a.md") is None
+        assert cache.stats()["stale_puts"] == 1
+        # Other paths and fetches started after the write are stored
+        cache.put("b.md", CachedNote(content="b"), generation)
+        cache.put("a.md", CachedNote(content="new"), cache.generation())
+        assert cache.lookup("a.md").content == "new"  # type: ignore[union-attr]
+        assert cache.lookup("b.md") is not None
+
+    def test_untracked_invalidations_are_conservative(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(content_cache, "_MAX_TRACKED_INVALIDATIONS", 2)
+        cache = ContentCache(max_bytes=10_000, fresh_for=60, ttl=60)
+        generation = cache.generation()
+        for p in ("a.md", "b.md", "c.md"):
+            cache.invalidate(p)
+        cache.put("a.md", CachedNote(content="old"), generation)
+        assert cache.lookup("a.md") is None
+
+
+class TestCachedRead:
+    async def test_revalidates_with_etag_and_invalidates_on_write(
+        self, upstream
+    ) -> None:
+        cache = get_content_cache()
+        cache.clear()
+        cache.fresh_for = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method != "GET":
+                return httpx.Response(204)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text="body", headers={"ETag": '"v1"'})
+
+        seen = upstream(handler)
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+        try:
+            assert await client.read("a.md") == "body"
+            hits = cache.hits
+            assert await client.read("a.md") == "body"
+            assert cache.hits == hits + 1
+            assert seen[-1].headers["If-None-Match"] == '"v1"'
+
+            await client.write("a.md", "new")
+            assert cache.lookup("a.md") is None
+        finally:
+            cache.fresh_for = 1.0
+            cache.clear()
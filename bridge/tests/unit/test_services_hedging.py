@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from bridge.routes import obsidian
+from bridge.services.hedging import HedgeError, Hedger
+from bridge.services.upstream_scheduler import UpstreamShed
+
+
+async def _answer(value: str, after: float) -> str:
+    await asyncio.sleep(after)
+    return value
+
+
+async def _fail(after: float) -> str:
+    await asyncio.sleep(after)
+    raise RuntimeError("boom")
+
+
+class TestHedger:
+    async def test_fast_primary_never_starts_backup(self) -> None:
+        hedger = Hedger()
+        result = await hedger.run(
+            ("mcp", lambda: _answer("mcp", 0)),
+            ("rest", lambda: _answer("rest", 0)),
+            delay=0.5,
+        )
+        assert result == "mcp"
+        assert hedger.stats("rest").started == 0
+
+    async def test_slow_primary_loses_and_is_cancelled(self) -> None:
+        hedger = Hedger()
+        result = await hedger.run(
+            ("mcp", lambda: _answer("mcp", 5)),
+            ("rest", lambda: _answer("rest", 0)),
+            delay=0.01,
+        )
+        assert result == "rest"
+        assert hedger.stats("rest").wins == 1
+        assert hedger.stats("mcp").cancelled == 1
+        # The loser's time so far is kept as a (lower bound) latency sample
+        assert len(hedger.stats("mcp").latencies) == 1
+        assert hedger.stats("mcp").latencies[0] >= 0.01
+
+    async def test_primary_failure_starts_backup_immediately(self) -> None:
+        hedger = Hedger()
+        result = await hedger.run(
+            ("mcp", lambda: _fail(0)),
+            ("rest", lambda: _answer("rest", 0)),
+            delay=5,
+        )
+        assert result == "rest"
+        assert hedger.stats("mcp").errors == 1
+
+    async def test_all_fail(self) -> None:
+        hedger = Hedger()
+        with pytest.raises(HedgeError) as exc:
+            await hedger.run(
+                ("mcp", lambda: _fail(0)), ("rest", lambda: _fail(0)), delay=5
+            )
+        assert set(exc.value.errors) == {"mcp", "rest"}
+
+    def test_delay_uses_learned_p95(self) -> None:
+        hedger = Hedger()
+        hedger.stats("mcp").latencies.extend([0.1] * 19 + [0.3] * 5)
+        assert hedger.delay_for("mcp") == 0.3
+        assert hedger.delay_for("mcp", 2.0) == 2.0
+
+
+class TestHedgedSearch:
+    async def test_shed_backend_maps_to_503(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def mcp_search(self, query, **kwargs):
+            raise RuntimeError("mcp down")
+
+        async def rest_search(self, query, **kwargs):
+            raise UpstreamShed("obsidian", "queue_full", 2.5)
+
+        monkeypatch.setattr(obsidian, "MCP_FIRST", True)
+        monkeypatch.setattr(obsidian, "SEARCH_HEDGE", True)
+        monkeypatch.setattr(obsidian.MCPClient, "search", mcp_search)
+        monkeypatch.setattr(obsidian.ObsidianClient, "search", rest_search)
+        with pytest.raises(HTTPException) as exc:
+            await obsidian.unified_search("boros")
+        assert exc.value.status_code == 503
+        assert exc.value.headers == {"Retry-After": "3"}
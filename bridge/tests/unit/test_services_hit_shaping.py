@@ -0,0 +1,76 @@
+from bridge.services.hit_shaping import (
+    Context,
+    HitShaper,
+    center_snippet,
+    match_contexts,
+    merge_contexts,
+)
+from bridge.services.obsidian_client import ObsidianClient
+
+NOTE = "".join(f"line {i:03d} " for i in range(200))
+
+
+def _rest_item(path: str, *positions: int, context_length: int = 20) -> dict:
+    return {
+        "filename": path,
+        "score": len(positions),
+        "matches": [
+            {
+                "match": {"start": p, "end": p + 8},
+                "context": NOTE[max(0, p - context_length) : p + 8 + context_length],
+            }
+            for p in positions
+        ],
+    }
+
+
+class TestSnippets:
+    def test_center_snippet_keeps_match_in_view(self) -> None:
+        text = "x" * 500 + "boros" + "y" * 500
+        snippet = center_snippet(text, 500, 100)
+        assert len(snippet) == 100 and "boros" in snippet
+
+    def test_center_snippet_clamps_at_edges(self) -> None:
+        assert center_snippet("boros" + "y" * 300, 0, 50).startswith("boros")
+
+    def test_overlapping_contexts_are_stitched(self) -> None:
+        item = _rest_item("a.md", 100, 120, 900)
+        merged = merge_contexts(match_contexts(item["matches"], 20))
+        assert len(merged) == 2
+        assert merged[0].text == NOTE[80:148]
+        assert merged[1].text == NOTE[880:928]
+
+    def test_unlocated_duplicates_are_dropped(self) -> None:
+        merged = merge_contexts([Context("boros deck"), Context("boros")])
+        assert [c.text for c in merged] == ["boros deck"]
+
+
+class TestHitShaper:
+    def test_stops_at_max_hits(self) -> None:
+        data = [_rest_item(f"n{i}.md", 100) for i in range(50)]
+        hits = ObsidianClient._normalize_hits(data, HitShaper(max_hits=3), 20)
+        assert [h["path"] for h in hits] == ["n0.md", "n1.md", "n2.md"]
+
+    def test_stops_at_max_bytes(self) -> None:
+        data = [_rest_item(f"n{i}.md", 100) for i in range(50)]
+        shaper = HitShaper(max_hits=0, max_bytes=300)
+        hits = ObsidianClient._normalize_hits(data, shaper, 20)
+        assert 1 < len(hits) < 50
+        assert shaper.nbytes >= 300
+
+    def test_same_file_merges_into_one_hit(self) -> None:
+        data = [_rest_item("a.md", 100)]
+        data.append({"path": "a.md", "snippet": "extra context", "score": 5})
+        hits = ObsidianClient._normalize_hits(data, HitShaper(max_hits=0), 20)
+        assert len(hits) == 1
+        assert hits[0]["score"] == 5
+        assert "line 010" in hits[0]["snippet"]
+        assert "extra context" in hits[0]["snippet"]
+
+    def test_snippet_centered_on_query_term(self) -> None:
+        shaper = HitShaper("boros", snippet_chars=40)
+        hits = shaper.extend(
+            [{"path": "a.md", "snippet": "z" * 300 + " boros " + "z" * 300}]
+        )
+        assert "boros" in hits[0]["snippet"]
+        assert len(hits[0]["snippet"]) <= 40
@@ -0,0 +1,26 @@
+import pytest
+
+from bridge.core.metrics import REGISTRY
+from bridge.services import http_client
+
+
+class TestHTTPClients:
+    async def test_named_clients_per_upstream(self) -> None:
+        await http_client.startup_http_client()
+        try:
+            mcp = http_client.get_http_client(http_client.MCP)
+            obsidian = http_client.get_http_client(http_client.OBSIDIAN)
+            assert mcp is not obsidian
+            settings = http_client.POOL_SETTINGS[http_client.OBSIDIAN]
+            assert obsidian.timeout.connect == settings.connect_timeout
+            assert obsidian.timeout.pool == settings.pool_timeout
+        finally:
+            await http_client.shutdown_http_client()
+
+        with pytest.raises(RuntimeError):
+            http_client.get_http_client(http_client.MCP)
+
+    def test_pool_saturation_metrics(self) -> None:
+        text = REGISTRY.render()
+        assert 'bridge_http_pool_saturation{upstream="obsidian"}' in text
+        assert 'bridge_http_pool_max_connections{upstream="mcp"}' in text
@@ -0,0 +1,158 @@
+import asyncio
+
+import httpx
+import pytest
+
+from bridge.services.endpoint_routes import EndpointRoutes, get_endpoint_routes
+from bridge.services.obsidian_client import InvalidPatchError, ObsidianClient
+
+REST_URL = "http://obsidian.test"
+
+
+def _client() -> ObsidianClient:
+    client = ObsidianClient()
+    client.rest_url = REST_URL
+    return client
+
+
+class TestEndpointRoutes:
+    def test_order_without_learned_route(self) -> None:
+        routes = EndpointRoutes()
+        assert routes.order("read", ["a", "b", "c"]) == ["a", "b", "c"]
+
+    def test_order_puts_learned_route_first(self) -> None:
+        routes = EndpointRoutes()
+        routes.remember("read", "c")
+        assert routes.order("read", ["a", "b", "c"]) == ["c", "a", "b"]
+
+    def test_forget(self) -> None:
+        routes = EndpointRoutes()
+        routes.remember("read", "b")
+        routes.forget("read")
+        assert routes.get("read") is None
+        assert routes.snapshot() == {}
+
+
+class TestLearnedRouting:
+    async def test_read_probes_once_then_uses_learned_route(self, upstream) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/file/"):
+                return httpx.Response(200, text="hello")
+            return httpx.Response(404)
+
+        seen = upstream(handler)
+        client = _client()
+
+        assert await client.read("Notes/a.md") == "hello"
+        probes = len(seen)
+        assert probes == 2  # /vault/ (encoded == raw), then /file/
+        assert get_endpoint_routes().get("read") == "/file/{encoded}"
+
+        assert await client.read("Notes/b.md") == "hello"
+        assert len(seen) == probes + 1
+
+    async def test_read_missing_note_on_learned_route(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(404))
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+
+        with pytest.raises(RuntimeError):
+            await _client().read("missing.md")
+        assert len(seen) == 1
+
+    async def test_write_reprobes_when_learned_route_fails(self, upstream) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "PUT" and request.url.path == "/vault/file":
+                return httpx.Response(204)
+            return httpx.Response(405)
+
+        upstream(handler)
+        get_endpoint_routes().remember("write", "POST /file")
+
+        res = await _client().write("a.md", "body")
+        assert res == {"ok": True, "path": "a.md"}
+        assert get_endpoint_routes().get("write") == "PUT /vault/file"
+
+    async def test_list_files_uses_vault_listing(self, upstream) -> None:
+        # obsidian-local-rest-api: GET /vault/ and /vault/{dir}/, names relative
+        listings = {"/vault/": ["Magic/", "root.md"], "/vault/Magic/": ["Boros.md"]}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            files = listings.get(request.url.path)
+            if files is None:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"files": files})
+
+        seen = upstream(handler)
+        assert await _client().list_files() == ["Magic/", "root.md"]
+        assert await _client().list_files("Magic") == ["Boros.md"]
+        assert [r.url.path for r in seen] == ["/vault/", "/vault/Magic/"]
+
+    async def test_list_files_learned_route_empty_listing(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(200, json={"files": []}))
+        get_endpoint_routes().remember("list_files", "/files")
+
+        assert await _client().list_files("Empty") == []
+        assert len(seen) == 1
+
+
+class TestReadMany:
+    async def test_slow_note_does_not_block_the_rest(self, upstream) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("slow.md"):
+                await asyncio.sleep(5)
+            if request.url.path.endswith("missing.md"):
+                return httpx.Response(404)
+            return httpx.Response(200, text=request.url.path)
+
+        upstream(handler)
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+
+        items = await _client().read_many(
+            ["a.md", "slow.md", "missing.md", "a.md"], timeout=0.2
+        )
+        assert [i["path"] for i in items] == ["a.md", "slow.md", "missing.md"]
+        assert items[0]["content"] == "/vault/a.md"
+        assert items[1]["error"] == "timed out"
+        assert "not found" in items[2]["error"]
+
+
+class TestNoteEdits:
+    async def test_append_sends_only_the_delta(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(204))
+        result = await _client().append("Daily/2024 01 01.md", "- new line\n")
+        assert result == {"ok": True, "path": "Daily/2024 01 01.md"}
+        (request,) = seen
+        assert request.method == "POST"
+        assert request.url.raw_path == b"/vault/Daily/2024%2001%2001.md"
+        assert request.headers["Content-Type"] == "text/markdown"
+        assert request.content == b"- new line\n"
+
+    async def test_patch_targets_heading(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(200))
+        await _client().patch(
+            "a.md",
+            "text",
+            operation="append",
+            target_type="heading",
+            target="Log::Today",
+        )
+        headers = seen[0].headers
+        assert seen[0].method == "PATCH"
+        assert headers["Operation"] == "append"
+        assert headers["Target-Type"] == "heading"
+        assert headers["Target"] == "Log%3A%3AToday"
+
+    async def test_patch_failure_is_reported(self, upstream) -> None:
+        upstream(lambda request: httpx.Response(400, text="heading not found"))
+        with pytest.raises(RuntimeError, match="heading not found"):
+            await _client().patch(
+                "a.md", "x", operation="append", target_type="heading", target="Nope"
+            )
+
+    async def test_patch_rejects_unknown_operation(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(200))
+        with pytest.raises(InvalidPatchError):
+            await _client().patch(
+                "a.md", "x", operation="delete", target_type="heading", target="H"
+            )
+        assert seen == []
@@ -0,0 +1,44 @@
+import pytest
+
+from bridge.services.result_pages import InvalidCursorError, ResultPages
+
+
+class TestResultPages:
+    def test_first_page_fits_without_snapshot(self) -> None:
+        pages = ResultPages(max_snapshots=4, ttl=60)
+        page = pages.first("search", [1, 2, 3], limit=5)
+        assert page.items == [1, 2, 3]
+        assert page.total == 3
+        assert page.next_cursor is None
+        assert pages.stats()["snapshots"] == 0
+
+    def test_walks_pages_and_drops_finished_snapshot(self) -> None:
+        pages = ResultPages(max_snapshots=4, ttl=60)
+        page = pages.first("list.files", list(range(7)), limit=3)
+        seen = list(page.items)
+        while page.next_cursor:
+            page = pages.next("list.files", page.next_cursor, limit=3)
+            seen += page.items
+        assert seen == list(range(7))
+        assert pages.stats()["snapshots"] == 0
+
+    def test_cursor_is_bound_to_kind(self) -> None:
+        pages = ResultPages(max_snapshots=4, ttl=60)
+        cursor = pages.first("search", list(range(5)), limit=2).next_cursor
+        with pytest.raises(InvalidCursorError):
+            pages.next("list.files", cursor)
+
+    def test_expired_and_evicted_snapshots(self) -> None:
+        pages = ResultPages(max_snapshots=1, ttl=60)
+        old = pages.first("search", list(range(5)), limit=2).next_cursor
+        new = pages.first("search", list(range(5)), limit=2).next_cursor
+        with pytest.raises(InvalidCursorError):
+            pages.next("search", old)
+        pages.ttl = 0
+        with pytest.raises(InvalidCursorError):
+            pages.next("search", new)
+
+    @pytest.mark.parametrize("cursor", ["", "!!", "Zm9v", "YWJjOi0x"])
+    def test_malformed_cursor(self, cursor: str) -> None:
+        with pytest.raises(InvalidCursorError):
+            ResultPages(max_snapshots=4, ttl=60).next("search", cursor)
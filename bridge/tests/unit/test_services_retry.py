@@ -0,0 +1,121 @@
+from typing import List
+
+import httpx
+import pytest
+
+from bridge.core.deadline import deadline_scope
+from bridge.services import retry
+from bridge.services.endpoint_routes import get_endpoint_routes
+from bridge.services.obsidian_client import ObsidianClient
+from bridge.services.retry import RetryBudget, RetryPolicy, is_transient_status
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    opts = {"max_attempts": 3, "base": 0.001, "max_delay": 0.001, **kwargs}
+    return RetryPolicy("test", **opts)  # type: ignore[arg-type]
+
+
+def _flaky(failures: int, error: Exception) -> tuple:
+    calls: List[int] = []
+
+    async def fn() -> str:
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+
+    return fn, calls
+
+
+class TestRetryPolicy:
+    async def test_recovers_from_transient_error(self) -> None:
+        policy = _policy()
+        fn, calls = _flaky(2, httpx.ConnectError("reset"))
+        assert await policy.run(fn, "call") == "ok"
+        assert len(calls) == 3
+        assert policy.stats()["recovered"] == 1
+
+    async def test_gives_up_after_max_attempts(self) -> None:
+        policy = _policy()
+        fn, calls = _flaky(5, httpx.ReadError("reset"))
+        with pytest.raises(httpx.ReadError):
+            await policy.run(fn, "call")
+        assert len(calls) == 3
+        assert policy.stats()["gave_up_attempts"] == 1
+
+    async def test_other_errors_are_not_retried(self) -> None:
+        policy = _policy()
+        for error in (ValueError("bad"), httpx.PoolTimeout("pool")):
+            fn, calls = _flaky(1, error)
+            with pytest.raises(type(error)):
+                await policy.run(fn, "call")
+            assert len(calls) == 1
+
+    async def test_transient_status_is_retried(self) -> None:
+        responses = [httpx.Response(503), httpx.Response(200)]
+
+        async def fn() -> httpx.Response:
+            return responses.pop(0)
+
+        r = await _policy().run(fn, "call", retry_result=is_transient_status)
+        assert r.status_code == 200
+
+    async def test_budget_caps_retries(self) -> None:
+        policy = _policy(budget=RetryBudget(ratio=0.0, min_per_s=0.1, window=10.0))
+        fn, calls = _flaky(10, httpx.ConnectError("reset"))
+        with pytest.raises(httpx.ConnectError):
+            await policy.run(fn, "call")
+        # One retry (0.1/s over 10s), then the budget is spent
+        assert len(calls) == 2
+        assert policy.stats()["gave_up_budget"] == 1
+
+    async def test_no_retry_past_deadline(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(retry.random, "uniform", lambda low, high: high)
+        policy = _policy(base=10.0, max_delay=10.0)
+        fn, calls = _flaky(1, httpx.ConnectError("reset"))
+        with deadline_scope(1.0):
+            with pytest.raises(httpx.ConnectError):
+                await policy.run(fn, "call")
+        assert len(calls) == 1
+        assert policy.stats()["gave_up_deadline"] == 1
+
+
+class TestRetryBudget:
+    def test_ratio_of_calls(self) -> None:
+        budget = RetryBudget(ratio=0.5, min_per_s=0.0)
+        for _ in range(4):
+            budget.record_call()
+        assert [budget.try_withdraw() for _ in range(3)] == [True, True, False]
+
+
+class TestObsidianRetries:
+    @pytest.fixture(autouse=True)
+    def fast_retries(self, upstream) -> None:
+        retry._policies["obsidian"] = _policy()
+
+    async def test_read_survives_connection_reset(self, upstream) -> None:
+        attempts: List[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise httpx.RemoteProtocolError("connection reset")
+            return httpx.Response(200, text="hello")
+
+        upstream(handler)
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+        assert await client.read("a.md") == "hello"
+        # The learned route was not forgotten over a transient error
+        assert get_endpoint_routes().get("read") == "/vault/{encoded}"
+
+    async def test_append_is_not_retried(self, upstream) -> None:
+        seen = upstream(lambda request: httpx.Response(503))
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+        with pytest.raises(Exception):
+            await client.append("a.md", "more")
+        assert len(seen) == 1
@@ -0,0 +1,66 @@
+from bridge.services.search_cache import SearchCache
+
+
+def _hits(*paths: str):
+    return [{"path": p, "snippet": "boros", "score": 1.0} for p in paths]
+
+
+class TestSearchCache:
+    def test_key_normalizes_query(self) -> None:
+        assert SearchCache.key("rest", "  Boros   Angels ", 120) == (
+            "rest",
+            "boros angels",
+            120,
+        )
+
+    def test_hit_and_miss(self) -> None:
+        cache = SearchCache(max_bytes=10_000, ttl=60)
+        key = cache.key("rest", "boros", 120)
+        assert cache.get(key) is None
+        cache.put(key, _hits("a.md"))
+        assert cache.get(key) == _hits("a.md")
+        assert cache.get(cache.key("rest", "boros", 200)) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_write_invalidates_entries_referencing_path(self) -> None:
+        cache = SearchCache(max_bytes=10_000, ttl=60)
+        boros = cache.key("rest", "boros")
+        dimir = cache.key("rest", "dimir")
+        cache.put(boros, _hits("a.md", "b.md"))
+        cache.put(dimir, _hits("c.md"))
+
+        cache.invalidate_path("b.md")
+        assert cache.get(boros) is None
+        assert cache.get(dimir) is not None
+
+    def test_search_straddling_a_write_is_not_stored(self) -> None:
+        cache = SearchCache(max_bytes=10_000, ttl=60)
+        key = cache.key("rest", "boros")
+        generation = cache.generation()
+        cache.invalidate_path("new.md")  # may add a match the search missed
+        cache.put(key, _hits("a.md"), generation)
+        assert cache.get(key) is None
+        assert cache.stats()["stale_puts"] == 1
+        cache.put(key, _hits("a.md", "new.md"), cache.generation())
+        assert cache.get(key) == _hits("a.md", "new.md")
+
+    def test_conservative_mode_drops_everything(self) -> None:
+        cache = SearchCache(max_bytes=10_000, ttl=60, invalidation="all")
+        cache.put(cache.key("rest", "dimir"), _hits("c.md"))
+        cache.invalidate_path("new.md")
+        assert cache.stats()["entries"] == 0
+
+    def test_memory_cap_evicts_lru(self) -> None:
+        cache = SearchCache(max_bytes=700, ttl=60)
+        cache.put(cache.key("rest", "a"), _hits("a.md"))
+        cache.put(cache.key("rest", "b"), _hits("b.md"))
+        cache.put(cache.key("rest", "c"), _hits("c.md"))
+        assert cache.evictions >= 1
+        assert cache.stats()["bytes"] <= 700
+
+    def test_ttl_expiry(self) -> None:
+        cache = SearchCache(max_bytes=10_000, ttl=60)
+        key = cache.key("mcp", "boros")
+        cache.put(key, ["raw text hit"])
+        cache.ttl = 0
+        assert cache.get(key) is None
@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional
+
+import httpx
+import pytest
+
+from bridge.services.content_cache import CachedNote, get_content_cache
+from bridge.services.endpoint_routes import get_endpoint_routes
+from bridge.services.obsidian_client import ObsidianClient
+from bridge.services.search_index import SearchIndex, build_search_index, tokenize
+from bridge.services.singleflight import get_singleflight
+
+
+class _Vault:
+    def __init__(self, notes: Dict[str, str]) -> None:
+        self.notes = notes
+
+    async def list_files(self, dir_path: Optional[str] = None) -> List[str]:
+        prefix = f"{dir_path}/" if dir_path else ""
+        names = set()
+        for path in self.notes:
+            if not path.startswith(prefix):
+                continue
+            head, sep, _ = path[len(prefix) :].partition("/")
+            names.add(f"{head}/" if sep else head)
+        return sorted(names)
+
+    async def read(self, path: str) -> str:
+        return self.notes[path]
+
+    async def read_uncached(self, path: str) -> str:
+        return self.notes[path]
+
+
+class TestSearchIndex:
+    def test_tokenize(self) -> None:
+        assert tokenize("Boros, Legion-Angel!") == ["boros", "legion", "angel"]
+
+    def test_bm25_ranks_denser_match_first(self) -> None:
+        index = SearchIndex()
+        index.add("a.md", "boros aggro deck with one boros card")
+        index.add("b.md", "a long note about dimir control that mentions boros once")
+        index.add("c.md", "nothing relevant here")
+
+        hits = index.search("boros")
+        assert [h["path"] for h in hits] == ["a.md", "b.md"]
+        assert hits[0]["score"] > hits[1]["score"]
+        assert "boros" in hits[0]["snippet"]
+
+    def test_reindex_and_remove(self) -> None:
+        index = SearchIndex()
+        index.add("a.md", "boros")
+        index.add("a.md", "dimir")
+        assert index.search("boros") == []
+        assert [h["path"] for h in index.search("dimir")] == ["a.md"]
+
+        index.remove("a.md")
+        assert index.search("dimir") == []
+        assert index.stats()["dead_documents"] == 2
+
+    async def test_build_walks_vault(self) -> None:
+        vault = _Vault(
+            {
+                "Magic/Boros.md": "boros angels",
+                "Magic/Decks/Mono.md": "mono red boros",
+                "image.png": "boros",
+            }
+        )
+        index = await build_search_index(vault, concurrency=2)
+        assert index.ready
+        assert len(index) == 2
+        assert {h["path"] for h in index.search("boros")} == {
+            "Magic/Boros.md",
+            "Magic/Decks/Mono.md",
+        }
+
+    async def test_rebuild_leaves_content_cache_alone(self, upstream) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/vault/":
+                return httpx.Response(200, json={"files": ["a.md", "b.md"]})
+            return httpx.Response(200, text=f"boros in {request.url.path}")
+
+        upstream(handler)
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+        get_endpoint_routes().remember("list_files", "/vault/{dir}")
+        cache = get_content_cache()
+        cache.clear()
+        reads = get_singleflight("obsidian.read").calls
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+
+        index = await build_search_index(client, concurrency=2)
+        assert len(index) == 2
+        assert cache.stats()["entries"] == 0
+        assert get_singleflight("obsidian.read").calls == reads
+
+    async def test_empty_listing_does_not_make_index_ready(self) -> None:
+        with pytest.raises(RuntimeError, match="no notes"):
+            await build_search_index(_Vault({"image.png": "x"}), concurrency=2)
+        index = SearchIndex()
+        index.ready = True
+        assert not index.available
+
+    def test_snippet_beyond_excerpt_uses_content_cache(self) -> None:
+        index = SearchIndex(excerpt_chars=20)
+        content = "filler " * 20 + "the boros angel"
+        index.add("far.md", content)
+        assert index.stats()["excerpt_chars"] == 20
+        # Not cached: fall back to the start of the note
+        assert index.search("boros", context_length=30)[0]["snippet"].startswith(
+            "filler"
+        )
+        cache = get_content_cache()
+        cache.put("far.md", CachedNote(content=content))
+        try:
+            snippet = index.search("boros", context_length=30)[0]["snippet"]
+        finally:
+            cache.invalidate("far.md")
+        assert "boros" in snippet
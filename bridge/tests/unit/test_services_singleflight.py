@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from bridge.core.deadline import (
+    DeadlineExceeded,
+    deadline_scope,
+    remaining,
+    within_deadline,
+)
+from bridge.services.content_cache import get_content_cache
+from bridge.services.endpoint_routes import get_endpoint_routes
+from bridge.services.obsidian_client import ObsidianClient
+from bridge.services.singleflight import SingleFlight
+from bridge.services.upstream_scheduler import UpstreamShed, get_obsidian_scheduler
+
+
+class TestSingleFlight:
+    async def test_concurrent_identical_calls_share_one_call(self) -> None:
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert flight.snapshot()["coalescing_ratio"] == 0.8
+        assert flight.snapshot()["in_flight"] == 0
+
+    async def test_exception_is_shared(self) -> None:
+        flight = SingleFlight()
+
+        async def fail() -> str:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_cancelled_waiter_does_not_cancel_others(self) -> None:
+        flight = SingleFlight()
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.02)
+            return "value"
+
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "value"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_last_waiter_leaving_cancels_the_call(self) -> None:
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch() -> str:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "value"
+
+        waiters = [asyncio.create_task(flight.do("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled.is_set()
+        waiters[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert flight.snapshot()["in_flight"] == 0
+
+    async def test_call_runs_under_latest_waiting_deadline(self) -> None:
+        flight = SingleFlight()
+        seen = []
+
+        async def fetch() -> str:
+            seen.append(remaining())
+            await asyncio.sleep(0.1)
+            seen.append(remaining())
+            return "value"
+
+        async def call(budget: float) -> str:
+            with deadline_scope(budget):
+                return await flight.do("k", fetch)
+
+        short = asyncio.create_task(call(0.02))
+        await asyncio.sleep(0)
+        long = asyncio.create_task(call(15.0))
+        with pytest.raises(DeadlineExceeded):
+            await short
+        assert await long == "value"
+        # The first caller's budget at the start, the second's once it joined
+        assert seen[0] is not None and seen[0] <= 0.02
+        assert seen[1] is not None and 14.0 < seen[1] < 15.0
+
+    async def test_joiner_with_more_time_restarts_a_timed_out_call(self) -> None:
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await within_deadline(lambda: asyncio.sleep(0.05), "fetch")
+            return "value"
+
+        async def call(budget: float) -> str:
+            with deadline_scope(budget):
+                return await flight.do("k", fetch)
+
+        short = asyncio.create_task(call(0.02))
+        await asyncio.sleep(0)
+        long = asyncio.create_task(call(5.0))
+        with pytest.raises(DeadlineExceeded):
+            await short
+        assert await long == "value"
+        assert calls == 2
+
+
+class TestCoalescedRead:
+    async def test_identical_reads_hit_upstream_once(self, upstream) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, text="body")
+
+        seen = upstream(handler)
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+        get_content_cache().clear()
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+
+        results = await asyncio.gather(*(client.read("a.md") for _ in range(4)))
+        assert results == ["body"] * 4
+        assert len(seen) == 1
+        get_content_cache().clear()
+
+    async def test_read_after_write_does_not_join_older_read(self, upstream) -> None:
+        release = asyncio.Event()
+        bodies = ["old", "new"]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method != "GET":
+                return httpx.Response(204)
+            body = bodies.pop(0)
+            if body == "old":
+                await release.wait()
+            return httpx.Response(200, text=body)
+
+        upstream(handler)
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+        get_endpoint_routes().remember("write", "PUT /file")
+        cache = get_content_cache()
+        cache.clear()
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+        try:
+            before = asyncio.create_task(client.read("a.md"))
+            await asyncio.sleep(0.01)
+            await client.write_through("a.md", "new")
+            after = asyncio.create_task(client.read("a.md"))
+            await asyncio.sleep(0.01)
+            release.set()
+            assert await before == "old"
+            assert await after == "new"
+            # The older read finished last but did not put "old" back
+            entry = cache.lookup("a.md")
+            assert entry is not None and entry.content == "new"
+        finally:
+            cache.clear()
+
+    async def test_coalesced_read_is_shed_like_a_direct_call(self, upstream) -> None:
+        upstream(lambda request: httpx.Response(200, text="body"))
+        get_endpoint_routes().remember("read", "/vault/{encoded}")
+        get_content_cache().clear()
+        client = ObsidianClient()
+        client.rest_url = "http://obsidian.test"
+        scheduler = get_obsidian_scheduler()
+        # Saturated: the one slot is held and each call takes ~5s
+        limit, service_time = scheduler.limit, scheduler.service_time
+        scheduler.limit, scheduler.service_time = 1, 5.0
+        await scheduler.acquire(0)
+        try:
+            with deadline_scope(1.0):
+                with pytest.raises(UpstreamShed):
+                    await client._get("/vault/a.md")
+                started = time.monotonic()
+                with pytest.raises(UpstreamShed):
+                    await client.read("a.md")
+            assert time.monotonic() - started < 0.5
+        finally:
+            scheduler.release(None)
+            scheduler.limit, scheduler.service_time = limit, service_time
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from bridge.core.deadline import deadline_scope, remaining
+from bridge.services.tool_catalog import ToolCatalog, find_search_tool
+
+TOOLS = [{"name": "obsidian_get_file_contents"}, {"name": "obsidian_simple_search"}]
+
+
+class _Fetcher:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self) -> List[Dict[str, Any]]:
+        self.calls += 1
+        return TOOLS
+
+
+class TestToolCatalog:
+    def test_find_search_tool(self) -> None:
+        assert find_search_tool(TOOLS) == "obsidian_simple_search"
+        assert find_search_tool([{"name": "other"}]) is None
+
+    async def test_fetches_once_while_fresh(self) -> None:
+        catalog = ToolCatalog(ttl=60)
+        fetch = _Fetcher()
+        assert await catalog.search_tool(fetch) == "obsidian_simple_search"
+        assert await catalog.search_tool(fetch) == "obsidian_simple_search"
+        assert fetch.calls == 1
+
+    async def test_stale_catalog_refreshes_in_background(self) -> None:
+        catalog = ToolCatalog(ttl=0)
+        fetch = _Fetcher()
+        await catalog.tools(fetch)
+        assert await catalog.tools(fetch) == TOOLS  # served stale
+        await asyncio.sleep(0)
+        assert fetch.calls == 2
+
+    async def test_background_refresh_outlives_request_deadline(self) -> None:
+        catalog = ToolCatalog(ttl=0)
+        fetch = _Fetcher()
+        await catalog.tools(fetch)
+        seen: List[Optional[float]] = []
+
+        async def slow_fetch() -> List[Dict[str, Any]]:
+            seen.append(remaining())
+            await asyncio.sleep(0.05)
+            return await fetch()
+
+        with deadline_scope(0.01):
+            assert await catalog.tools(slow_fetch) == TOOLS  # served stale
+        assert catalog._refresh_task is not None
+        await catalog._refresh_task
+        assert seen == [None]
+        assert fetch.calls == 2
+
+    async def test_invalidate(self) -> None:
+        catalog = ToolCatalog(ttl=60)
+        fetch = _Fetcher()
+        await catalog.tools(fetch)
+        catalog.invalidate()
+        assert not catalog.is_fresh()
+        await catalog.tools(fetch)
+        assert fetch.calls == 2
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from bridge.services.upstream_scheduler import (
+    PRIORITY_READ,
+    PRIORITY_WRITE,
+    UpstreamScheduler,
+    UpstreamShed,
+)
+
+
+def _scheduler(**kwargs) -> UpstreamScheduler:
+    return UpstreamScheduler(
+        "test",
+        limit=kwargs.pop("limit", 1),
+        max_queue=kwargs.pop("max_queue", 10),
+        max_wait=kwargs.pop("max_wait", 5.0),
+    )
+
+
+class TestUpstreamScheduler:
+    async def test_reads_jump_ahead_of_writes(self) -> None:
+        scheduler = _scheduler()
+        order: List[str] = []
+        gate = asyncio.Event()
+
+        async def call(name: str, priority: int) -> None:
+            async with scheduler.slot(priority):
+                order.append(name)
+                if name == "first":
+                    await gate.wait()
+
+        first = asyncio.create_task(call("first", PRIORITY_WRITE))
+        await asyncio.sleep(0)
+        write = asyncio.create_task(call("write", PRIORITY_WRITE))
+        await asyncio.sleep(0)
+        read = asyncio.create_task(call("read", PRIORITY_READ))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, write, read)
+        assert order == ["first", "read", "write"]
+        assert scheduler.stats()["active"] == 0
+
+    async def test_full_queue_is_shed(self) -> None:
+        scheduler = _scheduler(max_queue=1)
+        await scheduler.acquire(PRIORITY_READ)
+        waiter = asyncio.create_task(scheduler.acquire(PRIORITY_READ))
+        await asyncio.sleep(0)
+        with pytest.raises(UpstreamShed) as exc:
+            await scheduler.acquire(PRIORITY_READ)
+        assert exc.value.reason == "queue_full"
+        scheduler.release(0.01)
+        await waiter
+
+    async def test_hopeless_deadline_is_shed_without_waiting(self) -> None:
+        scheduler = _scheduler()
+        scheduler.service_time = 2.0
+        await scheduler.acquire(PRIORITY_READ)
+        started = time.monotonic()
+        with pytest.raises(UpstreamShed) as exc:
+            await scheduler.acquire(PRIORITY_READ, deadline=time.monotonic() + 1.0)
+        assert exc.value.reason == "deadline"
+        assert time.monotonic() - started < 0.1
+        assert scheduler.stats()["waiting"] == 0
+
+    async def test_deadline_passing_in_queue_is_shed(self) -> None:
+        scheduler = _scheduler()
+        scheduler.service_time = 0.001
+        await scheduler.acquire(PRIORITY_READ)
+        with pytest.raises(UpstreamShed):
+            await scheduler.acquire(PRIORITY_READ, deadline=time.monotonic() + 0.05)
+        scheduler.release(0.01)
+        assert scheduler.stats()["active"] == 0
+
+    async def test_cancelled_waiter_does_not_leak_slot(self) -> None:
+        scheduler = _scheduler()
+        await scheduler.acquire(PRIORITY_READ)
+        waiter = asyncio.create_task(scheduler.acquire(PRIORITY_READ))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        scheduler.release(0.01)
+        assert scheduler.stats()["active"] == 0
+        await scheduler.acquire(PRIORITY_READ)
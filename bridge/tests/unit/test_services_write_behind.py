@@ -0,0 +1,117 @@
+import asyncio
+from typing import Dict, List, Tuple
+
+import pytest
+
+from bridge.services import write_behind
+from bridge.services.obsidian_client import ObsidianClient
+from bridge.services.write_behind import WriteBehindQueue
+
+
+class Upstream:
+    def __init__(self, failures: int = 0) -> None:
+        self.writes: List[Tuple[str, str]] = []
+        self.failures = failures
+
+    async def __call__(self, path: str, content: str) -> Dict[str, bool]:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("upstream down")
+        self.writes.append((path, content))
+        return {"ok": True}
+
+
+async def _settle(queue: WriteBehindQueue) -> None:
+    for _ in range(100):
+        if not queue.pending_paths():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"still pending: {queue.pending_paths()}")
+
+
+class TestWriteBehindQueue:
+    async def test_coalesces_writes_to_same_path(self, tmp_path) -> None:
+        upstream = Upstream()
+        queue = WriteBehindQueue(str(tmp_path / "j.jsonl"), upstream, delay=0.05)
+        await queue.start()
+        for text in ("draft", "revise", "final"):
+            assert (await queue.enqueue("a.md", text))["queued"] is True
+        await queue.enqueue("b.md", "other")
+        assert queue.pending_content("a.md") == "final"
+
+        await _settle(queue)
+        await queue.stop()
+        assert sorted(upstream.writes) == [("a.md", "final"), ("b.md", "other")]
+        assert queue.stats()["coalesced"] == 2
+        assert (tmp_path / "j.jsonl").read_text() == ""
+
+    async def test_retries_failed_flush(self, tmp_path) -> None:
+        upstream = Upstream(failures=2)
+        queue = WriteBehindQueue(
+            str(tmp_path / "j.jsonl"), upstream, delay=0, retry_base=0.01
+        )
+        await queue.start()
+        await queue.enqueue("a.md", "text")
+        await _settle(queue)
+        await queue.stop()
+        assert upstream.writes == [("a.md", "text")]
+        assert queue.stats()["failures"] == 2
+
+    async def test_flush_path_waits_for_in_flight_flush(self, tmp_path) -> None:
+        sent: List[str] = []
+        release = asyncio.Event()
+
+        async def flush(path: str, content: str) -> None:
+            if content == "v1":
+                await release.wait()
+            sent.append(content)
+
+        queue = WriteBehindQueue(str(tmp_path / "j.jsonl"), flush, delay=0)
+        await queue.start()
+        await queue.enqueue("a.md", "v1")
+        await asyncio.sleep(0.01)  # the worker is now sending v1
+        await queue.enqueue("a.md", "v2")
+        flushing = asyncio.create_task(queue.flush_path("a.md"))
+        await asyncio.sleep(0.01)
+        assert sent == []
+        release.set()
+        await flushing
+        await queue.stop()
+        assert sent == ["v1", "v2"]
+        assert queue.pending_paths() == []
+
+    async def test_replays_unflushed_writes_from_journal(self, tmp_path) -> None:
+        journal = str(tmp_path / "j.jsonl")
+        crashed = WriteBehindQueue(journal, Upstream(failures=99), delay=60)
+        await crashed.start()
+        await crashed.enqueue("a.md", "v1")
+        await crashed.enqueue("a.md", "v2")
+        crashed._task.cancel()  # simulate a crash: no shutdown flush
+
+        upstream = Upstream()
+        queue = WriteBehindQueue(journal, upstream, delay=60)
+        await queue.start()
+        assert queue.pending_content("a.md") == "v2"
+        # Sequence numbers continue after the replayed ones
+        assert (await queue.enqueue("b.md", "x"))["seq"] == 3
+        await queue.stop()
+        assert upstream.writes == [("a.md", "v2"), ("b.md", "x")]
+
+
+class TestObsidianClientWriteBehind:
+    @pytest.fixture
+    async def queue(self, tmp_path, monkeypatch):
+        upstream = Upstream(failures=99)
+        queue = WriteBehindQueue(str(tmp_path / "j.jsonl"), upstream, delay=60)
+        await queue.start()
+        monkeypatch.setattr(write_behind, "_write_behind", queue)
+        yield queue
+        queue._task.cancel()
+
+    async def test_reads_see_pending_content(self, queue, upstream) -> None:
+        seen = upstream(lambda request: pytest.fail("unexpected upstream call"))
+        client = ObsidianClient()
+        result = await client.write("Notes/a.md", "pending body")
+        assert result["queued"] is True
+        assert await client.read("Notes/a.md") == "pending body"
+        assert seen == []